@@ -12,6 +12,28 @@ config = Config("gcp")
 region = config.require("region")
 project = gcp.organizations.get_project().project_id
 org = pulumi.get_organization()
+# number of slices locations registry is split into; one slice is fetched per run,
+# whole registry within an hour (should divide 60)
+shard_count = int(Config().get("shard_count") or 1)
+# seconds scheduler waits for single run; function fetch budget is derived from it
+ATTEMPT_DEADLINE = 320
+# seconds single function run may take (Cloud Functions 1st gen allows up to 540)
+FUNCTION_TIMEOUT = ATTEMPT_DEADLINE
+
+# runs must not overlap - every one rewrites the whole output
+if shard_count < 1 or 60 % shard_count:
+    raise ValueError(f"shard_count must divide 60, got {shard_count}")
+if shard_count > 1 and 60 // shard_count * 60 < ATTEMPT_DEADLINE:
+    raise ValueError(
+        f"shard_count {shard_count} schedules runs every {60 // shard_count} minutes,"
+        f" shorter than {ATTEMPT_DEADLINE}s attempt deadline"
+    )
+# run killed by function timeout before its deadline writes nothing
+if not ATTEMPT_DEADLINE <= FUNCTION_TIMEOUT <= 540:
+    raise ValueError(
+        f"function timeout {FUNCTION_TIMEOUT}s must be within"
+        f" {ATTEMPT_DEADLINE}s attempt deadline and 540s"
+    )
 
 PATH_TO_FUNCTIONS_SOURCE_CODE = "./get_data"
 PATH_TO_DASH_APP = "./dash_app"
@@ -56,8 +78,11 @@ repo_bucket = gcp.storage.Bucket(
 # Part I: get_data utilizing Cloud function (request API -> store .csv @ bucket)
 # Zip function code into archive, as required by Cloud Function service
 assets = {}
+# (only top-level modules are shipped - tests & benchmarks directories are skipped)
 for file in os.listdir(PATH_TO_FUNCTIONS_SOURCE_CODE):
     location = os.path.join(PATH_TO_FUNCTIONS_SOURCE_CODE, file)
+    if not os.path.isfile(location):
+        continue
     asset = pulumi.FileAsset(path=location)
     assets[file] = asset
 
@@ -72,7 +97,11 @@ source_archive_object = gcp.storage.BucketObject(
 )
 
 # Environmental values for Cloud Function
-func_config_values = {"BUCKET_NAME": data_bucket.name}
+func_config_values = {
+    "BUCKET_NAME": data_bucket.name,
+    "SHARD_COUNT": str(shard_count),
+    "ATTEMPT_DEADLINE": str(ATTEMPT_DEADLINE),
+}
 
 # Function creation
 data_update_function = gcp.cloudfunctions.Function(
@@ -80,6 +109,7 @@ data_update_function = gcp.cloudfunctions.Function(
     description="Function that gets data from API and loading it into bucket (.csv)",
     runtime="python311",
     available_memory_mb=256,
+    timeout=FUNCTION_TIMEOUT,
     source_archive_bucket=repo_bucket.name,
     source_archive_object=source_archive_object.name,
     entry_point="save_astrometeo_data_to_bucket",
@@ -158,9 +188,9 @@ cloud_run = gcp.cloudrun.Service(
 gcp_scheduler = gcp.cloudscheduler.Job(
     "job",
     description="func job @ schedule",
-    schedule="0 * * * *",
+    schedule="0 * * * *" if shard_count == 1 else f"*/{60 // shard_count} * * * *",
     time_zone="Etc/UTC",
-    attempt_deadline="320s",
+    attempt_deadline=f"{ATTEMPT_DEADLINE}s",
     http_target=gcp.cloudscheduler.JobHttpTargetArgs(
         http_method="GET",
         uri=data_update_function.https_trigger_url,
@@ -0,0 +1,70 @@
+"""
+Line chart callback latency (figure built and serialized as dash does) of
+live rendering vs serving figure-ready chart artifact written at ingestion.
+Run from dash_app directory: python -m benchmarks.bench_artifacts
+"""
+import argparse
+import json
+import tempfile
+import time
+from urllib.parse import quote
+from plotly.io.json import to_json_plotly
+from src.components.line_chart import artifact_figure, chart_figure
+from src.data.charts import CHART_VERSION, ChartArtifacts
+from src.data.source import IndexedDataSource
+from .bench_source import weather_frame
+
+REPEATS = 20
+
+
+def _write_artifacts(data_source: IndexedDataSource, path: str) -> None:
+    """
+    Same artifacts as get_data writes - live figure, without template
+    """
+    for location in data_source.locations_list:
+        figure = json.loads(chart_figure(data_source, location, None).to_json())
+        del figure["layout"]["template"]
+        x = figure["data"][0]["x"]
+        artifact = {
+            "version": CHART_VERSION,
+            "location": location,
+            "timepoints": {"first": x[0], "last": x[-1], "count": len(x)},
+            "figure": figure,
+        }
+        with open(f"{path}/{quote(location, safe='')}.json", "w") as handle:
+            json.dump(artifact, handle)
+
+
+def _timed(render) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        to_json_plotly(render())
+    return (time.perf_counter() - start) / REPEATS
+
+
+def run(location_no: int, timepoint_counts: tuple) -> None:
+    print(f"all measures of single location, {location_no} locations")
+    print(f"{'timepoints':>10} {'live ms':>8} {'artifact ms':>12} {'speedup':>8}")
+    for timepoint_no in timepoint_counts:
+        data_source = IndexedDataSource(weather_frame(location_no, timepoint_no))
+        with tempfile.TemporaryDirectory() as path:
+            _write_artifacts(data_source, path)
+            artifacts = ChartArtifacts(path)
+            live = _timed(lambda: chart_figure(data_source, "Site 0", None))
+            served = _timed(
+                lambda: artifact_figure(
+                    artifacts.load("Site 0"), data_source, "Site 0", None
+                )
+            )
+        print(
+            f"{timepoint_no:>10} {live * 1000:>8.1f} {served * 1000:>12.2f}"
+            f" {live / served:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--timepoints", type=int, nargs="+", default=(24, 240, 1000))
+    args = parser.parse_args()
+    run(args.locations, tuple(args.timepoints))
@@ -0,0 +1,54 @@
+"""
+Line chart figure payload and render latency for long, sub-hourly location
+histories: every point vs visible range downsampled to screen resolution.
+Run from dash_app directory: python -m benchmarks.bench_chart
+"""
+import argparse
+import time
+from src.components.line_chart import build_figure
+from src.data.source import IndexedDataSource
+from .bench_source import weather_frame
+
+
+def _render(data_source, **window) -> tuple:
+    start = time.perf_counter()
+    payload = build_figure(
+        data_source.window("Site 0", measures=None, **window)
+    ).to_json()
+    return len(payload), time.perf_counter() - start
+
+
+def run(timepoint_counts: tuple, max_points: int) -> None:
+    print(f"all measures of single location, downsampled to {max_points} points")
+    print(
+        f"{'timepoints':>10} {'full MB':>8} {'full ms':>8} {'lttb MB':>8}"
+        f" {'lttb ms':>8} {'minmax ms':>10} {'zoom 10% ms':>12}"
+    )
+    for timepoint_no in timepoint_counts:
+        df = weather_frame(2, timepoint_no)
+        data_source = IndexedDataSource(df)
+        timepoints = data_source.window("Site 0", None).data["timepoint"]
+        full_size, full = _render(data_source)
+        lttb_size, lttb = _render(data_source, max_points=max_points)
+        _, minmax = _render(data_source, max_points=max_points, method="minmax")
+        _, zoom = _render(
+            data_source,
+            start=timepoints.iloc[timepoint_no // 2],
+            end=timepoints.iloc[timepoint_no // 2 + timepoint_no // 10],
+            max_points=max_points,
+        )
+        print(
+            f"{timepoint_no:>10} {full_size / 2**20:>8.2f} {full * 1000:>8.0f}"
+            f" {lttb_size / 2**20:>8.2f} {lttb * 1000:>8.0f} {minmax * 1000:>10.0f}"
+            f" {zoom * 1000:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--timepoints", type=int, nargs="+", default=(1000, 10_000, 50_000)
+    )
+    parser.add_argument("--max-points", type=int, default=1000)
+    args = parser.parse_args()
+    run(tuple(args.timepoints), args.max_points)
@@ -0,0 +1,188 @@
+"""
+First page load of the app at growing number of locations, through the Flask
+test client: initial layout and first callback responses size (raw and gzip)
+and server time from layout request to first chart of selected location.
+Run from dash_app directory: python -m benchmarks.bench_delivery
+"""
+import argparse
+import gzip
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.data import fields
+
+
+def raw_frame(location_no: int, timepoint_no: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Stored-like (raw api values) frame, as written by get_data
+    """
+    rng = np.random.default_rng(seed)
+    rows = location_no * timepoint_no
+    timepoints = pd.date_range("2023-04-10 15:00", periods=timepoint_no, freq="3h")
+    return pd.DataFrame(
+        {
+            "location": np.repeat(
+                [f"Site {n}" for n in range(location_no)], timepoint_no
+            ),
+            "timepoint": np.tile(timepoints, location_no),
+            "cloudcover": rng.integers(1, 10, rows),
+            "seeing": rng.integers(1, 9, rows),
+            "transparency": rng.integers(1, 9, rows),
+            "lifted_index": rng.choice(fields.LiftedIndex.VALUES.value, rows),
+            "rh2m": rng.integers(fields.Rh2m.LOW_BOUND, fields.Rh2m.HIGH_BOUND, rows),
+            "temp2m": rng.integers(-20, 35, rows),
+            "prec_type": rng.choice([prec.value for prec in fields.Prec], rows),
+            "wind10m_direction": rng.choice(
+                [direction.value for direction in fields.WindDirection], rows
+            ),
+            "wind10m_speed": rng.integers(1, 9, rows),
+        }
+    )
+
+
+def _app(bucket: str):
+    """
+    Fresh app (layout module reads bucket url on import) serving bucket data
+    """
+    os.environ["BUCKET_URL"] = bucket
+    for module in ("main", "src.components.layout"):
+        sys.modules.pop(module, None)
+    return importlib.import_module("main").app
+
+
+class Client:
+    """
+    Flask test client requesting gzip, recording every response size
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.client = app.server.test_client()
+        self.props = {}
+        self.raw = self.gzip = 0
+
+    def _record(self, response) -> dict:
+        self.gzip += len(response.data)
+        raw = (
+            response.get_data()
+            if response.headers.get("Content-Encoding") != "gzip"
+            else gzip.decompress(response.data)
+        )
+        self.raw += len(raw)
+        return json.loads(raw) if raw else {}
+
+    def get(self, path: str) -> dict:
+        return self._record(self.client.get(path, headers={"Accept-Encoding": "gzip"}))
+
+    def trigger(self, output: str, changed: str) -> None:
+        spec = self.app.callback_map[output]
+        outputs = [
+            dict(zip(("id", "property"), part.rsplit(".", 1)))
+            for part in output.strip(".").split("...")
+        ]
+        body = {
+            "output": output,
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": [
+                {**dep, "value": self.props.get(f"{dep['id']}.{dep['property']}")}
+                for dep in spec["inputs"]
+            ],
+            "state": [
+                {**dep, "value": self.props.get(f"{dep['id']}.{dep['property']}")}
+                for dep in spec["state"]
+            ],
+            "changedPropIds": [changed],
+        }
+        response = self.client.post(
+            "/_dash-update-component",
+            json=body,
+            headers={"Accept-Encoding": "gzip"},
+        )
+        if response.status_code == 204:
+            return
+        for output_id, props in self._record(response)["response"].items():
+            for prop, value in props.items():
+                self.props[f"{output_id}.{prop}"] = value
+
+
+def _props(component, props: dict) -> None:
+    if isinstance(component, dict):
+        if "id" in component.get("props", {}):
+            for prop, value in component["props"].items():
+                props[f"{component['props']['id']}.{prop}"] = value
+        for value in component.get("props", {}).values():
+            _props(value, props)
+    elif isinstance(component, list):
+        for child in component:
+            _props(child, props)
+
+
+def first_chart(app, location: str) -> tuple:
+    """
+    Page load up to chart of location - layout, initial callbacks,
+    then location selection; returns layout size and all responses size
+    """
+    from src.components import ids
+
+    client = Client(app)
+    start = time.perf_counter()
+    layout = client.get("/_dash-layout")
+    layout_raw, layout_gzip = client.raw, client.gzip
+    client.get("/_dash-dependencies")
+    _props(layout, client.props)
+    changed = ids.MAIN_STORE + ".data"
+    for output, spec in app.callback_map.items():
+        if "callback" in spec and any(
+            f"{dep['id']}.{dep['property']}" == changed for dep in spec["inputs"]
+        ):
+            client.trigger(output, changed)
+    client.props[ids.LOCATION_DROPDOWN + ".value"] = location
+    changed = ids.LOCATION_DROPDOWN + ".value"
+    for output, spec in app.callback_map.items():
+        if "callback" in spec and any(
+            f"{dep['id']}.{dep['property']}" == changed for dep in spec["inputs"]
+        ):
+            client.trigger(output, changed)
+    elapsed = time.perf_counter() - start
+    assert client.props.get(ids.LINE_CHART + ".figure", {}).get("data")
+    return layout_raw, layout_gzip, client.raw, client.gzip, elapsed
+
+
+def run(location_counts: tuple, timepoint_no: int) -> None:
+    print(f"{timepoint_no} timepoints per location, page load to first chart")
+    print(
+        f"{'locations':>10} {'layout KB':>10} {'gzip KB':>8}"
+        f" {'total KB':>9} {'gzip KB':>8} {'first chart ms':>15}"
+    )
+    for location_no in location_counts:
+        with tempfile.TemporaryDirectory() as bucket:
+            raw_frame(location_no, timepoint_no).to_csv(
+                f"{bucket}/astro_weather_data.csv", index=False
+            )
+            raw_frame(1, timepoint_no).to_csv(
+                f"{bucket}/failsafe_data.csv", index=False
+            )
+            app = _app(bucket)
+            # first load is warm-up of code paths - chart of other location
+            # is rendered then, so that measured one is not cached
+            first_chart(app, "Site 1")
+            sizes = first_chart(app, "Site 0")
+        layout_raw, layout_gzip, total_raw, total_gzip, elapsed = sizes
+        print(
+            f"{location_no:>10} {layout_raw / 1024:>10.1f} {layout_gzip / 1024:>8.1f}"
+            f" {total_raw / 1024:>9.1f} {total_gzip / 1024:>8.1f}"
+            f" {elapsed * 1000:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, nargs="+", default=(10, 100, 1000))
+    parser.add_argument("--timepoints", type=int, default=24)
+    args = parser.parse_args()
+    run(tuple(args.locations), args.timepoints)
@@ -0,0 +1,86 @@
+"""
+Rescaling and description columns: dict replace/map vs compiled lookup tables.
+Reports time of both steps and memory of resulting frame.
+Run from dash_app directory: python -m benchmarks.bench_lookup
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from src.data import mapping as mp
+from src.data.loader import (
+    DataSchema,
+    add_descriptions,
+    load_astrometeo_data,
+    rescale_data,
+)
+from src.data.storage import read_astrometeo_data
+from src.data.tests.weather_data_generator import FakeWeatherDataGenerator
+
+RESCALED = {"rh2m": mp.RH2M_SCALED_TABLE, "lifted_index": mp.LIFTED_INDEX_SCALED_TABLE}
+
+
+def _dict_based(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rescaling and descriptions as done before lookup tables
+    """
+    df = df.replace(RESCALED)
+    for column, table in mp.descriptions.items():
+        df[f"{column}_desc"] = df[column].map(table)
+    return df
+
+
+@add_descriptions(list(mp.descriptions))
+@rescale_data(list(RESCALED.items()))
+def _lookup_based(df: pd.DataFrame) -> pd.DataFrame:
+    return df.copy()
+
+
+def _timed(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(location_no: int, timepoint_no: int, repeat: int) -> None:
+    generator = FakeWeatherDataGenerator(
+        location_no=location_no, timepoint_no=timepoint_no
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "astro_weather_data.csv")
+        pd.DataFrame(generator.produce_data(), columns=DataSchema.__fields__).to_csv(
+            path, index=False
+        )
+        df = read_astrometeo_data(path, columns=DataSchema.get_fields_names())
+        load_time, _ = _timed(
+            lambda: load_astrometeo_data(path=path, failsafe_path=path), repeat
+        )
+        print(
+            f"{location_no} locations x {timepoint_no} timepoints,"
+            f" whole load_astrometeo_data {load_time:.3f}s"
+        )
+        print(f"{'case':<18} {'seconds':>9} {'frame MB':>9} {'desc MB':>8}")
+        for case, func in (
+            ("dict replace/map", lambda: _dict_based(df)),
+            ("lookup tables", lambda: _lookup_based(df)),
+        ):
+            elapsed, result = _timed(func, repeat)
+            memory = result.memory_usage(deep=True)
+            desc_memory = memory[[f"{c}_desc" for c in mp.descriptions]].sum()
+            print(
+                f"{case:<18} {elapsed:>9.3f} {memory.sum() / 2**20:>9.1f}"
+                f" {desc_memory / 2**20:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=1000)
+    parser.add_argument("--timepoints", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.locations, args.timepoints, args.repeat)
@@ -0,0 +1,54 @@
+"""
+Astro score and best observing windows ranking for growing number of locations:
+vectorized ObservingWindows vs pandas groupby rolling mean.
+Run from dash_app directory: python -m benchmarks.bench_scoring
+"""
+import argparse
+import time
+from src.data.scoring import ObservingWindows, astro_score
+from .bench_source import weather_frame
+from .util import timed
+
+
+def _groupby_rolling_top(df, scores, n: int, length: int):
+    windows = (
+        df.assign(score=scores)
+        .sort_values(["location", "timepoint"])
+        .groupby("location", observed=True)["score"]
+        .rolling(length)
+        .mean()
+    )
+    return windows.groupby(level=0, observed=True).max().nlargest(n)
+
+
+def run(location_counts: tuple, timepoint_no: int, length: int, repeat: int) -> None:
+    print(f"{timepoint_no} timepoints per location, top 10 windows of {length}")
+    print(
+        f"{'locations':>10} {'rows':>10} {'score ms':>9} {'index ms':>9}"
+        f" {'top ms':>7} {'groupby rolling ms':>19}"
+    )
+    for location_no in location_counts:
+        df = weather_frame(location_no, timepoint_no)
+        score_ms = timed(lambda: astro_score(df), repeat) * 1000
+        scores = astro_score(df)
+        start = time.perf_counter()
+        windows = ObservingWindows(df, scores)
+        index_ms = (time.perf_counter() - start) * 1000
+        top_ms = timed(lambda: windows.top(n=10, length=length), repeat) * 1000
+        rolling_ms = (
+            timed(lambda: _groupby_rolling_top(df, scores, 10, length), repeat) * 1000
+        )
+        print(
+            f"{location_no:>10} {len(df):>10} {score_ms:>9.1f} {index_ms:>9.1f}"
+            f" {top_ms:>7.1f} {rolling_ms:>19.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, nargs="+", default=(100, 1000, 5000))
+    parser.add_argument("--timepoints", type=int, default=64)
+    parser.add_argument("--length", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(tuple(args.locations), args.timepoints, args.length, args.repeat)
@@ -0,0 +1,86 @@
+"""
+Latency of DataSource.filter and build_data_table for growing number of locations:
+masking and sorting DataSource vs IndexedDataSource slices.
+Run from dash_app directory: python -m benchmarks.bench_source
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.data import mapping as mp
+from src.data import fields
+from src.data.loader import COMPACT_DTYPES
+from src.data.source import DataSource, IndexedDataSource
+from .util import timed
+
+
+def weather_frame(location_no: int, timepoint_no: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Loaded-like frame (rescaled, described) built without per-row python work
+    """
+    rng = np.random.default_rng(seed)
+    rows = location_no * timepoint_no
+    timepoints = pd.date_range("2023-04-10 15:00", periods=timepoint_no, freq="3h")
+    df = pd.DataFrame(
+        {
+            "location": np.repeat(
+                [f"Site {n}" for n in range(location_no)], timepoint_no
+            ),
+            "timepoint": np.tile(timepoints, location_no),
+            "cloudcover": rng.integers(1, 10, rows),
+            "seeing": rng.integers(1, 9, rows),
+            "transparency": rng.integers(1, 9, rows),
+            "lifted_index": rng.integers(1, 9, rows),
+            "rh2m": rng.integers(2, 23, rows) / 2,
+            "temp2m": rng.integers(-20, 35, rows),
+            "prec_type": rng.choice([prec.value for prec in fields.Prec], rows),
+            "wind10m_direction": rng.choice(
+                [direction.value for direction in fields.WindDirection], rows
+            ),
+            "wind10m_speed": rng.integers(1, 9, rows),
+        }
+    ).sample(frac=1, random_state=seed, ignore_index=True)
+    for column, table in mp.descriptions.items():
+        df[f"{column}_desc"] = df[column].map(table).astype("category")
+    return df.astype(
+        {
+            column: COMPACT_DTYPES[column]
+            for column in ("prec_type", "wind10m_direction")
+        }
+    )
+
+
+def run(location_counts: tuple, timepoint_no: int, repeat: int) -> None:
+    print(f"{timepoint_no} timepoints per location, filter + build_data_table")
+    print(
+        f"{'locations':>10} {'rows':>10} {'DataSource ms':>14}"
+        f" {'Indexed ms':>11} {'index build s':>14}"
+    )
+    for location_no in location_counts:
+        df = weather_frame(location_no, timepoint_no)
+        location = f"Site {location_no // 2}"
+        plain = DataSource(df)
+        start = time.perf_counter()
+        indexed = IndexedDataSource(df)
+        build = time.perf_counter() - start
+        plain_ms, indexed_ms = (
+            timed(
+                lambda: source.filter(location, measures=None).build_data_table(),
+                repeat,
+            )
+            * 1000
+            for source in (plain, indexed)
+        )
+        print(
+            f"{location_no:>10} {len(df):>10} {plain_ms:>14.2f}"
+            f" {indexed_ms:>11.3f} {build:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, nargs="+", default=(100, 1000, 10_000))
+    parser.add_argument("--timepoints", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(tuple(args.locations), args.timepoints, args.repeat)
@@ -0,0 +1,84 @@
+"""
+Parse time and bytes read: single .csv vs partitioned parquet dataset.
+Run from dash_app directory: python -m benchmarks.bench_storage
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+import pyarrow.dataset as ds
+from src.data.loader import DataSchema
+from src.data.storage import PARTITIONING, latest_partitions, read_astrometeo_data
+from src.data.tests.weather_data_generator import FakeWeatherDataGenerator
+
+INITS = ("2023041000", "2023041006", "2023041012")
+
+
+def _timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(location_no: int, timepoint_no: int, repeat: int) -> None:
+    generator = FakeWeatherDataGenerator(
+        location_no=location_no, timepoint_no=timepoint_no
+    )
+    columns = DataSchema.get_fields_names()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "astro_weather_data.csv")
+        parquet_path = os.path.join(tmp, "astro_weather_data")
+        for init in INITS:
+            df = pd.DataFrame(generator.produce_data(), columns=DataSchema.__fields__)
+            df.astype(
+                {"prec_type": "category", "wind10m_direction": "category"}
+            ).assign(init=init).to_parquet(
+                parquet_path,
+                index=False,
+                partition_cols=["location", "init"],
+                existing_data_behavior="delete_matching",
+            )
+        df.to_csv(csv_path, index=False)
+
+        dataset = ds.dataset(parquet_path, format="parquet", partitioning=PARTITIONING)
+        one_location = [generator.locations[0]]
+        cases = {
+            "csv": (csv_path, None, [csv_path]),
+            "parquet": (
+                parquet_path,
+                None,
+                sum(latest_partitions(dataset).values(), []),
+            ),
+            "parquet, 1 location": (
+                parquet_path,
+                one_location,
+                sum(latest_partitions(dataset, one_location).values(), []),
+            ),
+        }
+        print(
+            f"{location_no} locations x {timepoint_no} timepoints, "
+            f"{len(INITS)} inits kept in parquet dataset"
+        )
+        print(f"{'case':<22} {'seconds':>9} {'bytes read':>12}")
+        for case, (path, locations, files) in cases.items():
+            elapsed = _timed(
+                lambda: read_astrometeo_data(
+                    path, columns=columns, locations=locations
+                ),
+                repeat,
+            )
+            read_bytes = sum(os.path.getsize(file) for file in files)
+            print(f"{case:<22} {elapsed:>9.4f} {read_bytes:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=300)
+    parser.add_argument("--timepoints", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.locations, args.timepoints, args.repeat)
@@ -0,0 +1,53 @@
+"""
+Browser store payload and per-callback data access latency for growing number
+of locations: full frame serialized into dcc.Store vs snapshot version token.
+Run from dash_app directory: python -m benchmarks.bench_store
+"""
+import argparse
+import json
+import pandas as pd
+import plotly
+from src.data.registry import Snapshot, SnapshotRegistry
+from src.data.source import DataSource
+from .bench_source import weather_frame
+from .util import timed
+
+
+def run(location_counts: tuple, timepoint_no: int, repeat: int) -> None:
+    print(f"{timepoint_no} timepoints per location, store -> filtered data table")
+    print(
+        f"{'locations':>10} {'frame store MB':>15} {'frame ms':>10}"
+        f" {'token store B':>14} {'token ms':>9}"
+    )
+    for location_no in location_counts:
+        df = weather_frame(location_no, timepoint_no)
+        location = f"Site {location_no // 2}"
+        frame_store = json.dumps(df.to_dict(), cls=plotly.utils.PlotlyJSONEncoder)
+        registry = SnapshotRegistry()
+        registry.publish(Snapshot.build(df, origin="primary"))
+        token_store = json.dumps(registry.latest.store)
+
+        def from_frame_store():
+            data = pd.DataFrame.from_dict(json.loads(frame_store))
+            DataSource(data).filter(location, measures=None).build_data_table()
+
+        def from_token_store():
+            data_source = registry.resolve(json.loads(token_store)).data_source
+            data_source.filter(location, measures=None).build_data_table()
+
+        frame_ms, token_ms = (
+            timed(func, repeat) * 1000 for func in (from_frame_store, from_token_store)
+        )
+        print(
+            f"{location_no:>10} {len(frame_store) / 2**20:>15.1f} {frame_ms:>10.1f}"
+            f" {len(token_store):>14} {token_ms:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, nargs="+", default=(10, 100, 1000))
+    parser.add_argument("--timepoints", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(tuple(args.locations), args.timepoints, args.repeat)
@@ -0,0 +1,57 @@
+"""
+Data schema validation time: per row pydantic models vs column-wise validation.
+Run from dash_app directory: python -m benchmarks.bench_validation
+"""
+import argparse
+import time
+from typing import List
+import pandas as pd
+from pydantic import BaseModel
+from src.data.loader import DataSchema
+from src.data.validation import validate_frame
+from src.data.tests.weather_data_generator import FakeWeatherDataGenerator
+
+
+class RowValidator(BaseModel):
+    schema_dict: List[DataSchema]
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(row_no: int, reference_row_no: int) -> None:
+    sample = pd.DataFrame(
+        FakeWeatherDataGenerator(location_no=100, timepoint_no=100).produce_data(),
+        columns=DataSchema.__fields__,
+    )
+    df = pd.concat([sample] * -(-row_no // len(sample)), ignore_index=True).head(row_no)
+    df["timepoint"] = pd.to_datetime(df["timepoint"])
+
+    reference = df.head(reference_row_no)
+    row_wise = _timed(
+        lambda: RowValidator(schema_dict=reference.to_dict(orient="records"))
+    )
+    column_wise = _timed(lambda: validate_frame(df, DataSchema))
+    print(f"{row_no} rows")
+    print(f"{'validation':<12} {'rows':>9} {'seconds':>9} {'rows/s':>12}")
+    for name, rows, elapsed in (
+        ("row-wise", len(reference), row_wise),
+        ("column-wise", row_no, column_wise),
+    ):
+        print(f"{name:<12} {rows:>9} {elapsed:>9.3f} {rows / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--reference-rows",
+        type=int,
+        default=100_000,
+        help="rows validated per row (slow), rate is comparable with full run",
+    )
+    args = parser.parse_args()
+    run(args.rows, args.reference_rows)
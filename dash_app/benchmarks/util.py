@@ -0,0 +1,15 @@
+"""Helpers shared by benchmarks"""
+import time
+from typing import Callable
+
+
+def timed(func: Callable[[], object], repeat: int) -> float:
+    """
+    Best (lowest) wall time of repeat func calls, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
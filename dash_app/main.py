@@ -1,14 +1,32 @@
+import os
 from dash import Dash
 
 import dash_bootstrap_components as dbc
-from src.components.layout import create_layout
+from src.components.layout import DATA_CACHE, FIGURE_CACHE, create_layout
 
 
+# gzip layout, callback responses and assets (requires flask-compress)
+COMPRESS_RESPONSES = os.getenv("COMPRESS_RESPONSES", "1") == "1"
+
 external_stylesheets = [dbc.themes.SLATE]
-app = Dash(__name__, external_stylesheets=external_stylesheets)
+app = Dash(
+    __name__, external_stylesheets=external_stylesheets, compress=COMPRESS_RESPONSES
+)
 app.title = "Weather One"
 app.layout = create_layout(app=app)
 server = app.server
 
+
+@server.route("/metrics")
+def metrics() -> dict:
+    """
+    Cache counters, for sizing caches to traffic
+    """
+    return {
+        "data_cache": vars(DATA_CACHE.stats),
+        "figure_cache": FIGURE_CACHE.stats.as_dict(),
+    }
+
+
 if __name__ == "__main__":
     app.run(debug=False)
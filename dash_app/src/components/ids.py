@@ -2,6 +2,9 @@ LINE_CHART = "line-chart"
 LOCATION_DROPDOWN = "location-dropdown"
 MEASURE_DROPDOWN = "measure-dropdown"
 TABLE = "table"
+TABLE_TITLE = "table-title"
+TABLE_BODY = "table-body"
+TABLE_STORE = "table-store"
 
 SELECT_ALL_MEASURES_BUTTON = "select-all-measures-button"
 SELECT_ALL_LOCATIONS_BUTTON = "select-all-locations-button"
@@ -12,3 +15,5 @@ TIME_STORE = "time-store"
 MAIN = "main"
 MAIN_INTERVAL = "main-interval"
 MAIN_STORE = "main-store"
+LOCATION_OPTIONS_VERSION = "location-options-version"
+MEASURE_OPTIONS_VERSION = "measure-options-version"
@@ -10,12 +10,44 @@ from . import (
     ids,
 )
 
-from ..data.source import DataSource
+from ..data.cache import DataCache, FigureCache
+from ..data.charts import ChartArtifacts
 from ..data.loader import load_astrometeo_data
+from ..data.refresher import DataRefresher
+from ..data.registry import SnapshotRegistry
 
 BUCKET_NAME = os.getenv("BUCKET_NAME")
+# any fsspec url - eg. local directory filled by get_data run against local bucket
+BUCKET_URL = os.getenv("BUCKET_URL", f"gs://{BUCKET_NAME}")
 CSV_NAME = os.getenv("CSV_NAME", "astro_weather_data.csv")
+PARQUET_NAME = os.getenv("PARQUET_NAME", "astro_weather_data")
+HISTORY_NAME = os.getenv("HISTORY_NAME", "astro_weather_history")
+DATA_FORMAT = os.getenv("DATA_FORMAT", "csv")
 FAILSAFE_CSV_NAME = os.getenv("FAILSAFE_CSV_NAME", "failsafe_data.csv")
+CHARTS_NAME = os.getenv("CHARTS_NAME", "astro_weather_charts")
+# serve charts from figure-ready artifacts written by get_data, when present
+CHART_ARTIFACTS = os.getenv("CHART_ARTIFACTS", "0") == "1"
+COMPACT_DATA = os.getenv("COMPACT_DATA", "0") == "1"
+
+# seconds between background checks of stored data
+REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", 600))
+
+# summary table rendered in browser from location payload, instead of on hover
+CLIENTSIDE_TABLE = os.getenv("CLIENTSIDE_TABLE", "1") == "1"
+
+# bounds of rendered figures cache, shared by all users of process
+FIGURE_CACHE_ENTRIES = int(os.getenv("FIGURE_CACHE_ENTRIES", 256))
+FIGURE_CACHE_MB = float(os.getenv("FIGURE_CACHE_MB", 64))
+
+# stored data is loaded again only when its version changed
+DATA_CACHE = DataCache(load_astrometeo_data)
+
+# rendered figures, invalidated when new snapshot is published
+FIGURE_CACHE = FigureCache(
+    max_entries=FIGURE_CACHE_ENTRIES,
+    max_bytes=int(FIGURE_CACHE_MB * 2**20),
+    size=line_chart.figure_nbytes,
+)
 
 
 def create_layout(*, app: Dash) -> html.Div:
@@ -23,27 +55,49 @@ def create_layout(*, app: Dash) -> html.Div:
     Creates app layout
     """
 
-    def _update_data():
-        data_path = f"gs://{BUCKET_NAME}/{CSV_NAME}"
-        failsafe_data_path = f"gs://{BUCKET_NAME}/{FAILSAFE_CSV_NAME}"
-        data = load_astrometeo_data(path=data_path, failsafe_path=failsafe_data_path)
-        data_source = DataSource(data)
-        return data_source
+    data_name = {"parquet": PARQUET_NAME, "history": HISTORY_NAME}.get(
+        DATA_FORMAT, CSV_NAME
+    )
+    data_path = f"{BUCKET_URL}/{data_name}"
+    failsafe_data_path = f"{BUCKET_URL}/{FAILSAFE_CSV_NAME}"
+
+    def _load_data():
+        return DATA_CACHE.load(
+            path=data_path, failsafe_path=failsafe_data_path, compact=COMPACT_DATA
+        )
+
+    def _load_failsafe_data():
+        return load_astrometeo_data(
+            path=failsafe_data_path,
+            failsafe_path=failsafe_data_path,
+            compact=COMPACT_DATA,
+        )
 
-    data_source = _update_data()
+    chart_artifacts = (
+        ChartArtifacts(f"{BUCKET_URL}/{CHARTS_NAME}") if CHART_ARTIFACTS else None
+    )
+
+    registry = SnapshotRegistry()
+    registry.publish_hooks.append(FIGURE_CACHE.on_publish)
+    refresher = DataRefresher(
+        load=_load_data,
+        load_failsafe=_load_failsafe_data,
+        interval=REFRESH_INTERVAL,
+        registry=registry,
+    ).start()
 
     @app.callback(
         Output(ids.MAIN_STORE, "data"), Input(ids.MAIN_INTERVAL, "n_intervals")
     )
-    def update_data(_: int) -> DataSource:
-        return _update_data().data.to_dict()
+    def update_data(_: int) -> dict:
+        return refresher.current.store
 
     return html.Div(
         [
             dcc.Interval(id=ids.MAIN_INTERVAL, interval=3600 * 1000, n_intervals=0),
             dcc.Store(
                 id=ids.MAIN_STORE,
-                data=data_source.data.to_dict(),
+                data=refresher.current.store,
             ),
             html.Div(
                 [
@@ -54,16 +108,14 @@ def create_layout(*, app: Dash) -> html.Div:
                             dbc.Col(
                                 html.Div(
                                     location_dropdown.render(
-                                        app=app, data_source=data_source
+                                        app=app, snapshots=registry
                                     )
                                 ),
                                 width=4,
                             ),
                             dbc.Col(
                                 html.Div(
-                                    measure_dropdown.render(
-                                        app=app, data_source=data_source
-                                    )
+                                    measure_dropdown.render(app=app, snapshots=registry)
                                 ),
                                 width=8,
                             ),
@@ -72,11 +124,24 @@ def create_layout(*, app: Dash) -> html.Div:
                     dbc.Row(
                         [
                             dbc.Col(
-                                html.Div(table.render(app=app)),
+                                html.Div(
+                                    table.render(
+                                        app=app,
+                                        snapshots=registry,
+                                        clientside=CLIENTSIDE_TABLE,
+                                    )
+                                ),
                                 width=3,
                             ),
                             dbc.Col(
-                                html.Div(line_chart.render(app=app)),
+                                html.Div(
+                                    line_chart.render(
+                                        app=app,
+                                        snapshots=registry,
+                                        figure_cache=FIGURE_CACHE,
+                                        artifacts=chart_artifacts,
+                                    )
+                                ),
                                 width=9,
                             ),
                         ]
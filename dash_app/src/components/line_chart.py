@@ -1,13 +1,39 @@
-from typing import List, Dict
+import os
+import sys
+from typing import Any, List, Dict, Optional, Tuple, Union
+import numpy as np
 import plotly.graph_objects as go
-import pandas as pd
+import plotly.io as pio
 from plotly.subplots import make_subplots
-from dash import Dash, dcc, html
+from dash import Dash, ctx, dcc, html, no_update
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 from . import ids
+from ..data.cache import FigureCache
+from ..data.charts import ChartArtifacts
+from ..data.loader import to_datetime64
+from ..data.registry import SnapshotRegistry
 from ..data.source import DataSource
 from ..data import mapping as mp
 
+# points served for visible range, about chart width in pixels
+MAX_CHART_POINTS = int(os.getenv("MAX_CHART_POINTS", 1000))
+
+# styling of live rendered figures, added to figures served from chart artifacts
+FIGURE_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
+
+
+def visible_range(
+    relayout_data: Optional[Dict[str, Any]]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns x axis range zoomed in chart (relayout event data), None when not zoomed
+    """
+    relayout_data = relayout_data or {}
+    if "xaxis.range" in relayout_data:
+        return tuple(relayout_data["xaxis.range"])
+    return relayout_data.get("xaxis.range[0]"), relayout_data.get("xaxis.range[1]")
+
 
 def blank_fig():
     """
@@ -21,77 +47,208 @@ def blank_fig():
     return fig
 
 
-def render(app: Dash) -> html.Div:
+def build_figure(data_source: DataSource) -> go.Figure:
+    """
+    Builds chart figure of (filtered) data source measures, traces tagged with
+    their measure (meta) as in chart artifacts
+    """
+    data_table = data_source.build_data_table()
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    if "temp2m" in data_source.measures_list:
+        fig.add_trace(
+            go.Scatter(
+                x=data_table["timepoint"],
+                y=data_table["temp2m"],
+                name="Temperature",
+                hovertemplate="%{y} °C",
+                meta="temp2m",
+            )
+        )
+
+    for secondary_measure in data_source.secondary_measures_list:
+        hov_text = data_table[f"{secondary_measure}_desc"]
+        if secondary_measure == "wind10m_speed":
+            hov_text = data_table["wind10m_speed_desc"].str.cat(
+                data_table["wind10m_direction"], sep=", direction: "
+            )
+        fig.add_trace(
+            go.Scatter(
+                x=data_table["timepoint"],
+                y=data_table[secondary_measure],
+                text=hov_text,
+                hovertemplate="%{text}",
+                name=mp.human_readable_measures[secondary_measure],
+                meta=secondary_measure,
+            ),
+            secondary_y=True,
+        )
+
+    fig.update_xaxes(title_text="timepoint")
+    min_sec_y = 0
+    max_sec_y = 12
+    fig.update_yaxes(range=[min_sec_y, max_sec_y], secondary_y=True)
+
+    if "temp2m" in data_table.columns:
+        min_y = min(data_table["temp2m"]) - 5
+        max_y = max(data_table["temp2m"]) + 5
+        fig.update_yaxes(range=[min_y, max_y], secondary_y=False)
+
+    fig.update_layout(
+        legend_itemclick=False, legend_itemdoubleclick=False, hovermode="x"
+    )
+    fig.update_traces(mode="markers+lines")
+
+    return fig
+
+
+def chart_figure(
+    data_source: DataSource,
+    location: str,
+    measures: Optional[List[str]],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Union[go.Figure, html.Div]:
+    """
+    Builds chart of location measures within visible range (whole, when None)
+    """
+    filtered_data_source = data_source.window(
+        location=location,
+        measures=measures,
+        start=start,
+        end=end,
+        max_points=MAX_CHART_POINTS,
+    )
+    if not filtered_data_source.row_count:
+        return html.Div("No data", id=ids.LINE_CHART)
+    fig = build_figure(filtered_data_source)
+    if start is not None or end is not None:
+        fig.update_xaxes(range=[start, end])
+    return fig
+
+
+def artifact_figure(
+    artifact: Optional[Dict[str, Any]],
+    data_source: DataSource,
+    location: str,
+    measures: Optional[List[str]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns figure of location measures from chart artifact written at ingestion,
+    None when there is no artifact matching location rows of data source
+    """
+    if artifact is None or artifact["location"] != location:
+        return None
+    index = data_source.timepoint_index(location)
+    timepoints = artifact["timepoints"]
+    if not (
+        len(index) == timepoints["count"] > 0
+        and len(index) <= MAX_CHART_POINTS
+        and index.timepoints[0] == to_datetime64(timepoints["first"])
+        and index.timepoints[-1] == to_datetime64(timepoints["last"])
+    ):
+        return None
+    figure = artifact["figure"]
+    layout = dict(figure["layout"], template=FIGURE_TEMPLATE)
+    if measures is not None and "temp2m" not in measures:
+        layout["yaxis"] = {
+            key: value for key, value in layout["yaxis"].items() if key != "range"
+        }
+    return {
+        "data": [
+            trace
+            for trace in figure["data"]
+            if measures is None or trace["meta"] in measures
+        ],
+        "layout": layout,
+    }
+
+
+def figure_nbytes(fig: Union[go.Figure, html.Div, Dict[str, Any]]) -> int:
+    """
+    Approximate memory held by figure traces data
+    """
+    nbytes = sys.getsizeof(fig)
+    traces = fig["data"] if isinstance(fig, dict) else getattr(fig, "data", ())
+    for trace in traces:
+        for prop in ("x", "y", "text"):
+            values = trace[prop] if prop in trace else None
+            if values is None or isinstance(values, str):
+                continue
+            values = np.asarray(values)
+            if values.dtype == object:
+                nbytes += sum(map(sys.getsizeof, values)) + values.nbytes
+            else:
+                nbytes += values.nbytes
+    return nbytes
+
+
+def render(
+    app: Dash,
+    snapshots: SnapshotRegistry,
+    figure_cache: FigureCache,
+    artifacts: Optional[ChartArtifacts] = None,
+) -> html.Div:
     """
     Renders component
     """
 
     @app.callback(
         Output(ids.LINE_CHART, "figure"),
+        Output(ids.LINE_CHART, "relayoutData"),
         Input(ids.LOCATION_DROPDOWN, "value"),
         Input(ids.MEASURE_DROPDOWN, "value"),
         Input(ids.MAIN_STORE, "data"),
+        Input(ids.LINE_CHART, "relayoutData"),
         State(ids.MAIN_STORE, "data"),
     )
     def update_chart(
         location: str,
         measures: List[str],
         updated_data_source: Dict[str, any],
+        relayout_data: Optional[Dict[str, Any]],
         data_source: Dict[str, any],
-    ) -> go.Figure:
-        if updated_data_source:
-            data_source = updated_data_source
-        data_source = DataSource(pd.DataFrame.from_dict(data_source))
-        filtered_data_source = data_source.filter(location=location, measures=measures)
-        if not filtered_data_source.row_count:
-            return html.Div("No data", id=ids.LINE_CHART)
-        data_table = filtered_data_source.build_data_table()
-
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-        if "temp2m" in filtered_data_source.measures_list:
-            fig.add_trace(
-                go.Scatter(
-                    x=data_table["timepoint"],
-                    y=data_table["temp2m"],
-                    name="Temperature",
-                    hovertemplate="%{y} °C",
-                )
-            )
+    ) -> Tuple[go.Figure, Optional[Dict[str, Any]]]:
+        relayout_update = no_update
+        if ctx.triggered_id == ids.LOCATION_DROPDOWN:
+            # zoom of previous location is dropped along with its relayout data
+            relayout_data = relayout_update = None
+        start, end = visible_range(relayout_data)
+        zoomed = start is not None or end is not None
+        if ctx.triggered_id == ids.LINE_CHART and not zoomed:
+            # other relayout events (eg. autosize, y axis zoom) leave data as is
+            if not (relayout_data or {}).get("xaxis.autorange"):
+                raise PreventUpdate
+        snapshot = snapshots.resolve(updated_data_source or data_source)
+        if measures is not None:
+            # same figure (traces order) for every order of selecting measures
+            measures = [
+                measure
+                for measure in snapshot.data_source.graphed_measures_list
+                if measure in measures
+            ]
+        if zoomed:
+            # visible ranges are rarely requested twice - rendered from location
+            # slice, not cached, so that they do not evict whole range figures
+            figure = chart_figure(snapshot.data_source, location, measures, start, end)
+            return figure, relayout_update
 
-        for secondary_measure in filtered_data_source.secondary_measures_list:
-            hov_text = data_table[f"{secondary_measure}_desc"]
-            if secondary_measure == "wind10m_speed":
-                hov_text = data_table["wind10m_speed_desc"].str.cat(
-                    data_table["wind10m_direction"], sep=", direction: "
+        def _render() -> Union[go.Figure, Dict[str, Any]]:
+            if artifacts is not None:
+                figure = artifact_figure(
+                    artifacts.load(location), snapshot.data_source, location, measures
                 )
-            fig.add_trace(
-                go.Scatter(
-                    x=data_table["timepoint"],
-                    y=data_table[secondary_measure],
-                    text=hov_text,
-                    hovertemplate="%{text}",
-                    name=mp.human_readable_measures[secondary_measure],
-                ),
-                secondary_y=True,
-            )
-
-        fig.update_xaxes(title_text="timepoint")
-        min_sec_y = 0
-        max_sec_y = 12
-        fig.update_yaxes(range=[min_sec_y, max_sec_y], secondary_y=True)
+                if figure is not None:
+                    return figure
+            return chart_figure(snapshot.data_source, location, measures)
 
-        if "temp2m" in data_table.columns:
-            min_y = min(data_table["temp2m"]) - 5
-            max_y = max(data_table["temp2m"]) + 5
-            fig.update_yaxes(range=[min_y, max_y], secondary_y=False)
-
-        fig.update_layout(
-            legend_itemclick=False, legend_itemdoubleclick=False, hovermode="x"
+        key = (
+            snapshot.version,
+            location,
+            None if measures is None else tuple(measures),
         )
-        fig.update_traces(mode="markers+lines")
-
-        return fig
+        return figure_cache.get(key, _render), relayout_update
 
     return html.Div(
         dcc.Graph(
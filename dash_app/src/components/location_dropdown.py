@@ -1,44 +1,48 @@
-from typing import List, Dict
-import pandas as pd
+from typing import List, Dict, Optional, Tuple
 from dash import Dash, dcc, html
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
+from ..data.registry import SnapshotRegistry
 from ..data.source import DataSource
 from . import ids
 
 
-def render(*, app: Dash, data_source: DataSource) -> html.Div:
+def location_options(data_source: DataSource) -> List[str]:
+    """
+    Dropdown options of data source locations - location index shipped with
+    layout, as plain names (label is the value)
+    """
+    return list(data_source.locations_list)
+
+
+def render(*, app: Dash, snapshots: SnapshotRegistry) -> html.Div:
     """
     Renders component
     """
 
     @app.callback(
         Output(ids.LOCATION_DROPDOWN, "options"),
+        Output(ids.LOCATION_OPTIONS_VERSION, "data"),
         Input(ids.MAIN_STORE, "data"),
-        State(ids.LOCATION_DROPDOWN, "options"),
+        State(ids.LOCATION_OPTIONS_VERSION, "data"),
     )
     def update_dropdown(
-        updated_data_source: Dict[str, any], current_data_options: List[Dict[str, str]]
-    ):
-        updated_data_source = DataSource(pd.DataFrame.from_dict(updated_data_source))
-        updated_data_options = [
-            {"label": location, "value": location}
-            for location in updated_data_source.locations_list
-        ]
-        if updated_data_options == current_data_options:
+        store: Dict[str, str], options_version: Optional[str]
+    ) -> Tuple[List[str], str]:
+        snapshot = snapshots.resolve(store)
+        if snapshot.version == options_version:
             raise PreventUpdate
-        return updated_data_options
+        return location_options(snapshot.data_source), snapshot.version
 
+    snapshot = snapshots.latest
     return html.Div(
         children=[
             html.H6("Location"),
+            dcc.Store(id=ids.LOCATION_OPTIONS_VERSION, data=snapshot.version),
             dcc.Dropdown(
                 id=ids.LOCATION_DROPDOWN,
-                options=[
-                    {"label": location, "value": location}
-                    for location in data_source.locations_list
-                ],
-                value=data_source.locations_list[0],
+                options=location_options(snapshot.data_source),
+                value=snapshot.data_source.locations_list[0],
                 multi=False,
                 clearable=False,
                 placeholder="Select location",
@@ -1,15 +1,25 @@
-from typing import List, Dict
-import pandas as pd
+from typing import List, Dict, Optional, Tuple
 from dash import Dash, html, dcc
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 from ..data.mapping import human_readable_measures as hrm
 
+from ..data.registry import SnapshotRegistry
 from ..data.source import DataSource
 from . import ids
 
 
-def render(*, app: Dash, data_source: DataSource) -> html.Div:
+def measure_options(data_source: DataSource) -> List[Dict[str, str]]:
+    """
+    Dropdown options of data source graphed measures
+    """
+    return [
+        {"label": hrm.get(measure, measure), "value": measure}
+        for measure in data_source.graphed_measures_list
+    ]
+
+
+def render(*, app: Dash, snapshots: SnapshotRegistry) -> html.Div:
     """
     Renders component
     """
@@ -19,10 +29,11 @@ def render(*, app: Dash, data_source: DataSource) -> html.Div:
             ids.MEASURE_DROPDOWN, "value", allow_duplicate=True
         ),  # pylint: disable=unexpected-keyword-arg
         [Input(ids.SELECT_ALL_MEASURES_BUTTON, "n_clicks")],
+        State(ids.MAIN_STORE, "data"),
         prevent_initial_call=True,
     )
-    def select_all_measures(_: int) -> List[int]:
-        return data_source.graphed_measures_list
+    def select_all_measures(_: int, store: Dict[str, str]) -> List[int]:
+        return snapshots.resolve(store).data_source.graphed_measures_list
 
     @app.callback(
         Output(ids.MEASURE_DROPDOWN, "value"),
@@ -33,31 +44,27 @@ def render(*, app: Dash, data_source: DataSource) -> html.Div:
 
     @app.callback(
         Output(ids.MEASURE_DROPDOWN, "options"),
+        Output(ids.MEASURE_OPTIONS_VERSION, "data"),
         Input(ids.MAIN_STORE, "data"),
-        State(ids.MEASURE_DROPDOWN, "options"),
+        State(ids.MEASURE_OPTIONS_VERSION, "data"),
     )
     def update_measure_dropdown(
-        updated_data_source: Dict[str, any], current_options: List[Dict[str, str]]
-    ):
-        updated_data_source = DataSource(pd.DataFrame.from_dict(updated_data_source))
-        updated_options = [
-            {"label": hrm.get(measure, measure), "value": measure}
-            for measure in updated_data_source.graphed_measures_list
-        ]
-        if updated_options == current_options:
+        store: Dict[str, str], options_version: Optional[str]
+    ) -> Tuple[List[Dict[str, str]], str]:
+        snapshot = snapshots.resolve(store)
+        if snapshot.version == options_version:
             raise PreventUpdate
-        return updated_options
+        return measure_options(snapshot.data_source), snapshot.version
 
+    snapshot = snapshots.latest
     return html.Div(
         children=[
             html.H6("Measure"),
+            dcc.Store(id=ids.MEASURE_OPTIONS_VERSION, data=snapshot.version),
             dcc.Dropdown(
                 id=ids.MEASURE_DROPDOWN,
-                options=[
-                    {"label": hrm.get(measure, measure), "value": measure}
-                    for measure in data_source.graphed_measures_list
-                ],
-                value=data_source.graphed_measures_list,
+                options=measure_options(snapshot.data_source),
+                value=snapshot.data_source.graphed_measures_list,
                 multi=True,
                 placeholder="Select measures",
             ),
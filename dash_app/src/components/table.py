@@ -1,16 +1,150 @@
 import datetime
-import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List
+import numpy as np
 from dash import Dash, html, dcc
 from dash.dependencies import Input, Output, State
+from ..data.registry import SnapshotRegistry
 from ..data.source import DataSource
 from . import ids
 
+# columns of location rows shipped to browser for clientside table rendering
+TABLE_COLUMNS = (
+    "temp2m",
+    "wind10m_speed",
+    "wind10m_direction",
+    "prec_type",
+    "transparency_desc",
+    "seeing_desc",
+    "cloudcover_desc",
+    "rh2m_desc",
+)
 
-def render(*, app: Dash) -> html.Div:
+# renders table from location payload; timepoints are naive wall clock times as
+# epoch milliseconds, hovered point is looked up as nearest, current time as floor
+TABLE_JS = """
+function(hoverData, payload) {
+    if (!payload || !payload.timepoint.length) {
+        return ["", "No data"];
+    }
+    const times = payload.timepoint;
+    const floor = function(time) {
+        let low = 0, high = times.length;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (times[middle] <= time) { low = middle + 1; } else { high = middle; }
+        }
+        return low - 1;
+    };
+    const nearest = function(time) {
+        const row = floor(time);
+        if (row < 0) { return 0; }
+        if (row + 1 < times.length && times[row + 1] - time < time - times[row]) {
+            return row + 1;
+        }
+        return row;
+    };
+    const wallClock = function(text) {
+        const parts = String(text).match(/\\d+/g).map(Number);
+        const millis = parts.length > 6 ? Number("0." + String(parts[6])) * 1000 : 0;
+        return Date.UTC(
+            parts[0], parts[1] - 1, parts[2], parts[3] || 0, parts[4] || 0,
+            parts[5] || 0, millis
+        );
+    };
+    let row;
+    if (hoverData && hoverData.points && hoverData.points.length) {
+        row = nearest(wallClock(hoverData.points[0].x));
+    } else {
+        const now = new Date();
+        const time = now.getTime() - now.getTimezoneOffset() * 60000;
+        row = floor(time) < 0 ? nearest(time) : floor(time);
+    }
+    const value = function(column) { return payload[column][row]; };
+    const date = new Date(times[row]);
+    const months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+    const pad = function(number) { return String(number).padStart(2, "0"); };
+    const hour = date.getUTCHours() % 12 || 12;
+    const title = "## " + pad(date.getUTCDate()) + " " + months[date.getUTCMonth()]
+        + " " + date.getUTCFullYear() + ", " + pad(hour) + " "
+        + (date.getUTCHours() < 12 ? "AM" : "PM");
+    const body = [
+        "Temp: " + value("temp2m"),
+        "Wind : " + value("wind10m_speed") + " m/s | " + value("wind10m_direction"),
+        "Precipitation : "
+            + (value("prec_type") !== "none" ? value("prec_type") : "clear"),
+        "Transparency: " + value("transparency_desc"),
+        "Seeing : " + value("seeing_desc"),
+        "Cloud coverage: " + value("cloudcover_desc"),
+        "Relative humidity : " + value("rh2m_desc") + "\\n***",
+    ].join("\\n\\n");
+    return [title, body];
+}
+"""
+
+
+def table_payload(data_source: DataSource, location: str) -> Dict[str, List[Any]]:
+    """
+    Returns location rows (sorted by timepoint) as columns of table values
+    """
+    index = data_source.timepoint_index(location)
+    rows = data_source.data.iloc[np.asarray(index.rows, dtype=np.int64)]
+    payload = {
+        "timepoint": index.timepoints.astype("datetime64[ms]").astype(np.int64).tolist()
+    }
+    for column in TABLE_COLUMNS:
+        payload[column] = rows[column].astype(object).tolist()
+    return payload
+
+
+def render_clientside(*, app: Dash, snapshots: SnapshotRegistry) -> html.Div:
+    """
+    Renders component rendered in browser - server only ships location payload,
+    when location or data snapshot changes
+    """
+
+    @app.callback(
+        Output(ids.TABLE_STORE, "data"),
+        Input(ids.LOCATION_DROPDOWN, "value"),
+        Input(ids.MAIN_STORE, "data"),
+    )
+    def update_table_payload(
+        location: str, store: Dict[str, str]
+    ) -> Dict[str, List[Any]]:
+        return table_payload(snapshots.resolve(store).data_source, location)
+
+    app.clientside_callback(
+        TABLE_JS,
+        Output(ids.TABLE_TITLE, "children"),
+        Output(ids.TABLE_BODY, "children"),
+        Input(ids.LINE_CHART, "hoverData"),
+        Input(ids.TABLE_STORE, "data"),
+        Input(ids.INTERVAL_COMPONENT, "n_intervals"),
+    )
+
+    return html.Div(
+        [
+            dcc.Interval(id=ids.INTERVAL_COMPONENT, interval=60 * 1000, n_intervals=0),
+            dcc.Store(id=ids.TABLE_STORE),
+            html.Div(
+                id=ids.TABLE,
+                children=[
+                    dcc.Markdown(id=ids.TABLE_TITLE),
+                    dcc.Markdown(id=ids.TABLE_BODY),
+                ],
+            ),
+        ]
+    )
+
+
+def render(
+    *, app: Dash, snapshots: SnapshotRegistry, clientside: bool = False
+) -> html.Div:
     """
     Renders component
     """
+    if clientside:
+        return render_clientside(app=app, snapshots=snapshots)
 
     @app.callback(
         Output(ids.TIME_STORE, "data"), Input(ids.INTERVAL_COMPONENT, "n_intervals")
@@ -33,17 +167,19 @@ def render(*, app: Dash) -> html.Div:
         timepoint: datetime.datetime,
         data_source: Dict[str, any],
     ) -> dcc.Markdown:
-        data_source = DataSource(pd.DataFrame.from_dict(data_source))
-        df = data_source.filter(location=location, measures=None)
-        df = df.build_data_table()
-
-        current_timepoint = df[df["timepoint"] < timepoint]["timepoint"].iloc[0]
-        if hov_data is None:
-            highlight_timepoint = current_timepoint
-        else:
-            highlight_timepoint = hov_data["points"][0]["x"]
-        highlight_timepoint = str(highlight_timepoint)
-        data_snapshot = df[df["timepoint"] == highlight_timepoint].to_dict("records")[0]
+        data_source = snapshots.resolve(data_source).data_source
+        index = data_source.timepoint_index(location)
+        if not len(index):
+            return html.Div("No data")
+
+        row = None
+        if hov_data is not None:
+            row = index.exact(hov_data["points"][0]["x"])
+        if row is None:
+            row = index.floor(timepoint)
+        if row is None:
+            row = index.nearest(timepoint)
+        data_snapshot = data_source.data.iloc[row].to_dict()
 
         table = html.Div(
             children=[
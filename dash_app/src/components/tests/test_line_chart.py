@@ -0,0 +1,180 @@
+"""Tests for line chart served from chart artifacts"""
+import importlib.util
+import json
+from pathlib import Path
+import pandas as pd
+import pytest
+from dash import Dash, no_update
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+from plotly.io.json import to_json_plotly
+from ...data.cache import FigureCache
+from ...data.charts import CHART_VERSION, ChartArtifacts
+from ...data.loader import DataSchema, LOADER_PIPELINE
+from ...data.registry import Snapshot, SnapshotRegistry
+from ...data.tests.weather_data_generator import FakeWeatherDataGenerator
+from .. import ids, line_chart
+
+LOCATION_NO = 3
+TIMEPOINT_NO = 12
+
+
+def _get_data_charts():
+    """
+    Artifacts builder of get_data, deployed separately (not importable as package)
+    """
+    path = Path(__file__).parents[4] / "get_data" / "charts.py"
+    if not path.exists():
+        pytest.skip("get_data is not available")
+    spec = importlib.util.spec_from_file_location("get_data_charts", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def raw_frame() -> pd.DataFrame:
+    data = FakeWeatherDataGenerator(location_no=LOCATION_NO, timepoint_no=TIMEPOINT_NO)
+    df = pd.DataFrame(data.produce_data(), columns=DataSchema.__fields__)
+    # stored timepoints are whole seconds
+    return df.assign(timepoint=pd.to_datetime(df["timepoint"]).dt.floor("s"))
+
+
+@pytest.fixture
+def snapshots(raw_frame) -> SnapshotRegistry:
+    # loader pipeline rescales frame in place
+    data = LOADER_PIPELINE.run(raw_frame.copy())
+    registry = SnapshotRegistry()
+    registry.publish(Snapshot.build(data, origin="primary"))
+    return registry
+
+
+@pytest.fixture
+def artifacts(raw_frame, tmp_path) -> ChartArtifacts:
+    """
+    Artifacts written by get_data from same stored data
+    """
+    charts = _get_data_charts()
+    for location, df in raw_frame.set_index("location").groupby(level=0):
+        (tmp_path / charts.chart_name(location)).write_text(
+            json.dumps(charts.chart_artifact(df))
+        )
+    return ChartArtifacts(str(tmp_path))
+
+
+def test_ChartArtifacts_skips_missing_and_unknown(artifacts, tmp_path):
+    assert artifacts.load("Nowhere") is None
+    (tmp_path / "Broken.json").write_text("{")
+    assert artifacts.load("Broken") is None
+    (tmp_path / "Future.json").write_text(json.dumps({"version": CHART_VERSION + 1}))
+    assert artifacts.load("Future") is None
+
+
+def test_artifact_figure_matches_live_figure(snapshots, artifacts):
+    data_source = snapshots.latest.data_source
+    for location in data_source.locations_list:
+        for measures in (None, ["cloudcover", "seeing"], ["temp2m", "rh2m"], []):
+            live = line_chart.chart_figure(data_source, location, measures)
+            served = line_chart.artifact_figure(
+                artifacts.load(location), data_source, location, measures
+            )
+            # same figure whichever path serves it
+            assert json.loads(to_json_plotly(served)) == json.loads(live.to_json())
+
+
+def test_artifact_figure_rejects_stale_artifact(snapshots, artifacts):
+    data_source = snapshots.latest.data_source
+    location = data_source.locations_list[0]
+    artifact = artifacts.load(location)
+    artifact["timepoints"]["count"] -= 1
+    assert line_chart.artifact_figure(artifact, data_source, location, None) is None
+    other = artifacts.load(data_source.locations_list[1])
+    assert line_chart.artifact_figure(other, data_source, location, None) is None
+
+
+CHART_OUTPUTS = f"..{ids.LINE_CHART}.figure...{ids.LINE_CHART}.relayoutData.."
+
+# zoomed into whole forecast, fetched data is the same as for whole range
+ZOOM = {"xaxis.range[0]": "2000-01-01", "xaxis.range[1]": "2100-01-01"}
+
+
+def _update_chart(app: Dash, *args, triggered: str = ids.LOCATION_DROPDOWN + ".value"):
+    context_value.set(AttributeDict(triggered_inputs=[{"prop_id": triggered}]))
+    callback = app.callback_map[CHART_OUTPUTS]["callback"]
+    return callback.__wrapped__(*args)
+
+
+def _chart_app(snapshots, figure_cache, artifacts=None) -> Dash:
+    app = Dash(__name__)
+    line_chart.render(
+        app=app, snapshots=snapshots, figure_cache=figure_cache, artifacts=artifacts
+    )
+    return app
+
+
+def test_chart_served_from_artifact_unless_zoomed(snapshots, artifacts):
+    app = _chart_app(snapshots, FigureCache(), artifacts)
+    store = snapshots.latest.store
+    location = snapshots.latest.data_source.locations_list[0]
+    figure, _ = _update_chart(app, location, None, store, None, store)
+    assert isinstance(figure, dict) and figure["data"][0]["meta"]
+
+    figure, _ = _update_chart(
+        app,
+        location,
+        None,
+        store,
+        ZOOM,
+        store,
+        triggered=ids.LINE_CHART + ".relayoutData",
+    )
+    assert not isinstance(figure, dict)
+
+    figure, _ = _update_chart(app, "Nowhere", None, store, None, store)
+    assert not isinstance(figure, dict)
+
+
+def test_zoomed_ranges_are_not_cached(snapshots):
+    figure_cache = FigureCache()
+    app = _chart_app(snapshots, figure_cache)
+    store = snapshots.latest.store
+    location = snapshots.latest.data_source.locations_list[0]
+    _update_chart(app, location, None, store, None, store)
+    for end in ("2090-01-01", "2100-01-01", "2110-01-01"):
+        _update_chart(
+            app,
+            location,
+            None,
+            store,
+            {"xaxis.range[0]": "2000-01-01", "xaxis.range[1]": end},
+            store,
+            triggered=ids.LINE_CHART + ".relayoutData",
+        )
+    assert figure_cache.stats.entries == 1
+    # measures selected in any order share one entry
+    for measures in (["seeing", "temp2m"], ["temp2m", "seeing"]):
+        _update_chart(
+            app,
+            location,
+            measures,
+            store,
+            None,
+            store,
+            triggered=ids.MEASURE_DROPDOWN + ".value",
+        )
+    assert figure_cache.stats.entries == 2
+    assert figure_cache.stats.hits == 1
+
+
+def test_zoom_is_reset_when_location_changes(snapshots):
+    app = _chart_app(snapshots, FigureCache())
+    store = snapshots.latest.store
+    first, second = snapshots.latest.data_source.locations_list[:2]
+    zoomed, relayout = _update_chart(
+        app, first, None, store, ZOOM, store, triggered=ids.LINE_CHART + ".relayoutData"
+    )
+    assert list(zoomed.layout.xaxis.range) == ["2000-01-01", "2100-01-01"]
+    assert relayout is no_update
+    # relayout data of first location chart is still held by graph
+    figure, relayout = _update_chart(app, second, None, store, ZOOM, store)
+    assert figure.layout.xaxis.range is None and relayout is None
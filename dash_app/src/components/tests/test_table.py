@@ -0,0 +1,131 @@
+"""Tests for summary table server and clientside rendering"""
+import json
+import shutil
+import subprocess
+import pandas as pd
+import pytest
+from dash import Dash
+from ...data.loader import DataSchema, LOADER_PIPELINE
+from ...data.registry import Snapshot, SnapshotRegistry
+from ...data.tests.weather_data_generator import FakeWeatherDataGenerator
+from .. import ids, table
+
+LOCATION_NO = 3
+TIMEPOINT_NO = 12
+
+
+class FakeBrowser:
+    """
+    Propagates property changes through app callbacks, like dash renderer does;
+    server callbacks are invoked and counted, clientside ones only recorded
+    """
+
+    def __init__(self, app: Dash, props: dict):
+        self.app = app
+        self.props = dict(props)
+        self.server_calls = 0
+        self.clientside_calls = 0
+
+    def set(self, prop_id: str, value) -> None:
+        self.props[prop_id] = value
+        for output, spec in self.app.callback_map.items():
+            if prop_id not in [
+                f"{dep['id']}.{dep['property']}" for dep in spec["inputs"]
+            ]:
+                continue
+            if "callback" not in spec:
+                self.clientside_calls += 1
+                continue
+            self.server_calls += 1
+            args = [
+                self.props.get(f"{dep['id']}.{dep['property']}")
+                for dep in spec["inputs"] + spec["state"]
+            ]
+            result = spec["callback"].__wrapped__(*args)
+            outputs = output.strip(".").split("...")
+            for output_id, value in zip(
+                outputs, result if len(outputs) > 1 else [result]
+            ):
+                self.set(output_id, value)
+
+
+@pytest.fixture
+def snapshots() -> SnapshotRegistry:
+    data = FakeWeatherDataGenerator(location_no=LOCATION_NO, timepoint_no=TIMEPOINT_NO)
+    df = pd.DataFrame(data.produce_data(), columns=DataSchema.__fields__)
+    registry = SnapshotRegistry()
+    registry.publish(Snapshot.build(LOADER_PIPELINE.run(df), origin="primary"))
+    return registry
+
+
+def _hover_sweep(browser: FakeBrowser, snapshots: SnapshotRegistry) -> list:
+    data_source = snapshots.latest.data_source
+    location = data_source.locations_list[0]
+    browser.set(ids.LOCATION_DROPDOWN + ".value", location)
+    hovers = [
+        {"points": [{"x": str(timepoint)}]}
+        for timepoint in data_source.window(location, None).data["timepoint"]
+    ]
+    for hover in hovers:
+        browser.set(ids.LINE_CHART + ".hoverData", hover)
+    return hovers
+
+
+def _browser(clientside: bool, snapshots: SnapshotRegistry) -> FakeBrowser:
+    app = Dash(__name__)
+    table.render(app=app, snapshots=snapshots, clientside=clientside)
+    return FakeBrowser(
+        app,
+        {
+            ids.MAIN_STORE + ".data": snapshots.latest.store,
+            ids.TIME_STORE + ".data": "2000-01-01T00:00:00",
+        },
+    )
+
+
+def test_hover_sweep_server_callbacks(snapshots):
+    browser = _browser(clientside=False, snapshots=snapshots)
+    hovers = _hover_sweep(browser, snapshots)
+    assert browser.server_calls == 1 + len(hovers)
+
+    browser = _browser(clientside=True, snapshots=snapshots)
+    hovers = _hover_sweep(browser, snapshots)
+    # only location change reaches server, hovers are rendered in browser
+    assert browser.server_calls == 1
+    assert browser.clientside_calls == 1 + len(hovers)
+    payload = browser.props[ids.TABLE_STORE + ".data"]
+    assert len(payload["timepoint"]) == TIMEPOINT_NO
+    assert payload["timepoint"] == sorted(payload["timepoint"])
+    assert set(payload) == {"timepoint", *table.TABLE_COLUMNS}
+    json.dumps(payload)
+
+
+def _markdown_lines(*texts: str) -> list:
+    return [line.strip() for text in texts for line in text.split("\n") if line.strip()]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not available")
+def test_clientside_table_matches_server_table(snapshots):
+    browser = _browser(clientside=False, snapshots=snapshots)
+    hovers = _hover_sweep(browser, snapshots)
+    location = browser.props[ids.LOCATION_DROPDOWN + ".value"]
+    payload = table.table_payload(snapshots.latest.data_source, location)
+    script = (
+        f"const render = {table.TABLE_JS};\n"
+        f"const hovers = {json.dumps(hovers)};\n"
+        f"const payload = {json.dumps(payload)};\n"
+        "console.log(JSON.stringify(hovers.map(hover => render(hover, payload))));"
+    )
+    rendered = json.loads(
+        subprocess.run(
+            ["node", "-e", script], capture_output=True, check=True, text=True
+        ).stdout
+    )
+    for hover, (title, body) in zip(hovers, rendered):
+        server_table = browser.app.callback_map[ids.TABLE + ".children"]["callback"]
+        server_table = server_table.__wrapped__(
+            hover, location, "2000-01-01T00:00:00", snapshots.latest.store
+        )
+        assert _markdown_lines(title, body) == _markdown_lines(
+            *(markdown.children for markdown in server_table.children)
+        )
@@ -0,0 +1,173 @@
+"""Loaded data cache revalidated against stored object version, figures cache"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import pandas as pd
+from .registry import Snapshot
+from .storage import data_version
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of cache lookups: hits reused cached frame, misses loaded data,
+    revalidations checked version of already cached frame (either outcome)
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+
+
+class DataCache:
+    """
+    Keeps last frame returned by loader per (path, failsafe_path, options).
+    Before reuse, only metadata of stored data is checked (see storage.data_version);
+    frame is loaded again when stored data changed. Cached frames are shared
+    between callers and must not be modified
+    """
+
+    def __init__(self, loader: Callable[..., pd.DataFrame]):
+        self.loader = loader
+        self.stats = CacheStats()
+        self._entries: Dict[Hashable, Tuple[Hashable, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(path: str, failsafe_path: str) -> Optional[Hashable]:
+        version = data_version(path)
+        if version is not None:
+            return version
+        failsafe_version = data_version(failsafe_path)
+        return None if failsafe_version is None else ("failsafe", failsafe_version)
+
+    def load(self, path: str, failsafe_path: str, **options: Any) -> pd.DataFrame:
+        """
+        Returns data as loader(path, failsafe_path, **options) would
+        """
+        key = (
+            path,
+            failsafe_path,
+            tuple(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in sorted(options.items())
+            ),
+        )
+        with self._lock:
+            version = self._version(path, failsafe_path)
+            cached = self._entries.get(key)
+            if cached is not None:
+                self.stats.revalidations += 1
+                if version is not None and cached[0] == version:
+                    self.stats.hits += 1
+                    return cached[1]
+            self.stats.misses += 1
+            data = self.loader(path=path, failsafe_path=failsafe_path, **options)
+            if version is not None:
+                self._entries[key] = (version, data)
+            return data
+
+
+@dataclass
+class RenderStats:
+    """
+    Counters of figure cache: hits reused rendered figure, misses rendered it
+    (render_seconds in total), evictions dropped least recently used figures
+    over size bounds, invalidations dropped figures of replaced snapshots
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    render_seconds: float = 0.0
+    entries: int = 0
+    nbytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_render_seconds(self) -> float:
+        return self.render_seconds / self.misses if self.misses else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "hit_ratio": self.hit_ratio,
+            "mean_render_seconds": self.mean_render_seconds,
+        }
+
+
+class FigureCache:
+    """
+    Rendered figures shared between users, keyed by tuples starting with data
+    snapshot version (eg. version, location, measures). Least recently used
+    figures are evicted over max_entries or max_bytes (as estimated by size);
+    figures of other snapshots are dropped when new snapshot is published.
+    Cached figures are shared between callers and must not be modified
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 2**20,
+        size: Callable[[Any], int] = sys.getsizeof,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = size
+        self.stats = RenderStats()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...], render: Callable[[], Any]) -> Any:
+        """
+        Returns cached figure of key, rendered with render() on miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+        # rendered outside of lock, concurrent misses of one key render twice
+        start = time.perf_counter()
+        figure = render()
+        elapsed = time.perf_counter() - start
+        nbytes = self.size(figure)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.render_seconds += elapsed
+            if nbytes <= self.max_bytes:
+                self._drop(key)
+                self._entries[key] = (figure, nbytes)
+                self.stats.nbytes += nbytes
+                while (
+                    len(self._entries) > self.max_entries
+                    or self.stats.nbytes > self.max_bytes
+                ):
+                    self._drop(next(iter(self._entries)))
+                    self.stats.evictions += 1
+            self.stats.entries = len(self._entries)
+        return figure
+
+    def on_publish(self, snapshot: Snapshot) -> None:
+        """
+        Drops figures rendered from other snapshots than just published one
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] != snapshot.version]:
+                self._drop(key)
+                self.stats.invalidations += 1
+            self.stats.entries = len(self._entries)
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.stats.nbytes -= entry[1]
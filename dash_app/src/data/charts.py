@@ -0,0 +1,36 @@
+"""Figure-ready per-location chart artifacts written at ingestion"""
+import json
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+import fsspec
+
+logger = logging.getLogger(__name__)
+
+# artifact layout version written by get_data (see get_data/charts.py)
+CHART_VERSION = 1
+
+
+class ChartArtifacts:
+    """
+    Reads chart artifacts stored under path, one object per location.
+    Missing, unreadable or other version artifacts are returned as None -
+    chart is then rendered live
+    """
+
+    def __init__(self, path: str):
+        self.filesystem, self.target = fsspec.core.url_to_fs(path)
+
+    def load(self, location: str) -> Optional[Dict[str, Any]]:
+        name = f"{self.target}/{quote(location, safe='')}.json"
+        try:
+            with self.filesystem.open(name, "r") as handle:
+                artifact = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Unreadable chart artifact %s", name)
+            return None
+        if artifact.get("version") != CHART_VERSION:
+            return None
+        return artifact
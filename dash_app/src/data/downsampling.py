@@ -0,0 +1,80 @@
+"""Downsampling of time series to screen resolution"""
+from typing import Callable, Dict, Iterable
+import numpy as np
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.view(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets - returns sorted positions of threshold points
+    (first and last included) best preserving visual shape of series.
+    Points are split into threshold - 2 buckets, from every bucket point forming
+    largest triangle with previously selected point and next bucket average is kept
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # averages of next bucket, last point for the last bucket
+    next_x = np.append((np.add.reduceat(x[:-1], edges[:-1]) / counts)[1:], x[-1])
+    next_y = np.append((np.add.reduceat(y[:-1], edges[:-1]) / counts)[1:], y[-1])
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, length - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        area = np.abs(
+            (x[previous] - next_x[bucket]) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y[bucket] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def min_max(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Returns sorted positions of minimum and maximum of every of threshold // 2
+    equal buckets (first and last point included) - keeps all extremes of series
+    """
+    length = len(x)
+    if threshold >= length or threshold < 4:
+        return np.arange(length)
+    buckets = np.arange(length) * (threshold // 2) // length
+    order = np.lexsort((_as_float(y), buckets))
+    bounds = np.flatnonzero(np.diff(buckets[order], prepend=-1))
+    extremes = np.concatenate(
+        ([0, length - 1], order[bounds], order[np.append(bounds[1:], length) - 1])
+    )
+    return np.unique(extremes)
+
+
+DOWNSAMPLERS: Dict[str, Callable[[np.ndarray, np.ndarray, int], np.ndarray]] = {
+    "lttb": lttb,
+    "minmax": min_max,
+}
+
+
+def downsample(
+    x: np.ndarray, series: Iterable[np.ndarray], threshold: int, method: str = "lttb"
+) -> np.ndarray:
+    """
+    Returns sorted positions of at most about threshold points kept for series
+    sharing x - union of positions selected for every series (with threshold
+    split between them), so that each keeps its shape
+    """
+    if method not in DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    series = list(series)
+    if not series:
+        return np.arange(len(x))
+    threshold = max(threshold // len(series), 4)
+    positions = [DOWNSAMPLERS[method](x, y, threshold) for y in series]
+    return np.unique(np.concatenate(positions))
@@ -1,9 +1,19 @@
 from datetime import datetime
-from typing import List
+from typing import Any, List, Optional
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, validator, conint
 from . import mapping as mp
 from . import fields
+from .pipeline import (
+    CastDtypes,
+    CheckUnique,
+    Describe,
+    Pipeline,
+    Rescale,
+    ValidateSchema,
+)
+from .storage import read_astrometeo_data
 
 
 class DataSchema(BaseModel):
@@ -42,108 +52,117 @@ class DataSchema(BaseModel):
         return list(cls.schema().get("properties").keys())
 
 
-def validate_data_schema(data_schema: BaseModel):
+# in-memory dtypes of compact mode, ranges as in fields (rh2m and lifted_index rescaled)
+COMPACT_DTYPES = {
+    "location": "category",
+    "timepoint": "datetime64[ns]",
+    "cloudcover": "int8",
+    "seeing": "int8",
+    "transparency": "int8",
+    "lifted_index": "int8",
+    "rh2m": "float32",
+    "temp2m": "int8",
+    "prec_type": pd.CategoricalDtype([prec.value for prec in fields.Prec]),
+    "wind10m_direction": pd.CategoricalDtype(
+        [direction.value for direction in fields.WindDirection]
+    ),
+    "wind10m_speed": "int8",
+}
+
+
+def to_datetime64(timepoint: Any) -> np.datetime64:
     """
-    Decorator to validate input data against provided dataschema
+    Converts timepoint (datetime, Timestamp or ISO string, eg. from browser store
+    or hover data) to naive datetime64[ns], comparable with data timepoints
     """
+    timepoint = pd.Timestamp(timepoint)
+    if timepoint.tz is not None:
+        timepoint = timepoint.tz_convert(None)
+    return timepoint.to_datetime64()
 
-    def wrapper(func):
-        class Validator(BaseModel):
-            """
-            Class providing instance of schema to validate against
-            """
-
-            schema_dict: List[data_schema]
 
-        def _wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            if isinstance(result, pd.DataFrame):
-                df_dict = result.to_dict(orient="records")
-                _ = Validator(schema_dict=df_dict)
-            else:
-                raise TypeError("You are not providing pandas.DataFrame")
-            return result
+def to_compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns df with (present) schema columns cast to compact dtypes
+    """
+    return df.astype(
+        {column: dtype for column, dtype in COMPACT_DTYPES.items() if column in df}
+    )
 
-        return _wrapper
 
-    return wrapper
+def validate_data_schema(data_schema: BaseModel):
+    """
+    Decorator to validate input data against provided dataschema,
+    column by column (see validation.validate_frame)
+    """
+    return Pipeline([ValidateSchema(data_schema)])
 
 
 def validate_unique_columns_combinations(columns: List[str]):
     """
     Decorator to check uniqueness of data across columns
     """
-
-    def wraper(func):
-        def _wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            if isinstance(result, pd.DataFrame):
-                if any(result.duplicated(subset=[*columns])):
-                    raise ValueError(
-                        f"Your data has to be unique across columns {columns}"
-                    )
-            else:
-                raise TypeError("You are not providing pandas.DataFrame")
-            return result
-
-        return _wrapper
-
-    return wraper
+    return Pipeline([CheckUnique(columns)])
 
 
 def rescale_data(mapping: List[tuple]):
     """
     Decorator to rescale numeric data - integrity purposes.
     Input list of tuples including column name to be rescaled and dictionary
-    with mapping (initial value -> rescaled value)
+    with mapping (initial value -> rescaled value), compiled into lookup arrays
     """
-
-    def wrapper(func):
-        def _wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            for mapper in mapping:
-                result.replace({mapper[0]: mapper[1]}, inplace=True)
-            return result
-
-        return _wrapper
-
-    return wrapper
+    return Pipeline([Rescale(mapping)])
 
 
 def add_descriptions(columns: List[str]):
     """
-    Add dolumns with descriptions - utlized later for hovertemplate on chart
+    Add columns with descriptions - utlized later for hovertemplate on chart.
+    Descriptions are categoricals, labels are stored once per description table
     """
-
-    def wrapper(func):
-        def _wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            for column in columns:
-                mapping = mp.descriptions.get(column)
-                desc_column_name = f"{column}_desc"
-                result[desc_column_name] = result[column].map(mapping)
-            return result
-
-        return _wrapper
-
-    return wrapper
+    return Pipeline([Describe(mp.descriptions, columns)])
+
+
+# every loaded frame passes these stages in one pipeline run;
+# register stats hooks on it to see cost of each stage
+LOADER_PIPELINE = Pipeline(
+    [
+        ValidateSchema(DataSchema),
+        CheckUnique(["timepoint", "location"]),
+        Rescale(
+            [
+                ("rh2m", mp.RH2M_SCALED_TABLE),
+                ("lifted_index", mp.LIFTED_INDEX_SCALED_TABLE),
+            ]
+        ),
+        Describe(
+            mp.descriptions,
+            [
+                "cloudcover",
+                "lifted_index",
+                "seeing",
+                "transparency",
+                "rh2m",
+                "wind10m_speed",
+            ],
+        ),
+        CastDtypes(COMPACT_DTYPES),
+    ]
+)
 
 
-@add_descriptions(
-    ["cloudcover", "lifted_index", "seeing", "transparency", "rh2m", "wind10m_speed"]
-)
-@validate_unique_columns_combinations(["timepoint", "location"])
-@rescale_data(
-    [("rh2m", mp.RH2M_SCALED_TABLE), ("lifted_index", mp.LIFTED_INDEX_SCALED_TABLE)]
-)
-@validate_data_schema(DataSchema)
-def load_astrometeo_data(path: str, failsafe_path: str) -> pd.DataFrame:
+@LOADER_PIPELINE
+def load_astrometeo_data(
+    path: str, failsafe_path: str, locations: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
-    Loads data from .csv under given path
+    Loads data from .csv or partitioned parquet dataset under given path.
+    Only schema columns (and for parquet - latest init of given locations) are read.
+    Data is validated, rescaled and described in LOADER_PIPELINE.
+    With compact=True data is returned in compact dtypes (see COMPACT_DTYPES)
     """
+    columns = DataSchema.get_fields_names()
     try:
-        data = pd.read_csv(path)
+        data = read_astrometeo_data(path, columns=columns, locations=locations)
     except FileNotFoundError:
-        data = pd.read_csv(failsafe_path)
-    data["timepoint"] = pd.to_datetime(data["timepoint"])
+        data = read_astrometeo_data(failsafe_path, columns=columns, locations=locations)
     return data
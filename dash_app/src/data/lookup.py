@@ -0,0 +1,72 @@
+"""Mapping tables compiled into vectorized lookups"""
+from typing import Dict, Hashable
+import numpy as np
+import pandas as pd
+
+
+class ScaleTable:
+    """
+    Rescaling table (initial value -> rescaled value) compiled into dense array
+    indexed by integer value; values missing in table are left unchanged
+    """
+
+    def __init__(self, table: Dict[int, float]):
+        keys = np.fromiter(table.keys(), dtype=np.int64)
+        self.table = table
+        self.low = int(keys.min())
+        self.values = np.zeros(
+            int(keys.max()) - self.low + 1, dtype=np.result_type(*table.values())
+        )
+        self.known = np.zeros(self.values.size, dtype=bool)
+        self.values[keys - self.low] = list(table.values())
+        self.known[keys - self.low] = True
+
+    def _result_dtype(self, dtype: np.dtype) -> np.dtype:
+        """
+        Integer columns keep their dtype while rescaled integers fit in it
+        """
+        if self.values.dtype.kind in "iu":
+            known, limits = self.values[self.known], np.iinfo(dtype)
+            if limits.min <= known.min() and known.max() <= limits.max:
+                return dtype
+        return np.result_type(dtype, self.values.dtype)
+
+    def apply(self, series: pd.Series) -> pd.Series:
+        """
+        Returns rescaled series, same values as series.replace(table)
+        """
+        if series.dtype.kind not in "iu":
+            return series.replace(self.table)
+        values = series.to_numpy()
+        positions = values.astype(np.int64) - self.low
+        inside = (positions >= 0) & (positions < self.values.size)
+        hit = np.zeros(values.size, dtype=bool)
+        hit[inside] = self.known[positions[inside]]
+        rescaled = values.astype(self._result_dtype(values.dtype))
+        rescaled[hit] = self.values[positions[hit]]
+        return pd.Series(rescaled, index=series.index, name=series.name)
+
+
+class DescriptionTable:
+    """
+    Description table (value -> label) compiled into categorical dtype;
+    all described columns share its single dictionary of labels
+    """
+
+    def __init__(self, table: Dict[Hashable, str]):
+        self.keys = pd.Index(list(table.keys()))
+        labels = pd.Index(list(table.values()))
+        self.dtype = pd.CategoricalDtype(labels.unique())
+        self.codes = self.dtype.categories.get_indexer(labels)
+
+    def apply(self, series: pd.Series) -> pd.Series:
+        """
+        Returns categorical series of labels, same values as series.map(table)
+        """
+        positions = self.keys.get_indexer(series)
+        codes = np.where(positions >= 0, self.codes[positions], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=self.dtype),
+            index=series.index,
+            name=series.name,
+        )
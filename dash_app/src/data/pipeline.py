@@ -0,0 +1,181 @@
+"""Declarative, instrumented pipeline of loaded data processing stages"""
+import functools
+import logging
+from abc import ABC, abstractmethod
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+import pandas as pd
+from pydantic import BaseModel
+from .lookup import DescriptionTable, ScaleTable
+from .validation import validate_frame
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """
+    Cost of single stage run
+    """
+
+    stage: str
+    seconds: float
+    rows: int
+    columns: Tuple[str, ...]
+
+
+class Stage(ABC):
+    """
+    Single processing step working on given columns of frame owned by pipeline -
+    it changes frame in place (column by column), no intermediate frames are made.
+    options are keyword arguments of pipeline run which stage understands
+    """
+
+    name = "stage"
+    options: Tuple[str, ...] = ()
+
+    def __init__(self, columns: Iterable[str] = ()):
+        self.columns = tuple(columns)
+
+    @abstractmethod
+    def apply(self, df: pd.DataFrame, **options: Any) -> None:
+        """
+        Processes df in place
+        """
+
+
+class ValidateSchema(Stage):
+    """
+    Validates columns against data schema (see validation.validate_frame)
+    """
+
+    name = "validate_schema"
+
+    def __init__(self, data_schema: Type[BaseModel]):
+        super().__init__(data_schema.__fields__)
+        self.data_schema = data_schema
+
+    def apply(self, df: pd.DataFrame, **options: Any) -> None:
+        validate_frame(df, self.data_schema)
+
+
+class CheckUnique(Stage):
+    """
+    Checks uniqueness of data across columns
+    """
+
+    name = "check_unique"
+
+    def apply(self, df: pd.DataFrame, **options: Any) -> None:
+        if df.duplicated(subset=list(self.columns)).any():
+            raise ValueError(
+                f"Your data has to be unique across columns {list(self.columns)}"
+            )
+
+
+class Rescale(Stage):
+    """
+    Rescales columns with mapping tables (initial value -> rescaled value)
+    """
+
+    name = "rescale"
+
+    def __init__(self, mapping: List[tuple]):
+        self.tables = [(column, ScaleTable(table)) for column, table in mapping]
+        super().__init__(column for column, _ in self.tables)
+
+    def apply(self, df: pd.DataFrame, **options: Any) -> None:
+        for column, table in self.tables:
+            if column in df.columns:
+                df[column] = table.apply(df[column])
+
+
+class Describe(Stage):
+    """
+    Adds categorical <column>_desc columns with labels from description tables
+    """
+
+    name = "describe"
+
+    def __init__(self, descriptions: Dict[str, dict], columns: Iterable[str]):
+        super().__init__(columns)
+        self.tables = [
+            (column, DescriptionTable(descriptions.get(column)))
+            for column in self.columns
+        ]
+
+    def apply(self, df: pd.DataFrame, **options: Any) -> None:
+        for column, table in self.tables:
+            df[f"{column}_desc"] = table.apply(df[column])
+
+
+class CastDtypes(Stage):
+    """
+    Casts present columns to given dtypes, only when run with compact=True
+    """
+
+    name = "compact"
+    options = ("compact",)
+
+    def __init__(self, dtypes: Dict[str, Any]):
+        super().__init__(dtypes)
+        self.dtypes = dtypes
+
+    def apply(self, df: pd.DataFrame, compact: bool = False, **options: Any) -> None:
+        if not compact:
+            return
+        for column, dtype in self.dtypes.items():
+            if column in df.columns:
+                df[column] = df[column].astype(dtype)
+
+
+class Pipeline:
+    """
+    Runs stages one after another on single frame. Usable as decorator of function
+    returning data frame - options of stages become its keyword arguments.
+    After every run, per stage stats are passed to each of stats_hooks (instance
+    is shared between threads, so stats of run are not kept on it)
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = list(stages)
+        self.options = {option for stage in self.stages for option in stage.options}
+        self.stats_hooks: List[Callable[[List[StageStats]], None]] = []
+
+    def run(self, df: pd.DataFrame, **options: Any) -> pd.DataFrame:
+        return self._run(lambda: df, "input", **options)
+
+    def _run(
+        self, source: Callable[[], pd.DataFrame], name: str, **options: Any
+    ) -> pd.DataFrame:
+        stats = []
+        start = time.perf_counter()
+        df = source()
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("You are not providing pandas.DataFrame")
+        stats.append(StageStats(name, time.perf_counter() - start, len(df), ()))
+        for stage in self.stages:
+            start = time.perf_counter()
+            stage.apply(df, **options)
+            stats.append(
+                StageStats(
+                    stage.name, time.perf_counter() - start, len(df), stage.columns
+                )
+            )
+        logger.debug("Pipeline stages: %s", stats)
+        for hook in self.stats_hooks:
+            hook(stats)
+        return df
+
+    def __call__(self, func: Callable[..., pd.DataFrame]):
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+            options = {
+                option: kwargs.pop(option)
+                for option in self.options
+                if option in kwargs
+            }
+            return self._run(lambda: func(*args, **kwargs), func.__name__, **options)
+
+        return _wrapper
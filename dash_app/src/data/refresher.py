@@ -0,0 +1,95 @@
+"""Background refreshing of served data snapshot"""
+import logging
+import threading
+import weakref
+from typing import Callable, Optional
+import pandas as pd
+from .registry import Snapshot, SnapshotRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class DataRefresher:
+    """
+    Double-buffered data snapshot: new snapshot is loaded in background thread
+    (off request path) and swapped in only when complete, readers always get
+    current snapshot without any I/O.
+    On any loading error last good snapshot is kept; failsafe data is loaded
+    only when there is no good snapshot yet. Every new snapshot is published
+    to registry
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], pd.DataFrame],
+        load_failsafe: Callable[[], pd.DataFrame],
+        interval: float,
+        registry: Optional[SnapshotRegistry] = None,
+    ):
+        self.registry = registry if registry is not None else SnapshotRegistry()
+        self.load = load
+        self.load_failsafe = load_failsafe
+        self.interval = interval
+        self.refreshes = 0
+        self.errors = 0
+        self._current: Optional[Snapshot] = None
+        # identity of frame current snapshot was built from, without keeping it
+        self._loaded: Optional[weakref.ref] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> Snapshot:
+        if self._current is None:
+            self.refresh()
+        return self._current
+
+    def refresh(self) -> Snapshot:
+        """
+        Loads data and swaps snapshot in; the same snapshot is kept
+        while loaded frame is the same object (eg. served from cache)
+        """
+        try:
+            data = self.load()
+            if self._current is None or self._loaded() is not data:
+                self._swap(Snapshot.build(data, origin="primary"), data)
+        except Exception:
+            self.errors += 1
+            logger.exception("Refreshing data failed, keeping last good snapshot")
+            if self._current is None:
+                data = self.load_failsafe()
+                self._swap(Snapshot.build(data, origin="failsafe"), data)
+        self.refreshes += 1
+        return self._current
+
+    def _swap(self, snapshot: Snapshot, data: pd.DataFrame) -> None:
+        self.registry.publish(snapshot)
+        self._current = snapshot
+        self._loaded = weakref.ref(data)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Loading failsafe data failed")
+
+    def start(self) -> "DataRefresher":
+        """
+        Loads first snapshot (synchronously, unless already loaded)
+        and starts background refreshing
+        """
+        _ = self.current
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="data-refresher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,79 @@
+"""Server-side registry of served data snapshots"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+import pandas as pd
+from .source import DataSource, IndexedDataSource
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Immutable unit of served data - data source of loaded frame (loaded frame
+    itself is not kept, data source holds its sorted copy), identified by
+    unique version token
+    """
+
+    data_source: DataSource = field(repr=False)
+    origin: str
+    version: str = field(default_factory=lambda: uuid.uuid4().hex)
+    loaded_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def build(cls, data: pd.DataFrame, origin: str) -> "Snapshot":
+        """
+        Builds snapshot along with its data source precomputed metadata
+        and observing windows ranking, off request path
+        """
+        data_source = IndexedDataSource(data)
+        _ = data_source.locations_list, data_source.observing_windows
+        return cls(data_source=data_source, origin=origin)
+
+    @property
+    def store(self) -> dict:
+        """
+        Contents of browser store referring to this snapshot
+        """
+        return {"version": self.version}
+
+
+class SnapshotRegistry:
+    """
+    Snapshots served by this process, addressed by version token - browser store
+    keeps only the token, callbacks resolve it to shared in-process data source.
+    Few most recent snapshots are kept, so that clients holding previous token
+    are served consistent data; unknown tokens (eg. issued by other worker process
+    or expired) resolve to the latest snapshot. Publish hooks are called with
+    every published snapshot (eg. to invalidate derived caches)
+    """
+
+    def __init__(self, keep: int = 3):
+        self.keep = keep
+        self.publish_hooks: List[Callable[[Snapshot], None]] = []
+        self._snapshots: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            self._snapshots[snapshot.version] = snapshot
+            while len(self._snapshots) > self.keep:
+                self._snapshots.popitem(last=False)
+        for hook in self.publish_hooks:
+            hook(snapshot)
+
+    @property
+    def latest(self) -> Snapshot:
+        with self._lock:
+            return next(reversed(self._snapshots.values()))
+
+    def resolve(self, store: Optional[dict]) -> Snapshot:
+        """
+        Returns snapshot of version kept in store contents
+        """
+        version = (store or {}).get("version")
+        with self._lock:
+            snapshot = self._snapshots.get(version)
+        return snapshot if snapshot is not None else self.latest
@@ -0,0 +1,149 @@
+"""Observing quality scoring and best observing windows ranking"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from . import fields
+from .loader import to_datetime64
+
+# relative importance of measures in composite score, renormalized over present ones
+DEFAULT_WEIGHTS = {
+    "cloudcover": 0.3,
+    "seeing": 0.2,
+    "transparency": 0.2,
+    "rh2m": 0.1,
+    "wind10m_speed": 0.08,
+    "lifted_index": 0.07,
+    "prec_type": 0.05,
+}
+
+# (worst, best) values of loaded (rescaled) measures, quality is linear in between
+QUALITY_RANGES = {
+    "cloudcover": (fields.Cloudcover.HIGH_BOUND, fields.Cloudcover.LOW_BOUND),
+    "seeing": (fields.Seeing.HIGH_BOUND, fields.Seeing.LOW_BOUND),
+    "transparency": (fields.Transparency.HIGH_BOUND, fields.Transparency.LOW_BOUND),
+    "rh2m": (11, 1),
+    "wind10m_speed": (fields.WindSpeed.HIGH_BOUND, fields.WindSpeed.LOW_BOUND),
+    "lifted_index": (1, 8),
+}
+
+# forecast step - timepoints further apart break observing window
+TIMEPOINT_STEP = pd.Timedelta(hours=3)
+
+
+def measure_quality(data: pd.DataFrame, measure: str) -> np.ndarray:
+    """
+    Quality of measure values, from 0 (worst) to 1 (best)
+    """
+    if measure == "prec_type":
+        return (data["prec_type"] == fields.Prec.NONE.value).to_numpy(np.float32)
+    worst, best = QUALITY_RANGES[measure]
+    values = data[measure].to_numpy(np.float32)
+    return np.clip((values - worst) / np.float32(best - worst), 0, 1)
+
+
+def astro_score(
+    data: pd.DataFrame, weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    Composite observing quality score of every row, from 0 (worst) to 1 (best):
+    weighted mean of measures quality, over measures present in data
+    """
+    weights = {
+        measure: weight
+        for measure, weight in (weights or DEFAULT_WEIGHTS).items()
+        if measure in data.columns
+    }
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("No weighted measures in data")
+    score = np.zeros(len(data), dtype=np.float32)
+    for measure, weight in weights.items():
+        score += np.float32(weight / total) * measure_quality(data, measure)
+    return score
+
+
+class ObservingWindows:
+    """
+    Ranking of contiguous observing windows - runs of consecutive timepoints of
+    single location, with no gap longer than max_gap. Scores are sorted by
+    (location, timepoint) and accumulated once; mean score of every window of
+    any length is then a difference of cumulative sums, computed for all windows
+    at once
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        scores: np.ndarray,
+        max_gap: pd.Timedelta = TIMEPOINT_STEP,
+    ):
+        codes, locations = pd.factorize(data["location"], sort=True)
+        self.locations = np.asarray(locations, dtype=object)
+        timepoints = pd.to_datetime(data["timepoint"]).to_numpy(dtype="datetime64[ns]")
+        order = np.lexsort((timepoints, codes))
+        self.codes = codes[order]
+        self.timepoints = timepoints[order]
+        self.cumulative = np.concatenate(
+            ([0], np.cumsum(np.asarray(scores, dtype=np.float64)[order]))
+        )
+        breaks = (np.diff(self.codes) != 0) | (
+            np.diff(self.timepoints) > max_gap.to_timedelta64()
+        )
+        self.segments = np.concatenate(([0], np.cumsum(breaks)))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def top(
+        self,
+        n: int = 10,
+        length: int = 3,
+        since: Any = None,
+        until: Any = None,
+        distinct_locations: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Returns n best windows of length timepoints, starting not before since and
+        ending not after until, sorted by mean score; only the best window of every
+        location is ranked, unless distinct_locations is False
+        """
+        if length < 1:
+            raise ValueError("Window length must be positive")
+        starts = np.arange(max(len(self) - length + 1, 0))
+        ends = starts + length - 1
+        valid = self.segments[starts] == self.segments[ends]
+        if since is not None:
+            valid &= self.timepoints[starts] >= to_datetime64(since)
+        if until is not None:
+            valid &= self.timepoints[ends] <= to_datetime64(until)
+        means = (self.cumulative[starts + length] - self.cumulative[starts]) / length
+        candidates = np.flatnonzero(valid)
+        if distinct_locations and len(candidates):
+            candidates = self._best_of_locations(np.where(valid, means, -np.inf))
+        if n < len(candidates):
+            candidates = candidates[np.argpartition(-means[candidates], n - 1)[:n]]
+        best = candidates[np.lexsort((candidates, -means[candidates]))]
+        return pd.DataFrame(
+            {
+                "location": self.locations[self.codes[best]],
+                "start": self.timepoints[best],
+                "end": self.timepoints[best + length - 1],
+                "score": means[best],
+            }
+        )
+
+    def _best_of_locations(self, means: np.ndarray) -> np.ndarray:
+        """
+        Returns first window of highest (finite) mean of every location;
+        windows are sorted by location, so maxima are reduced over location runs
+        """
+        codes = self.codes[: len(means)]
+        bounds = np.flatnonzero(np.diff(codes, prepend=-1))
+        best = np.maximum.reduceat(means, bounds)
+        hits = np.flatnonzero(
+            (means == np.repeat(best, np.diff(bounds, append=len(means))))
+            & np.isfinite(means)
+        )
+        return hits[np.diff(codes[hits], prepend=-1) != 0]
@@ -1,18 +1,96 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
+from .loader import to_compact_dtypes, to_datetime64
+from .downsampling import downsample
+from .scoring import ObservingWindows, astro_score
 
 
-@dataclass
+@dataclass(frozen=True)
+class TimepointIndex:
+    """
+    Sorted timepoints of single location along with their row positions in data,
+    looked up with binary search. Lookups return row position (for data.iloc)
+    or None, when there is no matching timepoint
+    """
+
+    timepoints: np.ndarray
+    rows: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.timepoints)
+
+    def floor(self, timepoint: Any) -> Optional[int]:
+        """
+        Row of latest timepoint not later than given one
+        """
+        position = (
+            np.searchsorted(self.timepoints, to_datetime64(timepoint), side="right") - 1
+        )
+        return int(self.rows[position]) if position >= 0 else None
+
+    def exact(self, timepoint: Any) -> Optional[int]:
+        """
+        Row of timepoint equal to given one
+        """
+        timepoint = to_datetime64(timepoint)
+        position = np.searchsorted(self.timepoints, timepoint, side="left")
+        if position < len(self) and self.timepoints[position] == timepoint:
+            return int(self.rows[position])
+        return None
+
+    def nearest(self, timepoint: Any) -> Optional[int]:
+        """
+        Row of timepoint closest to given one (earlier one on tie)
+        """
+        if not len(self):
+            return None
+        timepoint = to_datetime64(timepoint)
+        position = int(np.searchsorted(self.timepoints, timepoint, side="left"))
+        if position == len(self) or (
+            position > 0
+            and timepoint - self.timepoints[position - 1]
+            <= self.timepoints[position] - timepoint
+        ):
+            position -= 1
+        return int(self.rows[position])
+
+
+GRAPHED_MEASURES = frozenset(
+    {
+        "cloudcover",
+        "lifted_index",
+        "seeing",
+        "transparency",
+        "rh2m",
+        "wind10m_speed",
+        "temp2m",
+    }
+)
+SECONDARY_MEASURES = GRAPHED_MEASURES - {"temp2m"}
+DESCRIPTIVE_MEASURES = frozenset({"prec_type", "wind10m_direction"})
+
+
+@dataclass(frozen=True, eq=False)
 class DataSource:
     """
-    Container-class with adherent operations on data
+    Container-class with adherent operations on data.
+    Immutable snapshot - metadata (locations, measures) is computed once,
+    on first access, and kept in data columns (locations - sorted) order
     """
 
     data: pd.DataFrame
 
+    def compact(self) -> DataSource:
+        """
+        Returns DataSource with data kept in compact dtypes
+        """
+        return DataSource(to_compact_dtypes(self.data))
+
     def filter(self, location: str, measures: Optional[List[str]]) -> DataSource:
         """
         Returns filtered data, based  on input location and chosen measures
@@ -26,43 +104,72 @@ class DataSource:
         filtereddata.sort_values(by="timepoint", inplace=True)
         return DataSource(filtereddata)
 
-    @property
-    def locations_list(self) -> List[str]:
+    def window(
+        self,
+        location: str,
+        measures: Optional[List[str]],
+        start: Any = None,
+        end: Any = None,
+        max_points: Optional[int] = None,
+        method: str = "lttb",
+    ) -> DataSource:
         """
-        Returns list of locations across data
+        Returns filtered data of location within [start, end] time range (open when
+        None), downsampled ("lttb" or "minmax") to about max_points rows
         """
-        return sorted(self.data.location.unique())
+        data = self.filter(location, measures).build_data_table()
+        timepoints = data["timepoint"].to_numpy(dtype="datetime64[ns]")
+        first, last = 0, len(data)
+        if start is not None:
+            first = np.searchsorted(timepoints, to_datetime64(start), side="left")
+        if end is not None:
+            last = np.searchsorted(timepoints, to_datetime64(end), side="right")
+        data, timepoints = data.iloc[first:last], timepoints[first:last]
+        if max_points is not None and len(data) > max_points:
+            series = [
+                data[measure].to_numpy()
+                for measure in data.columns
+                if measure in GRAPHED_MEASURES
+            ]
+            data = data.iloc[downsample(timepoints, series, max_points, method)]
+        return DataSource(data)
 
-    @property
-    def measures_list(self) -> List[str]:
+    def timepoint_index(self, location: str) -> TimepointIndex:
+        """
+        Returns sorted timepoints index of location rows
+        """
+        rows = np.flatnonzero((self.data["location"] == location).to_numpy())
+        timepoints = pd.to_datetime(self.data["timepoint"].iloc[rows]).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        order = np.argsort(timepoints, kind="stable")
+        return TimepointIndex(timepoints[order], rows[order])
+
+    @cached_property
+    def locations_list(self) -> Tuple[str, ...]:
+        """
+        Returns sorted locations across data
         """
-        Returns list of measures in DataSource instance.
+        return tuple(sorted(self.data.location.unique()))
+
+    @cached_property
+    def measures_list(self) -> Tuple[str, ...]:
+        """
+        Returns measures in DataSource instance, in data columns order
         """
-        return [
+        return tuple(
             col
             for col in list(self.data.columns)
             if col not in ("location", "timepoint")
-        ]
-
-    @property
-    def graphed_measures_list(self) -> List[str]:
-        """
-        Returns list of measures that are used on graph
-        """
-        return list(
-            set(self.measures_list).intersection(
-                {
-                    "cloudcover",
-                    "lifted_index",
-                    "seeing",
-                    "transparency",
-                    "rh2m",
-                    "wind10m_speed",
-                    "temp2m",
-                }
-            )
         )
 
+    @cached_property
+    def graphed_measures_list(self) -> Tuple[str, ...]:
+        """
+        Returns measures that are used on graph
+        """
+        return self._measures_of(GRAPHED_MEASURES)
+
     @property
     def row_count(self) -> int:
         """
@@ -70,31 +177,57 @@ class DataSource:
         """
         return self.data.shape[0]
 
-    @property
-    def secondary_measures_list(self) -> List[str]:
+    @cached_property
+    def secondary_measures_list(self) -> Tuple[str, ...]:
         """
         Return secondary measures (scaled to 1-12, excluding temp and non-scalar measures)
         """
-        return list(
-            set(self.measures_list).intersection(
-                {
-                    "cloudcover",
-                    "lifted_index",
-                    "seeing",
-                    "transparency",
-                    "rh2m",
-                    "wind10m_speed",
-                }
-            )
+        return self._measures_of(SECONDARY_MEASURES)
+
+    @cached_property
+    def descriptive_measures_list(self) -> Tuple[str, ...]:
+        """
+        Return available descriptive measures in DataSource, eg. non-scalar
+        """
+        return self._measures_of(DESCRIPTIVE_MEASURES)
+
+    def _measures_of(self, group: FrozenSet[str]) -> Tuple[str, ...]:
+        return tuple(measure for measure in self.measures_list if measure in group)
+
+    @cached_property
+    def astro_score(self) -> pd.Series:
+        """
+        Returns composite observing quality score (0-1) of every data row
+        """
+        return pd.Series(
+            astro_score(self.data), index=self.data.index, name="astro_score"
         )
 
-    @property
-    def descriptive_measures_list(self) -> List[str]:
+    @cached_property
+    def observing_windows(self) -> ObservingWindows:
         """
-        Return list of available descriptive measures in DataSource, eg. non-scalar
+        Returns ranking of contiguous observing windows across all locations
         """
-        return list(
-            set(self.measures_list).intersection({"prec_type", "wind10m_direction"})
+        return ObservingWindows(self.data, self.astro_score.to_numpy())
+
+    def best_windows(
+        self,
+        n: int = 10,
+        length: int = 3,
+        since: Any = None,
+        until: Any = None,
+        distinct_locations: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Returns n best observing windows of length timepoints, as
+        location, start, end and mean score
+        """
+        return self.observing_windows.top(
+            n=n,
+            length=length,
+            since=since,
+            until=until,
+            distinct_locations=distinct_locations,
         )
 
     def build_data_table(self, sort_by: str = "timepoint") -> pd.DataFrame:
@@ -103,6 +236,75 @@ class DataSource:
         1. sort
         2. open for extension - split into separate functions if needed
         """
-        data = self.data
-        data["timepoint"] = pd.to_datetime(data["timepoint"])
+        data = self.data.assign(timepoint=pd.to_datetime(self.data["timepoint"]))
         return data.sort_values(by=[sort_by])
+
+
+class IndexedDataSource(DataSource):
+    """
+    DataSource sorted by (location, timepoint) once, at construction, keeping
+    offset range of every location - so that filter returns contiguous
+    zero-copy slices, without masking or sorting whole data.
+    Data (and slices sharing its memory) must not be modified
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        data = data.assign(timepoint=pd.to_datetime(data["timepoint"]))
+        super().__init__(
+            data.sort_values(
+                ["location", "timepoint"], kind="stable", ignore_index=True
+            )
+        )
+        codes, locations = pd.factorize(self.data["location"])
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        stops = np.append(starts[1:], len(codes))
+        offsets: Dict[str, Tuple[int, int]] = {
+            locations[code]: (int(start), int(stop))
+            for code, start, stop in zip(codes[starts], starts, stops)
+        }
+        object.__setattr__(self, "offsets", offsets)
+
+    @classmethod
+    def _from_sorted(
+        cls, data: pd.DataFrame, offsets: Dict[str, Tuple[int, int]]
+    ) -> IndexedDataSource:
+        source = cls.__new__(cls)
+        object.__setattr__(source, "data", data)
+        object.__setattr__(source, "offsets", offsets)
+        return source
+
+    def filter(self, location: str, measures: Optional[List[str]]) -> DataSource:
+        """
+        Returns data of location (view of its rows), with same columns as DataSource
+        """
+        if measures is None:
+            measures = self.graphed_measures_list
+        descs = [col for col in self.data.columns if col.endswith("_desc")]
+        static_cols = ["location", "timepoint", "wind10m_direction", "prec_type"]
+        start, stop = self.offsets.get(location, (0, 0))
+        filtereddata = pd.DataFrame(
+            {
+                column: self.data[column].iloc[start:stop]
+                for column in [*static_cols, *descs, *measures]
+            },
+            copy=False,
+        )
+        return IndexedDataSource._from_sorted(
+            filtereddata, {location: (0, stop - start)} if stop > start else {}
+        )
+
+    def timepoint_index(self, location: str) -> TimepointIndex:
+        """
+        Returns index over location rows - view of sorted timepoints, no search
+        """
+        start, stop = self.offsets.get(location, (0, 0))
+        timepoints = self.data["timepoint"].to_numpy(dtype="datetime64[ns]")
+        return TimepointIndex(timepoints[start:stop], range(start, stop))
+
+    def build_data_table(self, sort_by: str = "timepoint") -> pd.DataFrame:
+        """
+        Data is already sorted by timepoint within location
+        """
+        if sort_by == "timepoint" and len(self.offsets) <= 1:
+            return self.data
+        return self.data.sort_values(by=[sort_by], kind="stable")
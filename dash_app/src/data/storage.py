@@ -0,0 +1,162 @@
+"""Readers for stored forecast data - single .csv or partitioned parquet dataset"""
+import json
+from typing import Dict, List, Optional
+from urllib.parse import quote
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+LATEST_INDEX_NAME = "_latest.json"
+PARTITIONING = ds.partitioning(
+    pa.schema([("location", pa.string()), ("init", pa.string())]), flavor="hive"
+)
+
+# in-memory dtypes, same as produced by parsing .csv
+CANONICAL_DTYPES = {
+    "location": "object",
+    "cloudcover": "int64",
+    "seeing": "int64",
+    "transparency": "int64",
+    "lifted_index": "int64",
+    "rh2m": "int64",
+    "temp2m": "int64",
+    "prec_type": "object",
+    "wind10m_direction": "object",
+    "wind10m_speed": "int64",
+}
+
+
+def read_csv_data(path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Reads given columns from .csv file
+    """
+    data = pd.read_csv(path, usecols=lambda column: column in columns)
+    data["timepoint"] = pd.to_datetime(data["timepoint"])
+    return data
+
+
+def latest_partitions(
+    dataset: ds.Dataset, locations: Optional[List[str]] = None
+) -> Dict[str, List[str]]:
+    """
+    Returns files of most recent forecast init for every (or given) location.
+    Resolved from partition paths only - no data files are opened
+    """
+    latest = {}
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        location, init = keys["location"], keys["init"]
+        if locations is not None and location not in locations:
+            continue
+        current_init, paths = latest.get(location, ("", []))
+        if init > current_init:
+            latest[location] = (init, [fragment.path])
+        elif init == current_init:
+            paths.append(fragment.path)
+    return {location: paths for location, (_, paths) in latest.items()}
+
+
+def indexed_partitions(
+    filesystem: fsspec.AbstractFileSystem,
+    root: str,
+    locations: Optional[List[str]] = None,
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Returns files of most recent forecast init for every (or given) location,
+    resolved from latest-init index of forecast history dataset.
+    None if dataset has no such index
+    """
+    path = f"{root}/{LATEST_INDEX_NAME}"
+    if not filesystem.exists(path):
+        return None
+    with filesystem.open(path, "r") as handle:
+        latest = json.load(handle)
+    return {
+        location: [
+            f"{root}/location={quote(location, safe='')}"
+            f"/init={quote(init, safe='')}/part-0.parquet"
+        ]
+        for location, init in latest.items()
+        if locations is None or location in locations
+    }
+
+
+def read_parquet_data(
+    path: str, columns: List[str], locations: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads given columns of latest forecast per location from partitioned dataset
+    (either plain or forecast history one)
+    """
+    filesystem, root = fsspec.core.url_to_fs(path)
+    if not filesystem.isdir(root):
+        raise FileNotFoundError(path)
+    partitions = indexed_partitions(filesystem, root, locations=locations)
+    if partitions is None:
+        dataset = ds.dataset(
+            root, format="parquet", partitioning=PARTITIONING, filesystem=filesystem
+        )
+        partitions = latest_partitions(dataset, locations=locations)
+    file_columns = [column for column in columns if column != "location"]
+    tables = []
+    for location, files in partitions.items():
+        for file in files:
+            with filesystem.open(file, "rb") as handle:
+                table = pq.ParquetFile(handle).read(
+                    columns=file_columns, use_threads=False
+                )
+            if "location" in columns:
+                table = table.append_column(
+                    "location", pa.array([location] * table.num_rows, pa.string())
+                )
+            tables.append(table.select(columns))
+    if not tables:
+        raise FileNotFoundError(path)
+    data = pa.concat_tables(tables, promote_options="permissive").to_pandas()
+    data = data.astype(
+        {column: dtype for column, dtype in CANONICAL_DTYPES.items() if column in data}
+    )
+    data["timepoint"] = data["timepoint"].astype("datetime64[ns]")
+    return data
+
+
+# metadata fields identifying stored object version - gcs generation, local mtime...
+VERSION_FIELDS = ("generation", "mtime", "updated", "LastModified", "ETag", "created")
+
+
+def _object_version(info: dict) -> tuple:
+    version = next((info[key] for key in VERSION_FIELDS if info.get(key)), None)
+    return (info["name"], str(version), info.get("size"))
+
+
+def data_version(path: str) -> Optional[tuple]:
+    """
+    Returns cheap to get token of stored data version - from object metadata only.
+    For .csv file and forecast history dataset single object is checked
+    (file or latest-init index), for plain parquet dataset - listing of its files.
+    None if there is no data under path
+    """
+    filesystem, root = fsspec.core.url_to_fs(path)
+    filesystem.invalidate_cache(root)
+    try:
+        if path.endswith(".csv"):
+            return _object_version(filesystem.info(root))
+        if filesystem.exists(f"{root}/{LATEST_INDEX_NAME}"):
+            return _object_version(filesystem.info(f"{root}/{LATEST_INDEX_NAME}"))
+        files = filesystem.find(root, detail=True)
+    except FileNotFoundError:
+        return None
+    return tuple(sorted(_object_version(info) for info in files.values())) or None
+
+
+def read_astrometeo_data(
+    path: str, columns: List[str], locations: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads data from .csv file or, for other paths, from partitioned parquet dataset
+    """
+    if path.endswith(".csv"):
+        return read_csv_data(path, columns=columns)
+    return read_parquet_data(path, columns=columns, locations=locations)
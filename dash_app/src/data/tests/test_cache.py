@@ -0,0 +1,124 @@
+"""Tests for version-aware loaded data cache"""
+import os
+import pytest
+import pandas as pd
+from .weather_data_generator import FakeWeatherDataGenerator
+from ..cache import CacheStats, DataCache, FigureCache
+from ..loader import DataSchema, load_astrometeo_data
+from ..registry import Snapshot, SnapshotRegistry
+
+
+def _write_csv(path: str, location_no: int) -> None:
+    data = FakeWeatherDataGenerator(location_no=location_no, timepoint_no=6)
+    df = pd.DataFrame(data.produce_data(), columns=DataSchema.__fields__)
+    df.to_csv(path, index=False)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    path, failsafe_path = str(tmp_path / "data.csv"), str(tmp_path / "failsafe.csv")
+    _write_csv(path, location_no=3)
+    _write_csv(failsafe_path, location_no=2)
+    return path, failsafe_path
+
+
+def _counting_loader(calls: list):
+    def _loader(**kwargs):
+        calls.append(kwargs)
+        return load_astrometeo_data(**kwargs)
+
+    return _loader
+
+
+def test_unchanged_data_is_loaded_once(paths):
+    path, failsafe_path = paths
+    calls = []
+    cache = DataCache(_counting_loader(calls))
+    first = cache.load(path=path, failsafe_path=failsafe_path)
+    second = cache.load(path=path, failsafe_path=failsafe_path)
+    assert second is first
+    assert len(calls) == 1
+    assert cache.stats == CacheStats(hits=1, misses=1, revalidations=1)
+
+
+def test_changed_data_is_loaded_again(paths):
+    path, failsafe_path = paths
+    cache = DataCache(load_astrometeo_data)
+    first = cache.load(path=path, failsafe_path=failsafe_path)
+    _write_csv(path, location_no=4)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = cache.load(path=path, failsafe_path=failsafe_path)
+    assert first.location.nunique() == 3
+    assert second.location.nunique() == 4
+    assert cache.stats == CacheStats(hits=0, misses=2, revalidations=1)
+
+
+def test_cache_follows_failsafe_data(paths):
+    path, failsafe_path = paths
+    cache = DataCache(load_astrometeo_data)
+    os.remove(path)
+    data = cache.load(path=path, failsafe_path=failsafe_path)
+    assert cache.load(path=path, failsafe_path=failsafe_path) is data
+    assert data.location.nunique() == 2
+    _write_csv(path, location_no=3)
+    assert cache.load(path=path, failsafe_path=failsafe_path).location.nunique() == 3
+    assert cache.stats == CacheStats(hits=1, misses=2, revalidations=2)
+    compact = cache.load(path=path, failsafe_path=failsafe_path, compact=True)
+    assert compact.location.dtype == "category"
+    assert cache.stats.misses == 3
+
+
+def _rendering(calls: list, nbytes: int = 100):
+    def _render(key):
+        def _figure():
+            calls.append(key)
+            return {"key": key, "nbytes": nbytes}
+
+        return _figure
+
+    return _render
+
+
+def test_figures_are_rendered_once_per_key():
+    calls = []
+    render = _rendering(calls)
+    cache = FigureCache(max_entries=2, size=lambda figure: figure["nbytes"])
+    first = cache.get(("v1", "Paris", ("seeing",)), render("a"))
+    assert cache.get(("v1", "Paris", ("seeing",)), render("a")) is first
+    cache.get(("v1", "Oslo", ("seeing",)), render("b"))
+    cache.get(("v1", "Paris", ("seeing",)), render("a"))
+    # least recently used (Oslo) is evicted
+    cache.get(("v1", "Rome", ("seeing",)), render("c"))
+    cache.get(("v1", "Oslo", ("seeing",)), render("b"))
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.stats.hits == 2 and cache.stats.misses == 4
+    assert cache.stats.evictions == 2 and cache.stats.entries == 2
+    assert cache.stats.hit_ratio == pytest.approx(1 / 3)
+    assert cache.stats.as_dict()["mean_render_seconds"] >= 0
+
+
+def test_figures_cache_is_memory_bounded():
+    calls = []
+    cache = FigureCache(max_bytes=250, size=lambda figure: figure["nbytes"])
+    for key in ("a", "b", "c"):
+        cache.get(("v1", key), _rendering(calls)(key))
+    assert cache.stats.nbytes == 200 and cache.stats.entries == 2
+    cache.get(("v1", "huge"), _rendering(calls, nbytes=1000)("huge"))
+    assert cache.stats.nbytes == 200
+    cache.get(("v1", "huge"), _rendering(calls, nbytes=1000)("huge"))
+    assert calls.count("huge") == 2
+
+
+def test_figures_of_replaced_snapshots_are_invalidated():
+    registry = SnapshotRegistry()
+    cache = FigureCache()
+    registry.publish_hooks.append(cache.on_publish)
+    old = Snapshot(data_source=None, origin="primary")
+    registry.publish(old)
+    calls = []
+    cache.get((old.version, "Paris"), _rendering(calls)("old"))
+    registry.publish(Snapshot(data_source=None, origin="primary"))
+    cache.get((old.version, "Paris"), _rendering(calls)("old"))
+    assert calls == ["old", "old"]
+    assert cache.stats.invalidations == 1
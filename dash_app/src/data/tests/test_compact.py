@@ -0,0 +1,52 @@
+"""Tests for compact in-memory representation of loaded data"""
+import pytest
+import pandas as pd
+from .weather_data_generator import FakeWeatherDataGenerator
+from ..loader import DataSchema, load_astrometeo_data
+from ..source import DataSource
+
+LOCATION_NO = 50
+TIMEPOINT_NO = 40
+
+
+@pytest.fixture
+def csv_path(tmp_path) -> str:
+    data = FakeWeatherDataGenerator(
+        location_no=LOCATION_NO, timepoint_no=TIMEPOINT_NO
+    ).produce_data()
+    path = str(tmp_path / "data.csv")
+    pd.DataFrame(data, columns=DataSchema.__fields__).to_csv(path, index=False)
+    return path
+
+
+def test_compact_data_uses_fraction_of_memory(csv_path):
+    data = load_astrometeo_data(path=csv_path, failsafe_path=csv_path)
+    compact = load_astrometeo_data(path=csv_path, failsafe_path=csv_path, compact=True)
+    full_size = data.memory_usage(deep=True).sum()
+    compact_size = compact.memory_usage(deep=True).sum()
+    assert full_size / compact_size >= 5
+    pd.testing.assert_frame_equal(
+        compact, data, check_dtype=False, check_categorical=False
+    )
+
+
+def test_compact_data_source_serves_same_data(csv_path):
+    data_source = DataSource(
+        load_astrometeo_data(path=csv_path, failsafe_path=csv_path)
+    )
+    compact = data_source.compact()
+    location = data_source.locations_list[3]
+    assert compact.locations_list == data_source.locations_list
+    assert sorted(compact.measures_list) == sorted(data_source.measures_list)
+    table = data_source.filter(location=location, measures=None).build_data_table()
+    compact_table = compact.filter(location=location, measures=None).build_data_table()
+    pd.testing.assert_frame_equal(
+        compact_table, table, check_dtype=False, check_categorical=False
+    )
+    # callbacks receive data through store, as dict of python values
+    stored = DataSource(pd.DataFrame.from_dict(data_source.data.to_dict()))
+    compact_stored = DataSource(pd.DataFrame.from_dict(compact.data.to_dict()))
+    pd.testing.assert_frame_equal(
+        compact_stored.filter(location=location, measures=None).build_data_table(),
+        stored.filter(location=location, measures=None).build_data_table(),
+    )
@@ -0,0 +1,43 @@
+"""Tests for time series downsampling"""
+import numpy as np
+import pandas as pd
+import pytest
+from ..downsampling import downsample, lttb, min_max
+
+
+@pytest.fixture
+def series() -> tuple:
+    rng = np.random.default_rng(3)
+    x = pd.date_range("2023-04-10", periods=10_000, freq="10min").to_numpy()
+    y = np.sin(np.linspace(0, 20, len(x))) + rng.normal(0, 0.1, len(x))
+    y[4321] = 10  # spike to be kept
+    return x, y
+
+
+def test_lttb_keeps_shape(series):
+    x, y = series
+    positions = lttb(x, y, 500)
+    assert len(positions) == 500
+    assert positions[0] == 0 and positions[-1] == len(x) - 1
+    assert (np.diff(positions) > 0).all()
+    assert 4321 in positions
+    assert (lttb(x[:100], y[:100], 500) == np.arange(100)).all()
+
+
+def test_min_max_keeps_extremes(series):
+    x, y = series
+    positions = min_max(x, y, 500)
+    assert len(positions) <= 502
+    assert positions[0] == 0 and positions[-1] == len(x) - 1
+    assert np.argmax(y) in positions and np.argmin(y) in positions
+    np.testing.assert_allclose(y[positions].max(), y.max())
+
+
+def test_downsample_union_of_series(series):
+    x, y = series
+    positions = downsample(x, [y, -y], 300, method="minmax")
+    assert set(min_max(x, y, 150)) <= set(positions)
+    assert set(min_max(x, -y, 150)) <= set(positions)
+    assert len(positions) <= 304
+    with pytest.raises(ValueError):
+        downsample(x, [y], 300, method="every-nth")
@@ -7,6 +7,7 @@ from ..loader import (
     validate_data_schema,
     validate_unique_columns_combinations,
     rescale_data,
+    add_descriptions,
 )
 from .weather_data_generator import FakeWeatherDataGenerator
 from .. import mapping as mp
@@ -123,3 +124,27 @@ def test_df_rescale_successful(valid_test_dataframe):
     assert set(df["lifted_index"].unique()).issubset(
         set((mp.LIFTED_INDEX_SCALED_TABLE.values()))
     )
+
+
+def test_df_rescale_equals_dict_replace(valid_test_dataframe):
+    expected = valid_test_dataframe.replace(
+        {"rh2m": mp.RH2M_SCALED_TABLE, "lifted_index": mp.LIFTED_INDEX_SCALED_TABLE}
+    )
+    df = rescale_df(valid_test_dataframe.copy())
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_descriptions_equal_dict_mapping(valid_test_dataframe):
+    columns = list(mp.descriptions)
+    df = rescale_df(valid_test_dataframe.copy())
+    described = add_descriptions(columns)(lambda: df.copy())()
+    described_again = add_descriptions(columns)(lambda: df.copy())()
+    for column in columns:
+        desc = described[f"{column}_desc"]
+        assert desc.dtype == "category"
+        assert desc.dtype == described_again[f"{column}_desc"].dtype
+        pd.testing.assert_series_equal(
+            desc.astype(object),
+            df[column].map(mp.descriptions[column]),
+            check_names=False,
+        )
@@ -0,0 +1,124 @@
+"""Tests for instrumented loader pipeline"""
+from typing import List
+import pytest
+import pandas as pd
+from pydantic import BaseModel
+from .weather_data_generator import FakeWeatherDataGenerator
+from .. import mapping as mp
+from ..loader import (
+    LOADER_PIPELINE,
+    DataSchema,
+    add_descriptions,
+    load_astrometeo_data,
+    rescale_data,
+    validate_data_schema,
+    validate_unique_columns_combinations,
+)
+from ..pipeline import Stage
+
+LOCATION_NO = 6
+TIMEPOINT_NO = 12
+
+
+@pytest.fixture
+def csv_path(tmp_path) -> str:
+    data = FakeWeatherDataGenerator(
+        location_no=LOCATION_NO, timepoint_no=TIMEPOINT_NO
+    ).produce_data()
+    path = str(tmp_path / "data.csv")
+    pd.DataFrame(data, columns=DataSchema.__fields__).to_csv(path, index=False)
+    return path
+
+
+DESCRIBED_COLUMNS = [
+    "cloudcover",
+    "lifted_index",
+    "seeing",
+    "transparency",
+    "rh2m",
+    "wind10m_speed",
+]
+RESCALED_COLUMNS = [
+    ("rh2m", mp.RH2M_SCALED_TABLE),
+    ("lifted_index", mp.LIFTED_INDEX_SCALED_TABLE),
+]
+
+
+def load_before_refactor(path: str) -> pd.DataFrame:
+    """
+    loading as done before pipeline was introduced - per row validation,
+    replace based rescaling, map based descriptions
+    """
+
+    class Validator(BaseModel):
+        schema_dict: List[DataSchema]
+
+    df = pd.read_csv(path)
+    df["timepoint"] = pd.to_datetime(df["timepoint"])
+    _ = Validator(schema_dict=df.to_dict(orient="records"))
+    for column, table in RESCALED_COLUMNS:
+        df.replace({column: table}, inplace=True)
+    if any(df.duplicated(subset=["timepoint", "location"])):
+        raise ValueError("Your data has to be unique across columns")
+    for column in DESCRIBED_COLUMNS:
+        df[f"{column}_desc"] = df[column].map(mp.descriptions.get(column))
+    return df
+
+
+@add_descriptions(DESCRIBED_COLUMNS)
+@validate_unique_columns_combinations(["timepoint", "location"])
+@rescale_data(RESCALED_COLUMNS)
+@validate_data_schema(DataSchema)
+def load_with_decorators(path: str) -> pd.DataFrame:
+    """
+    loading as composed from separate decorators
+    """
+    df = pd.read_csv(path)
+    df["timepoint"] = pd.to_datetime(df["timepoint"])
+    return df
+
+
+def _assert_equals_before_refactor(df: pd.DataFrame, path: str) -> None:
+    # descriptions are categorical now, values have to be the same
+    descriptions = {f"{column}_desc": object for column in DESCRIBED_COLUMNS}
+    pd.testing.assert_frame_equal(df.astype(descriptions), load_before_refactor(path))
+
+
+def test_pipeline_equals_loading_before_refactor(csv_path):
+    _assert_equals_before_refactor(
+        load_astrometeo_data(path=csv_path, failsafe_path=csv_path), csv_path
+    )
+
+
+def test_stacked_decorators_equal_loading_before_refactor(csv_path):
+    _assert_equals_before_refactor(load_with_decorators(csv_path), csv_path)
+
+
+def test_pipeline_reports_stage_stats(csv_path):
+    reported = []
+    LOADER_PIPELINE.stats_hooks.append(reported.append)
+    try:
+        load_astrometeo_data(path=csv_path, failsafe_path=csv_path, compact=True)
+    finally:
+        LOADER_PIPELINE.stats_hooks.remove(reported.append)
+    (stats,) = reported
+    assert not hasattr(LOADER_PIPELINE, "last_stats")
+    assert [stage.stage for stage in stats] == [
+        "load_astrometeo_data",
+        "validate_schema",
+        "check_unique",
+        "rescale",
+        "describe",
+        "compact",
+    ]
+    assert {stage.rows for stage in stats} == {LOCATION_NO * TIMEPOINT_NO}
+    assert all(stage.seconds >= 0 for stage in stats)
+    assert stats[3].columns == ("rh2m", "lifted_index")
+
+
+def test_stage_without_apply_cannot_be_constructed():
+    class Incomplete(Stage):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete(["temp2m"])
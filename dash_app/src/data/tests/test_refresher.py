@@ -0,0 +1,119 @@
+"""Tests for background data refresher"""
+import time
+import weakref
+import pytest
+import pandas as pd
+from .weather_data_generator import FakeWeatherDataGenerator
+from ..loader import DataSchema
+from ..refresher import DataRefresher
+from ..registry import SnapshotRegistry
+
+
+def _frame(location_no: int) -> pd.DataFrame:
+    data = FakeWeatherDataGenerator(location_no=location_no, timepoint_no=4)
+    return pd.DataFrame(data.produce_data(), columns=DataSchema.__fields__)
+
+
+class FlakyStorage:
+    """
+    Loader returning queued frames, raising queued exceptions
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def load(self) -> pd.DataFrame:
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _serves(snapshot, frame: pd.DataFrame) -> bool:
+    return snapshot.data_source.locations_list == tuple(
+        sorted(frame["location"].unique())
+    )
+
+
+@pytest.fixture
+def failsafe() -> pd.DataFrame:
+    return _frame(location_no=1)
+
+
+def test_snapshot_is_swapped_only_for_new_data(failsafe):
+    first, second = _frame(2), _frame(3)
+    storage = FlakyStorage(first, first, second)
+    refresher = DataRefresher(storage.load, lambda: failsafe, interval=60)
+    snapshot = refresher.current
+    assert _serves(snapshot, first)
+    assert snapshot.store == {"version": snapshot.version}
+    assert refresher.refresh() is snapshot
+    assert _serves(refresher.refresh(), second)
+    assert refresher.current.origin == "primary"
+    assert refresher.current.version != snapshot.version
+
+
+def test_last_good_snapshot_is_kept_on_error(failsafe):
+    good = _frame(2)
+    storage = FlakyStorage(good, ValueError("corrupted data"))
+    refresher = DataRefresher(storage.load, lambda: failsafe, interval=60)
+    snapshot = refresher.current
+    assert refresher.refresh() is snapshot
+    assert refresher.errors == 1
+
+
+def test_failsafe_is_loaded_without_good_snapshot(failsafe):
+    storage = FlakyStorage(OSError("storage unavailable"))
+    refresher = DataRefresher(storage.load, lambda: failsafe, interval=60)
+    assert refresher.current.origin == "failsafe"
+    assert _serves(refresher.current, failsafe)
+
+
+def test_snapshots_are_refreshed_in_background(failsafe):
+    first, second = _frame(2), _frame(3)
+    storage = FlakyStorage(first, second)
+    refresher = DataRefresher(storage.load, lambda: failsafe, interval=0.01).start()
+    try:
+        assert _serves(refresher.current, first)
+        deadline = time.monotonic() + 5
+        while not _serves(refresher.current, second):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        refresher.stop()
+    refreshes = refresher.refreshes
+    time.sleep(0.05)
+    assert refresher.refreshes == refreshes
+
+
+def test_registry_resolves_store_versions(failsafe):
+    registry = SnapshotRegistry(keep=2)
+    frames = [_frame(n) for n in (2, 3, 4)]
+    storage = FlakyStorage(*frames)
+    refresher = DataRefresher(storage.load, lambda: failsafe, 60, registry=registry)
+    snapshots = [refresher.current, refresher.refresh(), refresher.refresh()]
+    assert registry.latest is snapshots[2]
+    assert registry.resolve(snapshots[1].store) is snapshots[1]
+    # expired, unknown and missing versions resolve to latest snapshot
+    for store in (snapshots[0].store, {"version": "other-worker"}, None):
+        assert registry.resolve(store) is snapshots[2]
+
+
+def test_publish_hooks_are_called_once_per_snapshot(failsafe):
+    registry = SnapshotRegistry()
+    published = []
+    registry.publish_hooks.append(published.append)
+    storage = FlakyStorage(_frame(2), _frame(3))
+    refresher = DataRefresher(storage.load, lambda: failsafe, 60, registry=registry)
+    snapshots = [refresher.current, refresher.refresh()]
+    assert published == snapshots
+
+
+def test_loaded_frame_is_not_retained(failsafe):
+    storage = FlakyStorage(_frame(2))
+    refresher = DataRefresher(storage.load, lambda: failsafe, interval=60)
+    snapshot = refresher.current
+    loaded = weakref.ref(storage.results.pop())
+    # only data source sorted copy is kept by snapshot and refresher
+    assert loaded() is None
+    assert len(snapshot.data_source.locations_list) == 2
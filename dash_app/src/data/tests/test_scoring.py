@@ -0,0 +1,107 @@
+"""Tests for observing quality scoring and windows ranking"""
+import numpy as np
+import pandas as pd
+import pytest
+from ..scoring import ObservingWindows, astro_score
+from ..source import DataSource, IndexedDataSource
+
+TIMEPOINTS = pd.date_range("2023-04-10 18:00", periods=8, freq="3h")
+
+
+def _conditions(value: str, rows: int) -> dict:
+    best = value == "best"
+    return {
+        "cloudcover": [1 if best else 9] * rows,
+        "seeing": [1 if best else 8] * rows,
+        "transparency": [1 if best else 8] * rows,
+        "lifted_index": [8 if best else 1] * rows,
+        "rh2m": [1.0 if best else 11.0] * rows,
+        "wind10m_speed": [1 if best else 8] * rows,
+        "prec_type": ["none" if best else "rain"] * rows,
+    }
+
+
+@pytest.fixture
+def scored_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    rows = 3 * len(TIMEPOINTS)
+    df = pd.DataFrame(
+        {
+            "location": np.repeat(["Alpha", "Beta", "Gamma"], len(TIMEPOINTS)),
+            "timepoint": np.tile(TIMEPOINTS, 3),
+            "cloudcover": rng.integers(1, 10, rows),
+            "seeing": rng.integers(1, 9, rows),
+            "transparency": rng.integers(1, 9, rows),
+            "lifted_index": rng.integers(1, 9, rows),
+            "rh2m": rng.integers(2, 23, rows) / 2,
+            "wind10m_speed": rng.integers(1, 9, rows),
+            "prec_type": rng.choice(["none", "rain", "snow"], rows),
+        }
+    )
+    # gap in Gamma forecast breaks its windows
+    return df.drop(index=[2 * len(TIMEPOINTS) + 4]).sample(frac=1, random_state=7)
+
+
+def test_astro_score_bounds():
+    best = pd.DataFrame(_conditions("best", 2))
+    worst = pd.DataFrame(_conditions("worst", 2))
+    np.testing.assert_allclose(astro_score(best), 1, rtol=1e-6)
+    np.testing.assert_allclose(astro_score(worst), 0, atol=1e-6)
+    # weights are renormalized over measures present in data
+    np.testing.assert_allclose(astro_score(best[["seeing"]]), 1, rtol=1e-6)
+    assert astro_score(best, weights={"prec_type": 1}).tolist() == [1, 1]
+    with pytest.raises(ValueError):
+        astro_score(best[["seeing"]], weights={"cloudcover": 1})
+
+
+def _brute_force_windows(df: pd.DataFrame, length: int) -> list:
+    windows = []
+    for location, group in df.groupby("location"):
+        group = group.sort_values("timepoint")
+        times = list(group["timepoint"])
+        scores = list(astro_score(group))
+        for start in range(len(times) - length + 1):
+            steps = np.diff(times[start : start + length])
+            if all(step <= pd.Timedelta(hours=3) for step in steps):
+                mean = sum(scores[start : start + length]) / length
+                windows.append((location, times[start], mean))
+    return windows
+
+
+def test_windows_rank_matches_brute_force(scored_frame):
+    windows = ObservingWindows(scored_frame, astro_score(scored_frame))
+    expected = _brute_force_windows(scored_frame, length=3)
+    top = windows.top(n=100, length=3, distinct_locations=False)
+    assert len(top) == len(expected)
+    assert top["score"].is_monotonic_decreasing
+    np.testing.assert_allclose(
+        top["score"], sorted((score for *_, score in expected), reverse=True)
+    )
+    # no window spans over Gamma forecast gap
+    gamma = top[top["location"] == "Gamma"]
+    assert not (
+        (gamma["start"] <= TIMEPOINTS[3]) & (gamma["end"] >= TIMEPOINTS[5])
+    ).any()
+
+    best = windows.top(n=2, length=3)
+    assert len(best) == 2 and best["location"].is_unique
+    assert best["score"].iloc[0] == pytest.approx(max(s for *_, s in expected))
+
+
+def test_windows_time_bounds(scored_frame):
+    windows = ObservingWindows(scored_frame, astro_score(scored_frame))
+    top = windows.top(n=10, length=2, since=TIMEPOINTS[2], until=TIMEPOINTS[5])
+    assert (top["start"] >= TIMEPOINTS[2]).all()
+    assert (top["end"] <= TIMEPOINTS[5]).all()
+    assert (top["end"] - top["start"] == pd.Timedelta(hours=3)).all()
+    assert windows.top(length=len(TIMEPOINTS) + 1).empty
+
+
+def test_DataSource_scores_are_precomputed_once(scored_frame):
+    indexed = IndexedDataSource(scored_frame)
+    assert indexed.observing_windows is indexed.observing_windows
+    pd.testing.assert_frame_equal(
+        indexed.best_windows(n=3, length=4),
+        DataSource(scored_frame).best_windows(n=3, length=4),
+    )
+    assert indexed.astro_score.between(0, 1).all()
@@ -1,8 +1,10 @@
+import dataclasses
 import pytest
 import pandas as pd
+import numpy as np
 from .weather_data_generator import FakeWeatherDataGenerator
 from ..loader import DataSchema
-from ..source import DataSource
+from ..source import DataSource, IndexedDataSource
 import random
 
 LOCATION_NO = 5
@@ -49,6 +51,21 @@ def test_DataSource_secondary_measures_list(valid_test_DataSource):
     )
 
 
+def test_DataSource_metadata_is_cached_in_columns_order(valid_test_DataSource):
+    data_source = valid_test_DataSource
+    assert data_source.graphed_measures_list is data_source.graphed_measures_list
+    assert data_source.locations_list == tuple(sorted(data_source.locations_list))
+    reordered = DataSource(data_source.data[data_source.data.columns[::-1]])
+    for name in ("graphed_measures_list", "secondary_measures_list"):
+        measures = getattr(data_source, name)
+        assert list(measures) == [
+            col for col in data_source.data.columns if col in measures
+        ]
+        assert getattr(reordered, name) == measures[::-1]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        data_source.data = data_source.data.head()
+
+
 def test_DataSource_filter(valid_test_DataSource):
     measures = ["temp2m", "transparency", "lifted_index", "wind10m_speed"]
     random_location = random.choice(valid_test_DataSource.locations_list)
@@ -68,3 +85,79 @@ def test_DataSource_prepare_data_table(valid_test_DataSource):
     assert valid_test_DataSource.build_data_table(sort_by="timepoint")[
         "timepoint"
     ].is_monotonic_increasing
+    # data of immutable DataSource is not converted in place
+    stored = DataSource(valid_test_DataSource.data.astype({"timepoint": str}))
+    assert stored.build_data_table()["timepoint"].is_monotonic_increasing
+    assert stored.data["timepoint"].dtype == object
+
+
+def test_IndexedDataSource_filter_equals_DataSource(valid_test_DataSource):
+    indexed = IndexedDataSource(valid_test_DataSource.data)
+    assert indexed.locations_list == valid_test_DataSource.locations_list
+    for location in valid_test_DataSource.locations_list:
+        for measures in (None, ["temp2m", "rh2m"]):
+            expected = valid_test_DataSource.filter(location, measures=measures)
+            filtered = indexed.filter(location, measures=measures)
+            assert filtered.row_count == TIMEPOINT_NO
+            assert sorted(filtered.secondary_measures_list) == sorted(
+                expected.secondary_measures_list
+            )
+            pd.testing.assert_frame_equal(
+                filtered.build_data_table().reset_index(drop=True),
+                expected.build_data_table().reset_index(drop=True),
+            )
+
+
+def test_IndexedDataSource_filter_returns_views(valid_test_DataSource):
+    indexed = IndexedDataSource(valid_test_DataSource.data)
+    location = indexed.locations_list[2]
+    filtered = indexed.filter(location, measures=["temp2m"]).build_data_table()
+    assert np.shares_memory(
+        filtered["temp2m"].to_numpy(), indexed.data["temp2m"].to_numpy()
+    )
+    assert (filtered["location"] == location).all()
+    assert indexed.filter("Atlantis", measures=None).row_count == 0
+
+
+def test_timepoint_index_lookups(valid_test_DataSource):
+    location = valid_test_DataSource.locations_list[1]
+    expected = valid_test_DataSource.filter(location, measures=None).build_data_table()
+    timepoints = list(expected["timepoint"])
+    indexed = IndexedDataSource(valid_test_DataSource.data)
+    for source in (valid_test_DataSource, indexed):
+        index = source.timepoint_index(location)
+        assert len(index) == TIMEPOINT_NO
+
+        def timepoint_at(row):
+            return pd.Timestamp(source.data["timepoint"].iloc[row])
+
+        between = timepoints[3] + (timepoints[4] - timepoints[3]) / 3
+        assert timepoint_at(index.exact(timepoints[3])) == timepoints[3]
+        assert timepoint_at(index.exact(str(timepoints[3]))) == timepoints[3]
+        assert index.exact(between) is None
+        assert timepoint_at(index.floor(between)) == timepoints[3]
+        assert timepoint_at(index.floor(timepoints[4])) == timepoints[4]
+        assert index.floor(timepoints[0] - pd.Timedelta("1s")) is None
+        assert timepoint_at(index.nearest(between)) == timepoints[3]
+        assert timepoint_at(index.nearest(timepoints[-1] + pd.Timedelta("1d"))) == (
+            timepoints[-1]
+        )
+        assert source.data["location"].iloc[index.nearest(between)] == location
+    assert indexed.timepoint_index("Atlantis").nearest(timepoints[0]) is None
+
+
+def test_DataSource_window(valid_test_DataSource):
+    location = valid_test_DataSource.locations_list[0]
+    table = valid_test_DataSource.filter(location, measures=None).build_data_table()
+    start, end = table["timepoint"].iloc[2], table["timepoint"].iloc[7]
+    for source in (
+        valid_test_DataSource,
+        IndexedDataSource(valid_test_DataSource.data),
+    ):
+        window = source.window(location, ["temp2m", "seeing"], start, str(end))
+        assert list(window.data["timepoint"]) == list(table["timepoint"].iloc[2:8])
+        assert window.secondary_measures_list == ("seeing",)
+        downsampled = source.window(location, ["temp2m"], max_points=4, method="minmax")
+        assert 4 <= downsampled.row_count < TIMEPOINT_NO
+        assert downsampled.data["timepoint"].is_monotonic_increasing
+        assert source.window(location, None, start=end, end=start).row_count == 0
@@ -0,0 +1,86 @@
+"""Tests for stored data readers"""
+import json
+import pytest
+import pandas as pd
+from .weather_data_generator import FakeWeatherDataGenerator
+from ..loader import DataSchema, load_astrometeo_data
+from ..storage import read_astrometeo_data
+
+LOCATION_NO = 4
+TIMEPOINT_NO = 8
+
+
+def _write_dataset(df: pd.DataFrame, path: str, init: str) -> None:
+    df = df.assign(init=init).astype({"cloudcover": "int8", "prec_type": "category"})
+    df.to_parquet(
+        path,
+        index=False,
+        partition_cols=["location", "init"],
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+
+@pytest.fixture
+def stored_data(tmp_path):
+    """
+    Same latest data stored as .csv and as parquet dataset (with one older init)
+    """
+    generator = FakeWeatherDataGenerator(
+        location_no=LOCATION_NO, timepoint_no=TIMEPOINT_NO
+    )
+    latest = pd.DataFrame(generator.produce_data(), columns=DataSchema.__fields__)
+    older = pd.DataFrame(generator.produce_data(), columns=DataSchema.__fields__)
+    csv_path = str(tmp_path / "data.csv")
+    parquet_path = str(tmp_path / "dataset")
+    latest.to_csv(csv_path, index=False)
+    _write_dataset(older, parquet_path, init="2023041000")
+    _write_dataset(latest, parquet_path, init="2023041012")
+    return latest, csv_path, parquet_path
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["location", "timepoint"]).reset_index(drop=True)
+
+
+def test_parquet_read_equals_csv_read(stored_data):
+    _, csv_path, parquet_path = stored_data
+    columns = DataSchema.get_fields_names()
+    from_csv = read_astrometeo_data(csv_path, columns=columns)
+    from_parquet = read_astrometeo_data(parquet_path, columns=columns)
+    pd.testing.assert_frame_equal(
+        _sorted(from_parquet)[columns], _sorted(from_csv)[columns]
+    )
+
+
+def test_parquet_read_prunes_locations_and_columns(stored_data):
+    latest, _, parquet_path = stored_data
+    location = latest["location"].iloc[0]
+    data = read_astrometeo_data(
+        parquet_path, columns=["location", "timepoint", "seeing"], locations=[location]
+    )
+    assert list(data.columns) == ["location", "timepoint", "seeing"]
+    assert list(data["location"].unique()) == [location]
+    assert data.shape[0] == TIMEPOINT_NO
+
+
+def test_load_parquet_falls_back_to_failsafe(stored_data, tmp_path):
+    _, csv_path, _ = stored_data
+    data = load_astrometeo_data(
+        path=str(tmp_path / "missing_dataset"), failsafe_path=csv_path
+    )
+    assert data.shape[0] == LOCATION_NO * TIMEPOINT_NO
+    assert "seeing_desc" in data.columns
+
+
+def test_parquet_read_follows_history_index(stored_data):
+    latest, csv_path, parquet_path = stored_data
+    locations = sorted(latest["location"].unique())
+    with open(f"{parquet_path}/_latest.json", "w") as handle:
+        json.dump({location: "2023041000" for location in locations[:2]}, handle)
+    data = read_astrometeo_data(parquet_path, columns=DataSchema.get_fields_names())
+    assert sorted(data["location"].unique()) == locations[:2]
+    from_csv = read_astrometeo_data(csv_path, columns=DataSchema.get_fields_names())
+    assert not _sorted(data)["seeing"].equals(
+        _sorted(from_csv[from_csv.location.isin(locations[:2])])["seeing"]
+    )
@@ -0,0 +1,94 @@
+"""Tests for column-wise data schema validation"""
+import random
+from typing import List
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import BaseModel, ValidationError
+from ..loader import DataSchema
+from ..validation import schema_violations, validate_frame
+from .weather_data_generator import FakeWeatherDataGenerator
+
+CORRUPTIONS = {
+    "location": [None, 7, 2.5, ["list"]],
+    "timepoint": ["tomorrow", "2022111106", 1681128000, None],
+    "cloudcover": [0, 10, 3.7, "5", "five", np.nan, None, True],
+    "seeing": [-1, 9, 8.9],
+    "transparency": [1e20, "8"],
+    "lifted_index": [0, 3, -10.0, "15", -6.5, np.nan],
+    "rh2m": [-5, 17, -4.9],
+    "temp2m": [-77, 61, 60.5],
+    "prec_type": ["storm", "RAIN", 1],
+    "wind10m_direction": ["NS", None],
+    "wind10m_speed": [0, 9, "1"],
+}
+
+
+class RowValidator(BaseModel):
+    """
+    Per row validation, as done before column-wise validation
+    """
+
+    schema_dict: List[DataSchema]
+
+
+def _row_wise_errors(df: pd.DataFrame) -> set:
+    try:
+        RowValidator(schema_dict=df.to_dict(orient="records"))
+    except ValidationError as exc:
+        return {error["loc"][1:] for error in exc.errors()}
+    return set()
+
+
+def _column_wise_errors(df: pd.DataFrame) -> set:
+    try:
+        validate_frame(df, DataSchema)
+    except ValidationError as exc:
+        return {error["loc"] for error in exc.errors()}
+    return set()
+
+
+@pytest.fixture
+def weather_df() -> pd.DataFrame:
+    data = FakeWeatherDataGenerator(location_no=4, timepoint_no=20).produce_data()
+    return pd.DataFrame(data, columns=DataSchema.__fields__)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_column_wise_validation_equals_row_wise(weather_df, seed):
+    rnd = random.Random(seed)
+    df = weather_df.astype(object)
+    for _ in range(rnd.randint(0, 6)):
+        column = rnd.choice(list(CORRUPTIONS))
+        df.iat[rnd.randrange(len(df)), df.columns.get_loc(column)] = rnd.choice(
+            CORRUPTIONS[column]
+        )
+    assert _column_wise_errors(df) == _row_wise_errors(df)
+
+
+def test_column_wise_validation_of_typed_columns(weather_df):
+    df = weather_df.astype({"timepoint": "datetime64[ns]", "cloudcover": float})
+    df.loc[3, "cloudcover"] = 9.5
+    df.loc[5, "cloudcover"] = np.nan
+    df.loc[7, "rh2m"] = 20
+    df.loc[9, "lifted_index"] = 1
+    df["prec_type"] = df["prec_type"].astype("category")
+    assert _column_wise_errors(df) == _row_wise_errors(df)
+    assert _column_wise_errors(df) == {
+        (5, "cloudcover"),
+        (7, "rh2m"),
+        (9, "lifted_index"),
+    }
+
+
+def test_schema_violations_report_rows_and_columns(weather_df):
+    df = weather_df.drop(columns="seeing")
+    df.loc[2, "wind10m_direction"] = "NS"
+    violations = schema_violations(df.head(3), DataSchema)
+    assert list(zip(violations["row"], violations["column"])) == [
+        (0, "seeing"),
+        (1, "seeing"),
+        (2, "seeing"),
+        (2, "wind10m_direction"),
+    ]
+    assert violations["value"].iloc[-1] == "NS"
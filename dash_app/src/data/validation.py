@@ -0,0 +1,136 @@
+"""Column-wise validation of data frames against pydantic data schema"""
+from datetime import datetime
+from enum import Enum
+from typing import Iterator, List, Optional, Tuple, Type
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import ModelField
+
+
+def _surely_valid(series: pd.Series, field: ModelField) -> Optional[np.ndarray]:
+    """
+    Vectorized check of column; returns mask of values certainly accepted by field,
+    or None when field cannot be checked column-wise (eg. has custom validators)
+    """
+    if field.class_validators or field.pre_validators or field.post_validators:
+        return None
+    type_ = field.type_
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return series.isin([member.value for member in type_]).to_numpy()
+    if type_ is datetime:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return np.ones(len(series), dtype=bool)
+        return None
+    if type_ is int or (isinstance(type_, type) and issubclass(type_, int)):
+        if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(
+            series
+        ):
+            return None
+        # ints are coerced by truncation, eg. 3.7 -> 3, before bounds are checked
+        values = np.trunc(series.to_numpy(dtype=float, na_value=np.nan))
+        valid = np.isfinite(values)
+        low, high = getattr(type_, "ge", None), getattr(type_, "le", None)
+        if low is not None:
+            valid &= values >= low
+        if high is not None:
+            valid &= values <= high
+        return valid
+    return None
+
+
+def _distinct(values: pd.Series) -> Tuple[np.ndarray, list]:
+    """
+    Factorizes values into codes and distinct values, boxed as python objects
+    same as in to_dict(orient="records"). Values of mixed object columns which are
+    equal but of different type (1, 1.0, True; None, nan) are kept apart
+    """
+    homogeneous = ("string", "integer", "floating", "boolean", "datetime")
+    if (
+        values.dtype != object
+        or pd.api.types.infer_dtype(values, skipna=False) in homogeneous
+    ):
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        return codes, list(pd.Series(uniques, dtype=object))
+    try:
+        codes, _ = pd.factorize(
+            pd.Series(list(zip(values.map(type), values)), dtype=object),
+            use_na_sentinel=False,
+        )
+    except TypeError:  # unhashable values
+        codes = np.arange(len(values))
+    _, first = np.unique(codes, return_index=True)
+    return codes, list(values.iloc[first])
+
+
+def _field_errors(value, field: ModelField, schema: Type[BaseModel]) -> list:
+    _, errors = field.validate(value, {}, loc=field.name, cls=schema)
+    if errors is None:
+        return []
+    return errors if isinstance(errors, list) else [errors]
+
+
+def _column_violations(
+    series: pd.Series, field: ModelField, schema: Type[BaseModel]
+) -> Iterator[Tuple[np.ndarray, object, list]]:
+    """
+    Yields (row positions, value, errors) for every distinct invalid value of column.
+    Values not certainly valid are validated by field once per distinct value
+    """
+    valid = _surely_valid(series, field)
+    positions = np.arange(len(series)) if valid is None else np.flatnonzero(~valid)
+    if not positions.size:
+        return
+    codes, uniques = _distinct(series.iloc[positions])
+    for code, value in enumerate(uniques):
+        errors = _field_errors(value, field, schema)
+        if errors:
+            yield positions[codes == code], value, errors
+
+
+def _violations(
+    df: pd.DataFrame, data_schema: Type[BaseModel]
+) -> Iterator[Tuple[str, np.ndarray, object, list]]:
+    for name, field in data_schema.__fields__.items():
+        if name not in df.columns:
+            if field.required:
+                yield name, np.arange(len(df)), None, [
+                    ErrorWrapper(MissingError(), name)
+                ]
+            continue
+        for rows, value, errors in _column_violations(df[name], field, data_schema):
+            yield name, rows, value, errors
+
+
+def schema_violations(df: pd.DataFrame, data_schema: Type[BaseModel]) -> pd.DataFrame:
+    """
+    Returns offending values of df: one row per invalid (row position, column) pair,
+    with value and error message. Empty frame means df conforms to data_schema
+    """
+    records = [
+        (row, column, value, "; ".join(str(error.exc) for error in errors))
+        for column, rows, value, errors in _violations(df, data_schema)
+        for row in rows
+    ]
+    return pd.DataFrame(
+        records, columns=["row", "column", "value", "error"]
+    ).sort_values(["row", "column"], ignore_index=True)
+
+
+def validate_frame(df: pd.DataFrame, data_schema: Type[BaseModel]) -> None:
+    """
+    Validates every row of df against data_schema, column by column.
+    Accepts and rejects same values as validating each row as data_schema model,
+    raises ValidationError with (row position, column) location of each error
+    """
+    errors: List[ErrorWrapper] = [
+        ErrorWrapper(error.exc, loc=(int(row), column))
+        for column, rows, _, column_errors in _violations(df, data_schema)
+        for row in rows
+        for error in column_errors
+    ]
+    if errors:
+        errors.sort(key=lambda error: error.loc_tuple())
+        raise ValidationError(errors, data_schema)
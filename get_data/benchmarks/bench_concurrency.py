@@ -0,0 +1,36 @@
+"""
+Throughput of get_data against local stub API for growing concurrency limits.
+Run from get_data directory: python -m benchmarks.bench_concurrency
+"""
+import argparse
+import time
+import main
+from tests.fake_api import FakeApiServer
+
+
+def run(location_no: int, latency: float, workers: tuple) -> None:
+    locations = tuple(
+        main.Location(name=f"Site {n}", latitude=n / 100, longitude=n / 100)
+        for n in range(location_no)
+    )
+    with FakeApiServer(latency=latency) as server:
+        print(f"{location_no} locations, {latency * 1000:.0f} ms simulated latency")
+        print(f"{'workers':>8} {'seconds':>9} {'locations/s':>12} {'connections':>12}")
+        for max_workers in workers:
+            server.connections.clear()
+            start = time.perf_counter()
+            main.get_data(locations, max_workers=max_workers, api_url=server.url)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{max_workers:>8} {elapsed:>9.2f} {location_no / elapsed:>12.1f}"
+                f" {len(server.connections):>12}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, nargs="+", default=(1, 2, 4, 8, 16, 32))
+    args = parser.parse_args()
+    run(args.locations, args.latency, tuple(args.workers))
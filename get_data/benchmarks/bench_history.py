@@ -0,0 +1,42 @@
+"""
+Cost of ingesting one forecast run as forecast history grows.
+Run from get_data directory: python -m benchmarks.bench_history
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+import main
+from history import ForecastHistory
+from tests.fake_api import FakeApiServer
+
+
+def run(location_no: int, run_no: int, report_every: int) -> None:
+    locations = tuple(
+        main.Location(name=f"Site {n}", latitude=n / 100, longitude=n / 100)
+        for n in range(location_no)
+    )
+    first_init = datetime(2023, 4, 10)
+    with FakeApiServer() as server, tempfile.TemporaryDirectory() as tmp:
+        history = ForecastHistory(f"{tmp}/history")
+        print(f"{location_no} locations, one run every 6 hours")
+        print(f"{'run':>5} {'stored runs':>12} {'ingest seconds':>15}")
+        for run_index in range(1, run_no + 1):
+            server.init = (first_init + timedelta(hours=6 * run_index)).strftime(
+                "%Y%m%d%H"
+            )
+            df = main.get_data(locations, api_url=server.url)
+            start = time.perf_counter()
+            history.ingest(df)
+            elapsed = time.perf_counter() - start
+            if run_index == 1 or run_index % report_every == 0:
+                print(f"{run_index:>5} {run_index * location_no:>12} {elapsed:>15.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=60)
+    parser.add_argument("--report-every", type=int, default=10)
+    args = parser.parse_args()
+    run(args.locations, args.runs, args.report_every)
@@ -0,0 +1,69 @@
+"""
+End-to-end ingestion (fetch, parse, write) against local stub API and local bucket.
+Run from get_data directory: python -m benchmarks.bench_ingest
+"""
+import argparse
+import resource
+import tempfile
+import main
+from tests.fake_api import FakeApiServer
+
+
+def run(
+    location_no: int,
+    latency: float,
+    error_rate: float,
+    timepoint_no: int,
+    data_format: str,
+    max_workers: int,
+) -> None:
+    locations = tuple(
+        main.Location(name=f"Site {n}", latitude=n / 100, longitude=n / 100)
+        for n in range(location_no)
+    )
+    with FakeApiServer(
+        latency=latency, error_rate=error_rate, timepoint_no=timepoint_no
+    ) as server, tempfile.TemporaryDirectory() as bucket:
+        result = main.ingest(
+            locations,
+            bucket_url=bucket,
+            data_format=data_format,
+            conditional_fetch=False,
+            max_workers=max_workers,
+            api_url=server.url,
+        )
+    stats = result.stats.as_dict()
+    # ru_maxrss is reported in kilobytes on linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{location_no} locations, {latency * 1000:.0f} ms simulated latency,"
+        f" {error_rate:.0%} errors, {timepoint_no} timepoints, {data_format} output"
+    )
+    print(f"{'seconds':>9} {'locations/s':>12} {'p50 s':>7} {'p99 s':>7}", end="")
+    print(f" {'retries':>8} {'failed':>7} {'peak MB':>8}")
+    print(
+        f"{result.elapsed:>9.2f} {result.written / result.elapsed:>12.1f}"
+        f" {stats.get('latency_p50', 0):>7.3f} {stats.get('latency_p99', 0):>7.3f}"
+        f" {stats['retries']:>8} {stats['failed']:>7} {peak_rss:>8.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--locations", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timepoints", type=int, default=24)
+    parser.add_argument(
+        "--format", choices=("csv", "parquet", "history"), default="csv"
+    )
+    parser.add_argument("--workers", type=int, default=main.MAX_WORKERS)
+    args = parser.parse_args()
+    run(
+        args.locations,
+        args.latency,
+        args.error_rate,
+        args.timepoints,
+        args.format,
+        args.workers,
+    )
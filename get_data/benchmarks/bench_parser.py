@@ -0,0 +1,40 @@
+"""
+Parsing time of astro responses: columnar parser vs previous DataFrame-based one.
+Run from get_data directory: python -m benchmarks.bench_parser
+"""
+import argparse
+import json
+import time
+from parsing import parse_astro
+from tests.fake_api import astro_payload
+from tests.reference_parser import reference_parse_astro
+
+
+def _timed(func, body: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body, location="Site")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: tuple, repeat: int) -> None:
+    print(f"{'rows':>8} {'reference ms':>13} {'columnar ms':>12} {'speedup':>8}")
+    for size in sizes:
+        body = json.dumps(astro_payload(1.0, 1.0, timepoint_no=size), indent=2)
+        body = body.encode()
+        reference = _timed(reference_parse_astro, body, repeat)
+        columnar = _timed(parse_astro, body, repeat)
+        print(
+            f"{size:>8} {reference * 1000:>13.3f} {columnar * 1000:>12.3f}"
+            f" {reference / columnar:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=(24, 1000, 100000))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(tuple(args.sizes), args.repeat)
@@ -0,0 +1,178 @@
+"""Conditional fetching support - on-disk response cache and per-location fetch state"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import fsspec
+import numpy as np
+
+CACHE_DIR = os.environ.get("CACHE_DIR", "/tmp/astro_weather_cache")
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 900))
+MODEL_RUN_HOURS = int(os.environ.get("MODEL_RUN_HOURS", 6))
+# locations listed in run log, keeps log entry small for large registries
+LOGGED_LOCATIONS = int(os.environ.get("LOGGED_LOCATIONS", 50))
+INIT_FORMAT = "%Y%m%d%H"
+
+
+def content_hash(body: bytes) -> str:
+    """
+    Digest of raw response body
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class FetchStats:
+    """
+    Counters of fetching outcomes and per-location fetching details,
+    safe to update from fetching threads
+    """
+
+    fetched: int = 0
+    cache_hits: int = 0
+    skipped_not_due: int = 0
+    skipped_unchanged: int = 0
+    failed: int = 0
+    retries: int = 0
+    hedged: int = 0
+    _locations: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def record(self, location: str, **details: Any) -> None:
+        """
+        Stores fetching details (latency, attempts, status...) of single location
+        """
+        with self._lock:
+            self._locations[location] = details
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns fetching details per location
+        """
+        with self._lock:
+            return dict(self._locations)
+
+    def notable(self, limit: int = LOGGED_LOCATIONS) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns fetching details of first limit locations that failed, were retried
+        or hedged
+        """
+        notable = {}
+        for location, details in self.report().items():
+            if len(notable) == limit:
+                break
+            if (
+                details.get("status") == "failed"
+                or details.get("attempts", 0) > 1
+                or details.get("hedged")
+            ):
+                notable[location] = details
+        return notable
+
+    @property
+    def skipped(self) -> int:
+        """
+        Number of locations which were neither parsed nor written
+        """
+        return self.skipped_not_due + self.skipped_unchanged
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = {
+            item.name: getattr(self, item.name)
+            for item in fields(self)
+            if not item.name.startswith("_")
+        }
+        latencies = [
+            details["latency"]
+            for details in self.report().values()
+            if details.get("latency") is not None
+        ]
+        if latencies:
+            stats["latency_p50"] = round(float(np.quantile(latencies, 0.5)), 3)
+            stats["latency_p99"] = round(float(np.quantile(latencies, 0.99)), 3)
+        return {**stats, "skipped": self.skipped}
+
+
+class ResponseCache:
+    """
+    Raw API responses stored on local disk, valid for ttl seconds
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, ttl: int = CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest())
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Returns cached body, None if missing or older than ttl
+        """
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, body: bytes) -> None:
+        path = self._path(url)
+        with open(f"{path}.tmp", "wb") as handle:
+            handle.write(body)
+        os.replace(f"{path}.tmp", path)
+
+
+class FetchState:
+    """
+    Last seen forecast init and content hash per location, persisted as json under path
+    """
+
+    def __init__(
+        self, path: str, locations: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        self.path = path
+        self.locations = locations or {}
+
+    @classmethod
+    def load(cls, path: str) -> "FetchState":
+        filesystem, file_path = fsspec.core.url_to_fs(path)
+        if not filesystem.exists(file_path):
+            return cls(path)
+        with filesystem.open(file_path, "r") as handle:
+            return cls(path, json.load(handle))
+
+    def save(self) -> None:
+        with fsspec.open(self.path, "w") as handle:
+            json.dump(self.locations, handle, ensure_ascii=False)
+
+    def is_due(self, location: str, now: Optional[datetime] = None) -> bool:
+        """
+        False while next model run after last seen init cannot be published yet
+        """
+        last_seen = self.locations.get(location)
+        if last_seen is None:
+            return True
+        now = now or datetime.utcnow()
+        next_init = datetime.strptime(last_seen["init"], INIT_FORMAT) + timedelta(
+            hours=MODEL_RUN_HOURS
+        )
+        return now >= next_init
+
+    def is_changed(self, location: str, digest: str) -> bool:
+        last_seen = self.locations.get(location)
+        return last_seen is None or last_seen["hash"] != digest
+
+    def update(self, location: str, init: str, digest: str) -> None:
+        self.locations[location] = {"init": init, "hash": digest}
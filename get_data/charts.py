@@ -0,0 +1,155 @@
+"""Figure-ready chart artifacts of single location, written along with data"""
+from typing import Any, Dict, List
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+
+# layout of artifact - dash app serves only artifacts of version it knows
+CHART_VERSION = 1
+
+# rescaling and descriptions as in dash app (dash_app/src/data/mapping.py);
+# descriptions are keyed by raw api values
+LIFTED_INDEX_SCALED = {-10: 1, -6: 2, -4: 3, -1: 4, 2: 5, 6: 6, 10: 7, 15: 8}
+RH2M_SCALED = {k - 6: k / 2 for k in range(2, 23)}
+
+DESCRIPTIONS = {
+    "cloudcover": {
+        1: "0%-6%",
+        2: "6%-19%",
+        3: "19%-31%",
+        4: "31%-44%",
+        5: "44%-56%",
+        6: "56%-69%",
+        7: "69%-81%",
+        8: "81%-94%",
+        9: "94%-100%",
+    },
+    "seeing": {
+        1: '<0.5"',
+        2: '0.5"-0.75"',
+        3: '0.75"-1"',
+        4: '1"-1.25"',
+        5: '1.25"-1.5"',
+        6: '1.5"-2"',
+        7: '2"-2.5"',
+        8: '>2.5"',
+    },
+    "transparency": {
+        1: "<0.3",
+        2: "0.3-0.4",
+        3: "0.4-0.5",
+        4: "0.5-0.6",
+        5: "0.6-0.7",
+        6: "0.7-0.85",
+        7: "0.85-1",
+        8: ">1",
+    },
+    "lifted_index": {
+        -10: "Below -7",
+        -6: "-7 to -5",
+        -4: "-5 to -3",
+        -1: "-3 to 0",
+        2: "0 to 4",
+        6: "4 to 8",
+        10: "8 to 11",
+        15: "Over 11",
+    },
+    "rh2m": {
+        **{n: f"{((n+4)*5)}%-{(n+5)*5}%" for n in range(-4, 16)},
+        **{16: "100%"},
+    },
+    "wind10m_speed": {
+        1: "Below 0.3m/s (calm)",
+        2: "0.3-3.4m/s (light)",
+        3: "3.4-8.0m/s (moderate)",
+        4: "8.0-10.8m/s (fresh)",
+        5: "10.8-17.2m/s (strong)",
+        6: "17.2-24.5m/s (gale)",
+        7: "24.5-32.6m/s (storm)",
+        8: "Over 32.6m/s (hurricane)",
+    },
+}
+
+# secondary (1-12 scaled) measures in dash app data columns order
+SECONDARY_MEASURES = {
+    "cloudcover": "% Cloud coverage",
+    "seeing": "Astronomical seeing",
+    "transparency": "Atmosphere transparency",
+    "lifted_index": "Atmosphere stability",
+    "rh2m": "Relative humidity",
+    "wind10m_speed": "Wind speed",
+}
+
+
+def chart_name(location: str) -> str:
+    """
+    Artifact object name of location, safe for any location name
+    """
+    return f"{quote(location, safe='')}.json"
+
+
+def _trace(measure: str, x: List[str], y: pd.Series, **properties: Any) -> dict:
+    return {
+        "type": "scatter",
+        "mode": "markers+lines",
+        "meta": measure,
+        "x": x,
+        "y": y.tolist(),
+        **properties,
+    }
+
+
+def chart_artifact(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Builds figure-ready chart of single location get_data frame - traces of
+    every graphed measure (tagged with measure in trace meta), hover texts and
+    axis ranges, as dash app line chart renders them
+    """
+    df = df.sort_values("timepoint")
+    timepoints = df["timepoint"].to_numpy(dtype="datetime64[s]")
+    x = np.datetime_as_string(timepoints).tolist()
+    scaled = {
+        **{measure: df[measure] for measure in SECONDARY_MEASURES},
+        "lifted_index": df["lifted_index"].map(LIFTED_INDEX_SCALED),
+        "rh2m": df["rh2m"].map(RH2M_SCALED),
+    }
+    texts = {
+        measure: df[measure].map(DESCRIPTIONS[measure])
+        for measure in SECONDARY_MEASURES
+    }
+    texts["wind10m_speed"] = texts["wind10m_speed"].str.cat(
+        df["wind10m_direction"].astype(str), sep=", direction: "
+    )
+    traces = [
+        _trace("temp2m", x, df["temp2m"], name="Temperature", hovertemplate="%{y} °C"),
+        *(
+            _trace(
+                measure,
+                x,
+                scaled[measure],
+                name=name,
+                text=texts[measure].tolist(),
+                hovertemplate="%{text}",
+                xaxis="x",
+                yaxis="y2",
+            )
+            for measure, name in SECONDARY_MEASURES.items()
+        ),
+    ]
+    layout = {
+        "xaxis": {"anchor": "y", "domain": [0.0, 0.94], "title": {"text": "timepoint"}},
+        "yaxis": {
+            "anchor": "x",
+            "domain": [0.0, 1.0],
+            "range": [int(df["temp2m"].min()) - 5, int(df["temp2m"].max()) + 5],
+        },
+        "yaxis2": {"anchor": "x", "overlaying": "y", "side": "right", "range": [0, 12]},
+        "legend": {"itemclick": False, "itemdoubleclick": False},
+        "hovermode": "x",
+    }
+    return {
+        "version": CHART_VERSION,
+        "location": str(df.index[0]),
+        "timepoints": {"first": x[0], "last": x[-1], "count": len(x)},
+        "figure": {"data": traces, "layout": layout},
+    }
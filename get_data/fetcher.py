@@ -0,0 +1,327 @@
+"""HTTP layer for 7timer API - pooled session and concurrent fetching"""
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = os.environ.get("API_URL", "http://www.7timer.info/bin/api.pl")
+MAX_WORKERS = int(os.environ.get("MAX_WORKERS", 8))
+RATE_LIMIT = float(os.environ.get("RATE_LIMIT", 0))
+TIMEOUT = 10
+RETRIES = int(os.environ.get("RETRIES", 2))
+BACKOFF = float(os.environ.get("BACKOFF", 0.5))
+# scheduler attempt window, part of it is reserved for writing output
+ATTEMPT_DEADLINE = float(os.environ.get("ATTEMPT_DEADLINE", 320))
+WRITE_MARGIN = float(os.environ.get("WRITE_MARGIN", 60))
+HEDGE_QUANTILE = 0.95
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def build_url(
+    longitude: float, latitude: float, tzshift: int = 1, api_url: str = API_URL
+) -> str:
+    """
+    Builds 7timer astro product url for given coordinates
+    """
+    return f"{api_url}?lon={longitude}&lat={latitude}&product=astro&tzshift={tzshift}&output=json"
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """
+    Creates session with keep-alive connection pool shared by all fetching threads
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_body(session: requests.Session, url: str, timeout: float = TIMEOUT) -> bytes:
+    """
+    Single API call, returns raw response body
+    """
+    response = session.get(url=url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def imap_concurrently(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = MAX_WORKERS
+) -> Iterator[R]:
+    """
+    Lazily applies func over items using at most max_workers threads.
+    Results are yielded in the order of input items, regardless of completion order;
+    no more than 2 * max_workers results are held waiting for consumer
+    """
+    if max_workers <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def map_concurrently(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = MAX_WORKERS
+) -> List[R]:
+    """
+    Applies func over items using at most max_workers threads.
+    Results are returned in the order of input items, regardless of completion order
+    """
+    return list(imap_concurrently(func, items, max_workers=max_workers))
+
+
+class RateLimiter:
+    """
+    Token bucket shared by fetching threads: rate requests per second on average,
+    with bursts of up to burst requests
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until token is available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ProgressReporter:
+    """
+    Thread-safe counter of processed items, logging progress and timing every `every` items
+    """
+
+    def __init__(self, total: int, label: str = "", every: int = 100):
+        self.total = total
+        self.label = label
+        self.every = every
+        self.done = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def advance(self) -> None:
+        with self._lock:
+            self.done += 1
+            if self.done % self.every and self.done != self.total:
+                return
+            logger.info(
+                "%s%d/%d locations done in %.1fs",
+                f"{self.label}: " if self.label else "",
+                self.done,
+                self.total,
+                self.elapsed,
+            )
+
+
+class FetchFailed(Exception):
+    """
+    Raised when url could not be fetched with all allowed attempts
+    """
+
+    def __init__(self, url: str, attempts: int):
+        super().__init__(f"{url} not fetched, {attempts} attempts made")
+        self.attempts = attempts
+
+
+class DeadlineExceeded(FetchFailed):
+    """
+    Raised when there is no time left in fetching budget
+    """
+
+
+class Deadline:
+    """
+    Global time budget of a batch; None seconds means no limit
+    """
+
+    def __init__(self, seconds: Optional[float] = ATTEMPT_DEADLINE - WRITE_MARGIN):
+        self.expires = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        if self.expires is None:
+            return float("inf")
+        return max(self.expires - time.monotonic(), 0.0)
+
+
+class LatencyTracker:
+    """
+    Thread-safe window of recent response times, source of hedging threshold
+    """
+
+    def __init__(self, quantile: float = HEDGE_QUANTILE, min_samples: int = 20):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def threshold(self) -> Optional[float]:
+        """
+        Latency quantile of recent responses, None until min_samples were seen
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            return float(np.quantile(np.fromiter(self._samples, float), self.quantile))
+
+
+@dataclass
+class FetchResult:
+    """
+    Response body along with per-location fetching details
+    """
+
+    body: bytes
+    latency: float
+    attempts: int
+    hedged: bool
+
+
+def _hedged_get(
+    session: requests.Session,
+    url: str,
+    timeout: float,
+    hedge_after: Optional[float],
+    executor: Optional[Executor],
+    hedge_executor: Optional[Executor] = None,
+    rate_limiter: Optional["RateLimiter"] = None,
+) -> Tuple[bytes, bool]:
+    """
+    Single attempt within timeout. Request is sent from executor; when no response
+    arrives within hedge_after seconds, duplicate request is sent from hedge_executor
+    (kept for duplicates only, so that they never queue behind requests) through
+    rate_limiter, and first successful response of the two is returned. Both
+    requests get time remaining in the attempt when they are actually sent
+    """
+    if (
+        executor is None
+        or hedge_executor is None
+        or hedge_after is None
+        or hedge_after >= timeout
+    ):
+        return fetch_body(session=session, url=url, timeout=timeout), False
+    attempt = Deadline(seconds=timeout)
+
+    def _fetch(limited: bool) -> bytes:
+        if limited and rate_limiter is not None:
+            rate_limiter.acquire()
+        remaining = attempt.remaining()
+        if remaining <= 0:
+            raise requests.Timeout(f"{url} attempt timed out before request was sent")
+        return fetch_body(session=session, url=url, timeout=remaining)
+
+    primary = executor.submit(_fetch, False)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result(), False
+    pending = {primary, hedge_executor.submit(_fetch, True)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result(), True
+            error = future.exception()
+    raise error
+
+
+def fetch_resilient(
+    session: requests.Session,
+    url: str,
+    deadline: Optional[Deadline] = None,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    timeout: float = TIMEOUT,
+    latencies: Optional[LatencyTracker] = None,
+    request_executor: Optional[Executor] = None,
+    hedge_executor: Optional[Executor] = None,
+    rate_limiter: Optional["RateLimiter"] = None,
+) -> FetchResult:
+    """
+    Fetches url within deadline: failed attempts are retried up to retries times
+    after full-jitter exponential backoff, slow attempts (over latencies threshold)
+    are hedged with duplicate request - attempts are then sent from
+    request_executor and duplicates from hedge_executor
+    """
+    deadline = deadline or Deadline(seconds=None)
+    started = time.monotonic()
+    attempts = 0
+    while True:
+        attempt_timeout = min(timeout, deadline.remaining())
+        if attempt_timeout <= 0:
+            raise DeadlineExceeded(url, attempts)
+        attempts += 1
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        attempt_started = time.monotonic()
+        try:
+            body, hedged = _hedged_get(
+                session,
+                url,
+                timeout=attempt_timeout,
+                hedge_after=latencies.threshold() if latencies else None,
+                executor=request_executor,
+                hedge_executor=hedge_executor,
+                rate_limiter=rate_limiter,
+            )
+        except requests.RequestException as exc:
+            if attempts > retries:
+                raise FetchFailed(url, attempts) from exc
+            time.sleep(
+                min(
+                    random.uniform(0, backoff * 2 ** (attempts - 1)),
+                    deadline.remaining(),
+                )
+            )
+            continue
+        if latencies is not None:
+            latencies.add(time.monotonic() - attempt_started)
+        return FetchResult(
+            body=body,
+            latency=time.monotonic() - started,
+            attempts=attempts,
+            hedged=hedged,
+        )
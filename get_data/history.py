@@ -0,0 +1,140 @@
+"""Append-only forecast history - parquet dataset keyed by (location, init, timepoint)"""
+import bisect
+import json
+from typing import Any, Dict, List
+from urllib.parse import quote
+import fsspec
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from storage import INIT_FORMAT, PARQUET_DTYPES
+
+INITS_INDEX_NAME = "_inits.json"
+LATEST_INDEX_NAME = "_latest.json"
+PART_NAME = "part-0.parquet"
+
+
+def merge_runs(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges two timepoint-sorted runs of single (location, init) key.
+    Rows of new run replace existing rows with the same timepoint
+    """
+    keys = existing["timepoint"].values
+    new_keys = new["timepoint"].values
+    positions = np.searchsorted(keys, new_keys)
+    found = positions < len(keys)
+    found[found] = keys[positions[found]] == new_keys[found]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[positions[found]] = False
+    merged = pd.concat([existing[keep], new], ignore_index=True)
+    return merged.sort_values("timepoint", kind="mergesort", ignore_index=True)
+
+
+class ForecastHistory:
+    """
+    Every ingested forecast run is stored as its own partition
+    (<path>/location=<name>/init=<YYYYMMDDHH>/part-0.parquet), never overwritten by later runs.
+    Per location a sorted list of ingested inits is kept (location=<name>/_inits.json),
+    with latest init of every location in <path>/_latest.json - so ingesting a run
+    touches only its own partition and small indexes, not the accumulated history
+    """
+
+    def __init__(self, path: str):
+        self.filesystem, self.root = fsspec.core.url_to_fs(path)
+        self.stats = {"new_runs": 0, "merged_runs": 0, "rows": 0}
+        self._latest = None
+
+    def _location_dir(self, location: str) -> str:
+        return f"{self.root}/location={quote(location, safe='')}"
+
+    def _partition_path(self, location: str, init: str) -> str:
+        return f"{self._location_dir(location)}/init={quote(init, safe='')}/{PART_NAME}"
+
+    def _read_json(self, path: str, default: Any) -> Any:
+        if not self.filesystem.exists(path):
+            return default
+        with self.filesystem.open(path, "r") as handle:
+            return json.load(handle)
+
+    def _write_json(self, path: str, content: Any) -> None:
+        self.filesystem.makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+        with self.filesystem.open(path, "w") as handle:
+            json.dump(content, handle, ensure_ascii=False)
+
+    def inits(self, location: str) -> List[str]:
+        """
+        Returns sorted list of ingested inits for location
+        """
+        return self._read_json(
+            f"{self._location_dir(location)}/{INITS_INDEX_NAME}", default=[]
+        )
+
+    def latest(self) -> Dict[str, str]:
+        """
+        Returns latest ingested init per location
+        """
+        return self._read_json(f"{self.root}/{LATEST_INDEX_NAME}", default={})
+
+    def read_run(self, location: str, init: str) -> pd.DataFrame:
+        """
+        Reads rows of single forecast run
+        """
+        with self.filesystem.open(self._partition_path(location, init), "rb") as handle:
+            return pq.read_table(handle).to_pandas()
+
+    def _write_run(self, location: str, init: str, run: pd.DataFrame) -> None:
+        path = self._partition_path(location, init)
+        self.filesystem.makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+        table = pa.Table.from_pandas(run, preserve_index=False)
+        with self.filesystem.open(path, "wb") as handle:
+            pq.write_table(table, handle)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Adds runs contained in get_data output to history.
+        Already ingested (location, init) keys are merged by timepoint instead of duplicated.
+        Latest-init index is updated in memory only, until flush
+        """
+        if self._latest is None:
+            self._latest = self.latest()
+        df = df.reset_index().astype(PARQUET_DTYPES)
+        df["timepoint"] = df["timepoint"].astype("datetime64[ms]")
+        df["init"] = df["init"].dt.strftime(INIT_FORMAT)
+        for (location, init), run in df.groupby(["location", "init"], sort=False):
+            run = (
+                run.drop(columns=["location", "init"])
+                .sort_values("timepoint", kind="mergesort")
+                .drop_duplicates(subset="timepoint", keep="last", ignore_index=True)
+            )
+            inits = self.inits(location)
+            position = bisect.bisect_left(inits, init)
+            if position < len(inits) and inits[position] == init:
+                run = merge_runs(self.read_run(location, init), run)
+                self._write_run(location, init, run.astype(PARQUET_DTYPES))
+                self.stats["merged_runs"] += 1
+            else:
+                self._write_run(location, init, run)
+                inits.insert(position, init)
+                self._write_json(
+                    f"{self._location_dir(location)}/{INITS_INDEX_NAME}", inits
+                )
+                self.stats["new_runs"] += 1
+            self._latest[location] = max(init, self._latest.get(location, init))
+            self.stats["rows"] += run.shape[0]
+
+    def flush(self) -> None:
+        """
+        Persists latest-init index
+        """
+        if self._latest is not None:
+            self._write_json(f"{self.root}/{LATEST_INDEX_NAME}", self._latest)
+
+    def ingest(self, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Appends get_data output and persists indexes, returns stats of this call
+        """
+        before = dict(self.stats)
+        self.append(df)
+        self.flush()
+        return {key: value - before[key] for key, value in self.stats.items()}
@@ -1,18 +1,32 @@
+import json
+import logging
 import os
-from datetime import datetime
-from typing import NamedTuple, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
 import pandas as pd
 import requests
+from fetcher import (
+    API_URL,
+    MAX_WORKERS,
+    RATE_LIMIT,
+    ProgressReporter,
+    Deadline,
+    FetchFailed,
+    LatencyTracker,
+    RateLimiter,
+    build_url,
+    fetch_resilient,
+    imap_concurrently,
+    make_session,
+)
+from cache import FetchState, FetchStats, ResponseCache, content_hash
+from parsing import INIT_FORMAT, parse_astro
+from registry import Location, current_shard, load_locations, shard_locations
+from sinks import TeeSink, open_chart_sink, open_sink, write_frames
 
-
-class Location(NamedTuple):
-    """
-    Blueprint definition for location data
-    """
-
-    name: str
-    latitude: float
-    longitude: float
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 warsaw = Location(name="Warsaw", latitude=52.2296756, longitude=21.0122287)
@@ -25,60 +39,270 @@ ustrzyki_gorne = Location(
 ustka = Location(name="Ustka", latitude=54.5805607, longitude=16.861891)
 
 
-LOCATIONS = (warsaw, stalowa_wola, krakow, wroclaw, ustrzyki_gorne, ustka)
+LOCATIONS_PATH = os.environ.get("LOCATIONS_PATH")
+LOCATIONS = (
+    load_locations(LOCATIONS_PATH)
+    if LOCATIONS_PATH
+    else (warsaw, stalowa_wola, krakow, wroclaw, ustrzyki_gorne, ustka)
+)
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", 1))
 BUCKET_NAME = os.environ.get("BUCKET_NAME")
+# any fsspec url - eg. local directory standing in for gs:// bucket
+BUCKET_URL = os.environ.get("BUCKET_URL", f"gs://{BUCKET_NAME}")
+DATA_FORMAT = os.environ.get("DATA_FORMAT", "csv")
+CONDITIONAL_FETCH = os.environ.get("CONDITIONAL_FETCH", "0") == "1"
+# figure-ready per-location chart artifacts written along with data
+CHART_ARTIFACTS = os.environ.get("CHART_ARTIFACTS", "0") == "1"
 
 
-def get_data(locations: Tuple[Location] = LOCATIONS) -> pd.DataFrame:
+def iter_data(
+    locations: Tuple[Location] = LOCATIONS,
+    max_workers: int = MAX_WORKERS,
+    session: Optional[requests.Session] = None,
+    api_url: str = API_URL,
+    cache: Optional[ResponseCache] = None,
+    state: Optional[FetchState] = None,
+    stats: Optional[FetchStats] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    progress: Optional[ProgressReporter] = None,
+    deadline: Optional[Deadline] = None,
+    hedge: bool = True,
+) -> Iterator[pd.DataFrame]:
     """
-    Collects astro meteo forecast data for given list of locations
+    Lazily collects astro meteo forecast data for given list of locations,
+    yielding one frame per location as soon as it is parsed (and its predecessors
+    were yielded). Up to max_workers locations are fetched concurrently over one
+    pooled session, only a bounded window of parsed frames is held in memory;
+    output order follows order of locations.
+    With cache, responses younger than its ttl are reused without network call.
+    With state, locations whose next model run is not due yet or whose response
+    did not change since last seen are skipped (not parsed, not yielded).
+    Network calls are spread by rate_limiter, finished locations reported to progress.
+    Failed requests are retried until deadline, with hedge slow ones are duplicated;
+    locations which still fail are recorded in stats and left out (not yielded),
+    so that their previous rows can be kept by output sink
     """
+    stats = stats if stats is not None else FetchStats()
+    latencies = LatencyTracker()
+
+    def _get_location_data(location: Location) -> Optional[pd.DataFrame]:
+        try:
+            return _fetch_location_data(location)
+        except Exception as exc:
+            logger.warning("Fetching %s failed: %s", location.name, exc)
+            stats.increment("failed")
+            attempts = exc.attempts if isinstance(exc, FetchFailed) else None
+            stats.record(location.name, status="failed", attempts=attempts)
+            return None
+        finally:
+            if progress is not None:
+                progress.advance()
 
-    def _get_location_data(location: Location) -> pd.DataFrame:
+    def _fetch_location_data(location: Location) -> Optional[pd.DataFrame]:
         """
         get data for a single location, single API call
         """
-        lon = location.longitude
-        lat = location.latitude
-        tzshift = 1
-        URL = f"http://www.7timer.info/bin/api.pl?lon={lon}&lat={lat}&product=astro&tzshift={tzshift}&output=json"
+        if state is not None and not state.is_due(location.name):
+            stats.increment("skipped_not_due")
+            stats.record(location.name, status="not_due")
+            return None
+        URL = build_url(
+            longitude=location.longitude, latitude=location.latitude, api_url=api_url
+        )
+        body = cache.get(URL) if cache is not None else None
+        details = {"status": "ok", "latency": None, "attempts": 0, "hedged": False}
+        if body is None:
+            result = fetch_resilient(
+                session,
+                URL,
+                deadline=deadline,
+                latencies=latencies,
+                request_executor=request_executor,
+                hedge_executor=hedge_executor,
+                rate_limiter=rate_limiter,
+            )
+            body = result.body
+            details.update(
+                latency=result.latency, attempts=result.attempts, hedged=result.hedged
+            )
+            stats.increment("fetched")
+            stats.increment("retries", result.attempts - 1)
+            stats.increment("hedged", int(result.hedged))
+            if cache is not None:
+                cache.put(URL, body)
+        else:
+            stats.increment("cache_hits")
+            details["status"] = "cached"
+        digest = content_hash(body)
+        if state is not None and not state.is_changed(location.name, digest):
+            stats.increment("skipped_unchanged")
+            stats.record(location.name, **{**details, "status": "unchanged"})
+            return None
 
         # extract and format single location data
-        result = requests.get(url=URL, timeout=10).json()
-        startpoint = datetime.strptime(result["init"], "%Y%m%d%H")
-        dataseries = result["dataseries"]
-        df = pd.DataFrame(dataseries)
-        df["location"] = location.name
-        df["timepoint"] = startpoint + pd.to_timedelta(
-            df["timepoint"].astype(int), unit="H"
-        )
+        df = parse_astro(body, location=location.name)
+        if state is not None:
+            state.update(
+                location.name,
+                init=df["init"].iloc[0].strftime(INIT_FORMAT),
+                digest=digest,
+            )
+        stats.record(location.name, **details)
         return df
 
-    def _format_df(input_df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Get desired output format
-        """
-        output_df = input_df.join(pd.DataFrame(df.pop("wind10m").values.tolist()))
-        output_df.rename(
-            columns={"direction": "wind10m_direction", "speed": "wind10m_speed"},
-            inplace=True,
+    owns_session = session is None
+    if owns_session:
+        session = make_session(pool_size=2 * max_workers if hedge else max_workers)
+    # every location in flight holds at most one request and one duplicate
+    request_executor = ThreadPoolExecutor(max_workers=max_workers) if hedge else None
+    hedge_executor = ThreadPoolExecutor(max_workers=max_workers) if hedge else None
+    try:
+        for df in imap_concurrently(
+            _get_location_data, locations, max_workers=max_workers
+        ):
+            if df is not None:
+                yield df
+    finally:
+        for executor in (request_executor, hedge_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        if owns_session:
+            session.close()
+
+
+def get_data(
+    locations: Tuple[Location] = LOCATIONS, **fetch_options
+) -> Optional[pd.DataFrame]:
+    """
+    Collects astro meteo forecast data for given list of locations into single frame,
+    fetch_options as in iter_data. None is returned when every location was skipped
+    """
+    frames = list(iter_data(locations, **fetch_options))
+    if not frames:
+        return None
+    return pd.concat(frames)
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of single ingestion run
+    """
+
+    label: str
+    location_count: int
+    written: int
+    elapsed: float
+    stats: FetchStats
+
+    def summary(self) -> str:
+        return (
+            f"{self.label}, {self.location_count} locations in {self.elapsed:.1f}s"
+            f" {self.stats.as_dict()}"
         )
-        output_df = output_df.set_index("location")
-        return output_df
 
-    df = pd.concat([_get_location_data(location) for location in locations])
-    df = _format_df(df)
-    return df
+
+def ingest(
+    locations: Tuple[Location] = LOCATIONS,
+    bucket_url: str = BUCKET_URL,
+    data_format: str = DATA_FORMAT,
+    conditional_fetch: bool = CONDITIONAL_FETCH,
+    shard: Optional[int] = None,
+    shard_count: int = SHARD_COUNT,
+    chart_artifacts: bool = CHART_ARTIFACTS,
+    **fetch_options,
+) -> IngestResult:
+    """
+    Fetches given locations and streams them into bucket_url, which can be
+    any fsspec url - gs:// bucket or eg. local directory
+    (as .csv or, for data_format="parquet", as partitioned parquet dataset;
+    data_format="history" appends run to forecast history dataset)
+    With conditional_fetch, unchanged forecast runs are neither parsed nor written.
+    With shard, locations are treated as one slice - rows of the other ones are kept
+    and fetch state is stored per shard. With chart_artifacts, figure-ready chart of
+    every written location is stored too. fetch_options are passed to iter_data
+    """
+    label = f"shard {shard}/{shard_count}" if shard is not None else "all locations"
+    cache = state = None
+    if conditional_fetch:
+        state_name = (
+            "_fetch_state.json" if shard is None else f"_fetch_state_{shard}.json"
+        )
+        cache = ResponseCache()
+        state = FetchState.load(f"{bucket_url}/{state_name}")
+    stats = FetchStats()
+    progress = ProgressReporter(total=len(locations), label=label)
+    fetch_options.setdefault(
+        "rate_limiter", RateLimiter(rate=RATE_LIMIT) if RATE_LIMIT else None
+    )
+    fetch_options.setdefault("deadline", Deadline())
+    frames = iter_data(
+        locations=locations,
+        cache=cache,
+        state=state,
+        stats=stats,
+        progress=progress,
+        **fetch_options,
+    )
+    sink = open_sink(data_format, bucket_url)
+    if chart_artifacts:
+        sink = TeeSink(sink, open_chart_sink(bucket_url))
+    written = write_frames(
+        frames,
+        sink=sink,
+        carry_over=lambda: stats.skipped or stats.failed or shard is not None,
+    )
+    if state is not None:
+        state.save()
+    logger.info(
+        "Fetching stats: %s, failed, retried or hedged locations: %s",
+        json.dumps(stats.as_dict()),
+        json.dumps(stats.notable()),
+    )
+    return IngestResult(
+        label=label,
+        location_count=len(locations),
+        written=written,
+        elapsed=progress.elapsed,
+        stats=stats,
+    )
 
 
-def save_astrometeo_data_to_bucket(request, bucket_name: str = BUCKET_NAME) -> str:
+def save_astrometeo_data_to_bucket(
+    request,
+    bucket_url: str = BUCKET_URL,
+    data_format: str = DATA_FORMAT,
+    conditional_fetch: bool = CONDITIONAL_FETCH,
+    shard_count: int = SHARD_COUNT,
+    chart_artifacts: bool = CHART_ARTIFACTS,
+    **fetch_options,
+) -> str:
     """
-    Loads data from api request into bucket (as .csv)
+    Loads data from api request into bucket, see ingest.
+    With shard_count > 1 only one slice of locations is processed per invocation -
+    given by "shard" request argument or, by default, by current time slot of the hour
     """
-    df = get_data()
+    shard = None
+    if request is not None and request.args.get("shard") is not None:
+        shard = int(request.args["shard"])
+    elif shard_count > 1:
+        shard = current_shard(shard_count)
+    locations = LOCATIONS
+    if shard is not None:
+        locations = shard_locations(LOCATIONS, shard, shard_count)
     try:
-        df.to_csv(f"gs://{bucket_name}/astro_weather_data.csv")
-        msg = "Saved succesfully"
+        result = ingest(
+            locations=locations,
+            bucket_url=bucket_url,
+            data_format=data_format,
+            conditional_fetch=conditional_fetch,
+            shard=shard,
+            shard_count=shard_count,
+            chart_artifacts=chart_artifacts,
+            **fetch_options,
+        )
     except Exception as exc:
-        msg = exc
-    return msg
+        return exc
+    if not result.written:
+        return f"No new forecast runs - {result.summary()}"
+    return f"Saved succesfully - {result.summary()}"
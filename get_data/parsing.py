@@ -0,0 +1,54 @@
+"""Columnar parser of 7timer astro product responses"""
+from datetime import datetime
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional speedup
+    import json
+
+    loads = json.loads
+
+INIT_FORMAT = "%Y%m%d%H"
+INT_FIELDS = ("cloudcover", "seeing", "transparency", "lifted_index", "rh2m")
+
+
+def parse_astro(body: bytes, location: str) -> pd.DataFrame:
+    """
+    Parses raw astro response of single location into get_data output format:
+    one numpy array per field (wind10m flattened, timepoint made absolute),
+    indexed by location
+    """
+    result = loads(body)
+    init = datetime.strptime(result["init"], INIT_FORMAT)
+    dataseries = result["dataseries"]
+    row_count = len(dataseries)
+
+    def _ints(field: str) -> np.ndarray:
+        return np.fromiter(
+            map(itemgetter(field), dataseries), dtype=np.int64, count=row_count
+        )
+
+    def _strings(values) -> np.ndarray:
+        return np.fromiter(values, dtype=object, count=row_count)
+
+    wind = list(map(itemgetter("wind10m"), dataseries))
+    init_ns = np.datetime64(init, "ns")
+    timepoint = init_ns + _ints("timepoint").astype("timedelta64[h]")
+    columns = {
+        "timepoint": timepoint,
+        **{field: _ints(field) for field in INT_FIELDS},
+        "temp2m": _ints("temp2m"),
+        "prec_type": _strings(map(itemgetter("prec_type"), dataseries)),
+        "init": np.full(row_count, init_ns),
+        "wind10m_direction": _strings(map(itemgetter("direction"), wind)),
+        "wind10m_speed": np.fromiter(
+            map(itemgetter("speed"), wind), dtype=np.int64, count=row_count
+        ),
+    }
+    index = pd.Index(np.full(row_count, location, dtype=object), name="location")
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,60 @@
+"""Location registry loaded from .csv/.json file and its split into scheduler shards"""
+import json
+import math
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+import fsspec
+import pandas as pd
+
+
+class Location(NamedTuple):
+    """
+    Blueprint definition for location data
+    """
+
+    name: str
+    latitude: float
+    longitude: float
+
+
+def load_locations(path: str) -> Tuple[Location, ...]:
+    """
+    Loads locations from .csv (columns: name, latitude, longitude)
+    or .json (list of objects with the same keys) file; local or gs:// path
+    """
+    if path.endswith(".json"):
+        with fsspec.open(path, "r", encoding="utf-8") as handle:
+            records = json.load(handle)
+    else:
+        records = pd.read_csv(path, float_precision="round_trip").to_dict(
+            orient="records"
+        )
+    return tuple(
+        Location(
+            name=str(record["name"]),
+            latitude=float(record["latitude"]),
+            longitude=float(record["longitude"]),
+        )
+        for record in records
+    )
+
+
+def current_shard(shard_count: int, now: Optional[datetime] = None) -> int:
+    """
+    Shard index for invocation at given time - the hour is split into shard_count
+    equal slots, so scheduler triggering every 60 / shard_count minutes covers all shards
+    """
+    now = now or datetime.utcnow()
+    return now.minute * shard_count // 60
+
+
+def shard_locations(
+    locations: Tuple[Location, ...], shard_index: int, shard_count: int
+) -> Tuple[Location, ...]:
+    """
+    Returns contiguous slice of locations processed by given shard
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index has to be in range 0-{shard_count - 1}")
+    shard_size = math.ceil(len(locations) / shard_count)
+    return locations[shard_index * shard_size : (shard_index + 1) * shard_size]
@@ -0,0 +1,177 @@
+"""Output sinks receiving get_data frames one location at a time"""
+import json
+import uuid
+from typing import Callable, Iterable, Optional
+import fsspec
+import pandas as pd
+from charts import chart_artifact, chart_name
+from history import ForecastHistory
+from storage import to_partitioned_parquet
+
+CSV_CHUNK_ROWS = 10_000
+
+
+class CsvSink:
+    """
+    Appends frames to .csv file as they arrive. Rows are streamed into temporary
+    object (unique per sink, so that overlapping runs do not write into the same
+    one), moved over target path on close - so target is never left half written
+    """
+
+    def __init__(self, path: str):
+        self.filesystem, self.target = fsspec.core.url_to_fs(path)
+        self.columns = None
+        self.locations = set()
+        self.rows = 0
+        self._temporary = f"{self.target}.{uuid.uuid4().hex}.tmp"
+        self._handle = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._handle is None:
+            self.columns = list(df.columns)
+            self._handle = self.filesystem.open(self._temporary, "w")
+            df.to_csv(self._handle)
+        else:
+            df[self.columns].to_csv(self._handle, header=False)
+        self.locations.update(df.index.unique())
+        self.rows += df.shape[0]
+
+    def _carry_over_saved_rows(self) -> None:
+        """
+        Appends rows of locations not written in this run from saved .csv, chunk by chunk
+        """
+        if not self.filesystem.exists(self.target):
+            return
+        with self.filesystem.open(self.target, "r") as saved:
+            for chunk in pd.read_csv(
+                saved, index_col="location", chunksize=CSV_CHUNK_ROWS
+            ):
+                chunk = chunk[~chunk.index.isin(self.locations)]
+                chunk.reindex(columns=self.columns).to_csv(self._handle, header=False)
+
+    def close(self, carry_over: bool = False) -> None:
+        """
+        Finalizes file; with carry_over rows of other locations are kept from saved file.
+        Nothing is touched if no frame was written
+        """
+        if self._handle is None:
+            return
+        if carry_over:
+            self._carry_over_saved_rows()
+        self._handle.close()
+        self.filesystem.mv(self._temporary, self.target)
+
+
+class ParquetSink:
+    """
+    Writes every frame straight into its partitions of parquet dataset
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        to_partitioned_parquet(df, self.path)
+        self.rows += df.shape[0]
+
+    def close(self, carry_over: bool = False) -> None:
+        pass
+
+
+class HistorySink:
+    """
+    Appends every frame to forecast history, latest-init index persisted on close
+    """
+
+    def __init__(self, path: str):
+        self.history = ForecastHistory(path)
+
+    @property
+    def rows(self) -> int:
+        return self.history.stats["rows"]
+
+    def write(self, df: pd.DataFrame) -> None:
+        self.history.append(df)
+
+    def close(self, carry_over: bool = False) -> None:
+        self.history.flush()
+
+
+class ChartSink:
+    """
+    Writes figure-ready chart artifact of every frame (single location) under path
+    """
+
+    def __init__(self, path: str):
+        self.filesystem, self.target = fsspec.core.url_to_fs(path)
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        artifact = chart_artifact(df)
+        self.filesystem.makedirs(self.target, exist_ok=True)
+        name = f"{self.target}/{chart_name(artifact['location'])}"
+        with self.filesystem.open(name, "w") as handle:
+            json.dump(artifact, handle)
+        self.rows += df.shape[0]
+
+    def close(self, carry_over: bool = False) -> None:
+        pass
+
+
+class TeeSink:
+    """
+    Writes every frame into all sinks; rows are counted by the first one
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    @property
+    def rows(self) -> int:
+        return self.sinks[0].rows
+
+    def write(self, df: pd.DataFrame) -> None:
+        for sink in self.sinks:
+            sink.write(df)
+
+    def close(self, carry_over: bool = False) -> None:
+        for sink in self.sinks:
+            sink.close(carry_over=carry_over)
+
+
+def open_sink(data_format: str, bucket_url: str):
+    """
+    Returns sink for given output format ("csv", "parquet" or "history")
+    writing under bucket_url (eg. "gs://bucket" or local directory)
+    """
+    if data_format == "parquet":
+        return ParquetSink(f"{bucket_url}/astro_weather_data")
+    if data_format == "history":
+        return HistorySink(f"{bucket_url}/astro_weather_history")
+    return CsvSink(f"{bucket_url}/astro_weather_data.csv")
+
+
+def open_chart_sink(bucket_url: str) -> ChartSink:
+    """
+    Returns sink of per-location chart artifacts, writing under bucket_url
+    """
+    return ChartSink(f"{bucket_url}/astro_weather_charts")
+
+
+def write_frames(
+    frames: Iterable[pd.DataFrame],
+    sink,
+    carry_over: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Streams frames into sink, returns number of frames written.
+    carry_over is evaluated after last frame - whether rows of locations missing
+    in this run should be kept from previous output
+    """
+    written = 0
+    for df in frames:
+        sink.write(df)
+        written += 1
+    sink.close(carry_over=bool(carry_over()) if carry_over else False)
+    return written
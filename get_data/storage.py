@@ -0,0 +1,37 @@
+"""Columnar (parquet) output - dataset partitioned by location and forecast init"""
+import pandas as pd
+
+INIT_FORMAT = "%Y%m%d%H"
+PARTITION_COLS = ["location", "init"]
+
+# compact storage types; ranges follow 7timer astro product documentation
+PARQUET_DTYPES = {
+    "cloudcover": "int8",
+    "seeing": "int8",
+    "transparency": "int8",
+    "lifted_index": "int8",
+    "rh2m": "int8",
+    "temp2m": "int8",
+    "prec_type": "category",
+    "wind10m_direction": "category",
+    "wind10m_speed": "int8",
+}
+
+
+def to_partitioned_parquet(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes get_data output as hive partitioned parquet dataset
+    (<path>/location=<name>/init=<YYYYMMDDHH>/part-0.parquet).
+    Partitions of the same location & init are replaced, older inits are kept
+    """
+    output_df = df.reset_index().astype(PARQUET_DTYPES)
+    output_df["timepoint"] = output_df["timepoint"].astype("datetime64[ms]")
+    output_df["init"] = output_df["init"].dt.strftime(INIT_FORMAT)
+    output_df.to_parquet(
+        path,
+        engine="pyarrow",
+        index=False,
+        partition_cols=PARTITION_COLS,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
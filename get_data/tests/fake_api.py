@@ -0,0 +1,153 @@
+"""Local stand-in for 7timer astro API, used by tests and benchmarks"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+WIND_DIRECTIONS = ("N", "S", "E", "W", "NE", "NW", "SE", "SW")
+PREC_TYPES = ("rain", "snow", "frzr", "icep", "none")
+LIFTED_INDEX_VALUES = (-10, -6, -4, -1, 2, 6, 10, 15)
+
+
+def astro_payload(
+    longitude: float, latitude: float, init: str = "2023041012", timepoint_no: int = 24
+) -> Dict[str, Any]:
+    """
+    Builds astro product response; content is deterministic for given coordinates
+    """
+    rnd = random.Random(f"{longitude},{latitude},{init}")
+    return {
+        "product": "astro",
+        "init": init,
+        "dataseries": [
+            {
+                "timepoint": 3 * (n + 1),
+                "cloudcover": rnd.randint(1, 9),
+                "seeing": rnd.randint(1, 8),
+                "transparency": rnd.randint(1, 8),
+                "lifted_index": rnd.choice(LIFTED_INDEX_VALUES),
+                "rh2m": rnd.randint(-4, 16),
+                "wind10m": {
+                    "direction": rnd.choice(WIND_DIRECTIONS),
+                    "speed": rnd.randint(1, 8),
+                },
+                "temp2m": rnd.randint(-20, 35),
+                "prec_type": rnd.choice(PREC_TYPES),
+            }
+            for n in range(timepoint_no)
+        ],
+    }
+
+
+class FakeApiServer:
+    """
+    Threaded HTTP/1.1 (keep-alive) server answering astro product requests,
+    response size grows with timepoint_no (24 points ~ 5 kB, as real 3-day forecast).
+    Usable as context manager; exposes api url and served requests/connections counters.
+    Failures can be injected: error_rate share of requests (seeded, reproducible)
+    and every request for broken_latitudes answer with HTTP 500,
+    first slow_requests requests are delayed by slow_latency
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        init: str = "2023041012",
+        timepoint_no: int = 24,
+        error_rate: float = 0.0,
+        broken_latitudes: tuple = (),
+        slow_requests: int = 0,
+        slow_latency: float = 1.0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.init = init
+        self.timepoint_no = timepoint_no
+        self.error_rate = error_rate
+        self.broken_latitudes = set(broken_latitudes)
+        self.slow_requests = slow_requests
+        self.slow_latency = slow_latency
+        self._random = random.Random(seed)
+        self.requests_count = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/bin/api.pl"
+
+    def _handler_class(self):
+        fake_api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with fake_api._lock:
+                    fake_api.requests_count += 1
+                    fake_api.connections.add(self.client_address)
+                    is_slow = fake_api.requests_count <= fake_api.slow_requests
+                    is_error = fake_api._random.random() < fake_api.error_rate
+                query = parse_qs(urlparse(self.path).query)
+                latitude = float(query["lat"][0])
+                if fake_api.latency or is_slow:
+                    time.sleep(fake_api.slow_latency if is_slow else fake_api.latency)
+                if is_error or latitude in fake_api.broken_latitudes:
+                    self.send_response(500)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(
+                    astro_payload(
+                        longitude=float(query["lon"][0]),
+                        latitude=latitude,
+                        init=fake_api.init,
+                        timepoint_no=fake_api.timepoint_no,
+                    )
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "FakeApiServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serves fake astro API, point API_URL of get_data at printed url"
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timepoints", type=int, default=24)
+    args = parser.parse_args()
+    with FakeApiServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timepoint_no=args.timepoints,
+        port=args.port,
+    ) as server:
+        print(f"Serving fake astro API at {server.url}")
+        server._thread.join()
@@ -0,0 +1,26 @@
+"""Previous DataFrame-based response parsing, reference for golden tests and benchmarks"""
+import json
+from datetime import datetime
+import pandas as pd
+
+
+def reference_parse_astro(body: bytes, location: str) -> pd.DataFrame:
+    """
+    Single location variant of former get_data parsing (_get_location_data + _format_df)
+    """
+    result = json.loads(body)
+    startpoint = datetime.strptime(result["init"], "%Y%m%d%H")
+    dataseries = result["dataseries"]
+    df = pd.DataFrame(dataseries)
+    df["location"] = location
+    df["init"] = startpoint
+    df["timepoint"] = startpoint + pd.to_timedelta(
+        df["timepoint"].astype(int), unit="h"
+    )
+    output_df = df.join(pd.DataFrame(df.pop("wind10m").values.tolist()))
+    output_df.rename(
+        columns={"direction": "wind10m_direction", "speed": "wind10m_speed"},
+        inplace=True,
+    )
+    output_df = output_df.set_index("location")
+    return output_df
@@ -0,0 +1,102 @@
+"""Tests for conditional fetching"""
+import ast
+import json
+from datetime import datetime
+import pytest
+import main
+from cache import FetchState, FetchStats, ResponseCache
+from .fake_api import FakeApiServer
+
+LOCATIONS = (main.warsaw, main.krakow, main.ustka)
+
+
+@pytest.fixture
+def fake_api():
+    with FakeApiServer() as server:
+        yield server
+
+
+def test_response_cache_expires(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60)
+    cache.put("http://api/?lat=1", b"{}")
+    assert cache.get("http://api/?lat=1") == b"{}"
+    assert cache.get("http://api/?lat=2") is None
+    cache.ttl = -1
+    assert cache.get("http://api/?lat=1") is None
+
+
+def test_cached_responses_need_no_network(fake_api, tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+    first = main.get_data(LOCATIONS, api_url=fake_api.url, cache=cache)
+    stats = FetchStats()
+    second = main.get_data(LOCATIONS, api_url=fake_api.url, cache=cache, stats=stats)
+    assert fake_api.requests_count == len(LOCATIONS)
+    assert stats.cache_hits == len(LOCATIONS) and stats.fetched == 0
+    assert stats.as_dict()["cache_hits"] == len(LOCATIONS)
+    assert second.equals(first)
+
+
+def test_unchanged_runs_are_skipped(fake_api, tmp_path):
+    state = FetchState(str(tmp_path / "state.json"))
+    assert main.get_data(LOCATIONS, api_url=fake_api.url, state=state) is not None
+    state.save()
+
+    state = FetchState.load(str(tmp_path / "state.json"))
+    state.locations["Warsaw"]["hash"] = "outdated"
+    stats = FetchStats()
+    df = main.get_data(LOCATIONS, api_url=fake_api.url, state=state, stats=stats)
+    assert list(df.index.unique()) == ["Warsaw"]
+    assert stats.skipped_unchanged == len(LOCATIONS) - 1
+
+    stats = FetchStats()
+    assert (
+        main.get_data(LOCATIONS, api_url=fake_api.url, state=state, stats=stats) is None
+    )
+    assert stats.skipped == len(LOCATIONS)
+
+
+def test_not_due_locations_are_not_fetched(fake_api, tmp_path):
+    state = FetchState(str(tmp_path / "state.json"))
+    state.update("Warsaw", init=datetime.utcnow().strftime("%Y%m%d%H"), digest="x")
+    stats = FetchStats()
+    df = main.get_data(LOCATIONS, api_url=fake_api.url, state=state, stats=stats)
+    assert "Warsaw" not in df.index
+    assert stats.skipped_not_due == 1
+    assert fake_api.requests_count == len(LOCATIONS) - 1
+
+
+def test_function_reports_serializable_stats(fake_api, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "LOCATIONS", LOCATIONS)
+    messages = [
+        main.save_astrometeo_data_to_bucket(
+            None,
+            bucket_url=str(tmp_path),
+            conditional_fetch=True,
+            shard_count=1,
+            api_url=fake_api.url,
+        )
+        for _ in range(2)
+    ]
+    # failures are returned, not raised - message must be the summary
+    assert messages[0].startswith("Saved succesfully")
+    assert messages[1].startswith("No new forecast runs")
+    for message in messages:
+        stats = ast.literal_eval(message[message.index("{") :])
+        assert json.loads(json.dumps(stats)) == stats
+    assert stats["skipped"] == len(LOCATIONS)
+
+
+def test_notable_locations_are_capped():
+    stats = FetchStats()
+    stats.record("ok", status="ok", attempts=1, hedged=False)
+    stats.record("cached", status="cached")
+    for n in range(5):
+        stats.record(f"retried {n}", status="ok", attempts=2, hedged=False)
+    stats.record("hedged", status="ok", attempts=1, hedged=True)
+    stats.record("failed", status="failed", attempts=3)
+    assert list(stats.notable(limit=100)) == [
+        *(f"retried {n}" for n in range(5)),
+        "hedged",
+        "failed",
+    ]
+    assert list(stats.notable(limit=2)) == ["retried 0", "retried 1"]
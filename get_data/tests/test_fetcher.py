@@ -0,0 +1,39 @@
+"""Tests for concurrent fetching"""
+import time
+import pytest
+import main
+from fetcher import make_session, map_concurrently
+from .fake_api import FakeApiServer
+
+LOCATIONS = tuple(
+    main.Location(name=f"Site {n}", latitude=50 + n / 10, longitude=20 - n / 10)
+    for n in range(12)
+)
+
+
+@pytest.fixture
+def fake_api():
+    with FakeApiServer(latency=0.02) as server:
+        yield server
+
+
+def test_map_concurrently_keeps_input_order():
+    def _slow_identity(n: int) -> int:
+        time.sleep((10 - n) / 1000)
+        return n
+
+    assert map_concurrently(_slow_identity, range(10), max_workers=5) == list(range(10))
+
+
+def test_get_data_concurrent_matches_serial(fake_api):
+    serial = main.get_data(LOCATIONS, max_workers=1, api_url=fake_api.url)
+    concurrent = main.get_data(LOCATIONS, max_workers=6, api_url=fake_api.url)
+    assert list(concurrent.index.unique()) == [location.name for location in LOCATIONS]
+    assert concurrent.equals(serial)
+
+
+def test_get_data_reuses_pooled_connections(fake_api):
+    with make_session(pool_size=4) as session:
+        main.get_data(LOCATIONS, max_workers=4, session=session, api_url=fake_api.url)
+    assert fake_api.requests_count == len(LOCATIONS)
+    assert len(fake_api.connections) <= 4
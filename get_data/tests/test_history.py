@@ -0,0 +1,45 @@
+"""Tests for append-only forecast history"""
+import pandas as pd
+import pytest
+import main
+from history import ForecastHistory, merge_runs
+from .fake_api import FakeApiServer
+
+LOCATIONS = (main.warsaw, main.krakow, main.ustka)
+
+
+def _fetch(init: str) -> pd.DataFrame:
+    with FakeApiServer(init=init) as server:
+        return main.get_data(LOCATIONS, api_url=server.url)
+
+
+@pytest.fixture
+def history(tmp_path):
+    return ForecastHistory(str(tmp_path / "history"))
+
+
+def test_merge_runs_replaces_matching_timepoints():
+    timepoints = pd.date_range("2023-04-10", periods=4, freq="3h")
+    existing = pd.DataFrame({"timepoint": timepoints[:3], "seeing": [1, 1, 1]})
+    new = pd.DataFrame({"timepoint": timepoints[2:], "seeing": [2, 2]})
+    merged = merge_runs(existing, new)
+    assert list(merged["timepoint"]) == list(timepoints)
+    assert list(merged["seeing"]) == [1, 1, 2, 2]
+
+
+def test_ingest_keeps_every_run(history):
+    assert history.ingest(_fetch("2023041012"))["new_runs"] == len(LOCATIONS)
+    assert history.ingest(_fetch("2023041000"))["new_runs"] == len(LOCATIONS)
+    for location in LOCATIONS:
+        assert history.inits(location.name) == ["2023041000", "2023041012"]
+    assert history.latest() == {location.name: "2023041012" for location in LOCATIONS}
+
+
+def test_ingest_same_run_is_deduplicated(history):
+    df = _fetch("2023041012")
+    history.ingest(df)
+    stats = history.ingest(df)
+    assert stats == {"new_runs": 0, "merged_runs": len(LOCATIONS), "rows": df.shape[0]}
+    run = history.read_run("Warsaw", "2023041012")
+    assert run.shape[0] == df.loc["Warsaw"].shape[0]
+    assert run["timepoint"].is_monotonic_increasing
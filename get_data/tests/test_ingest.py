@@ -0,0 +1,71 @@
+"""End-to-end ingestion tests against local stub API and local directory bucket"""
+import json
+import pandas as pd
+import pytest
+import main
+from charts import SECONDARY_MEASURES, chart_name
+from history import ForecastHistory
+from .fake_api import FakeApiServer
+
+LOCATIONS = tuple(
+    main.Location(name=f"Site {n}", latitude=40 + n, longitude=10 + n)
+    for n in range(12)
+)
+
+
+@pytest.fixture
+def fake_api():
+    with FakeApiServer(error_rate=0.2, seed=1) as server:
+        yield server
+
+
+def test_save_to_local_bucket_as_csv(fake_api, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "LOCATIONS", LOCATIONS)
+    message = main.save_astrometeo_data_to_bucket(
+        None,
+        bucket_url=str(tmp_path),
+        data_format="csv",
+        shard_count=1,
+        api_url=fake_api.url,
+    )
+    assert message.startswith("Saved succesfully - all locations, 12 locations")
+    saved = pd.read_csv(tmp_path / "astro_weather_data.csv")
+    assert sorted(saved["location"].unique()) == sorted(l.name for l in LOCATIONS)
+    assert saved.shape[0] == 24 * len(LOCATIONS)
+
+
+def test_ingest_to_local_bucket_as_history(fake_api, tmp_path):
+    result = main.ingest(
+        LOCATIONS,
+        bucket_url=str(tmp_path),
+        data_format="history",
+        shard=0,
+        api_url=fake_api.url,
+    )
+    assert result.written == len(LOCATIONS)
+    assert result.stats.failed == 0
+    assert result.stats.retries > 0
+    history = ForecastHistory(str(tmp_path / "astro_weather_history"))
+    assert set(history.latest()) == {l.name for l in LOCATIONS}
+
+
+def test_ingest_writes_chart_artifacts(fake_api, tmp_path):
+    result = main.ingest(
+        LOCATIONS[:3],
+        bucket_url=str(tmp_path),
+        data_format="csv",
+        chart_artifacts=True,
+        api_url=fake_api.url,
+    )
+    assert result.written == 3
+    saved = pd.read_csv(tmp_path / "astro_weather_data.csv")
+    for location in LOCATIONS[:3]:
+        path = tmp_path / "astro_weather_charts" / chart_name(location.name)
+        artifact = json.loads(path.read_text())
+        rows = saved[saved["location"] == location.name].sort_values("timepoint")
+        assert artifact["location"] == location.name
+        assert artifact["timepoints"]["count"] == len(rows)
+        traces = artifact["figure"]["data"]
+        assert [trace["meta"] for trace in traces] == ["temp2m", *SECONDARY_MEASURES]
+        assert traces[0]["y"] == rows["temp2m"].tolist()
+        assert all(len(trace["x"]) == len(rows) for trace in traces)
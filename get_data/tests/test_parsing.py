@@ -0,0 +1,31 @@
+"""Tests for columnar astro response parser"""
+import json
+import pandas as pd
+import pytest
+import main
+from parsing import parse_astro
+from .fake_api import FakeApiServer, astro_payload
+from .reference_parser import reference_parse_astro
+
+
+@pytest.mark.parametrize("timepoint_no", [1, 24, 500])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parse_astro_matches_reference_parser(timepoint_no, indent):
+    body = json.dumps(
+        astro_payload(21.01, 52.22, timepoint_no=timepoint_no), indent=indent
+    ).encode()
+    # scalar init got pandas' default datetime unit there; values are the same
+    expected = reference_parse_astro(body, location="Warsaw").astype(
+        {"init": "datetime64[ns]"}
+    )
+    pd.testing.assert_frame_equal(parse_astro(body, location="Warsaw"), expected)
+
+
+def test_get_data_keeps_wind_of_each_location():
+    locations = (main.warsaw, main.krakow, main.ustka)
+    with FakeApiServer() as server:
+        df = main.get_data(locations, api_url=server.url)
+    for location in locations:
+        payload = astro_payload(location.longitude, location.latitude)
+        expected = [row["wind10m"]["speed"] for row in payload["dataseries"]]
+        assert list(df.loc[location.name, "wind10m_speed"]) == expected
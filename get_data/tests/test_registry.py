@@ -0,0 +1,81 @@
+"""Tests for location registry, sharding and rate limited fetching"""
+import json
+import time
+from datetime import datetime
+import pandas as pd
+import pytest
+import main
+from fetcher import ProgressReporter, RateLimiter
+from registry import current_shard, load_locations, shard_locations
+from .fake_api import FakeApiServer
+
+LOCATION_NO = 5000
+SHARD_COUNT = 12
+
+
+@pytest.fixture
+def registry_records():
+    return [
+        {"name": f"Site {n}", "latitude": -60 + n / 50, "longitude": -180 + n / 15}
+        for n in range(LOCATION_NO)
+    ]
+
+
+def test_load_locations_from_csv_and_json(registry_records, tmp_path):
+    csv_path = str(tmp_path / "locations.csv")
+    json_path = str(tmp_path / "locations.json")
+    pd.DataFrame(registry_records).to_csv(csv_path, index=False)
+    with open(json_path, "w") as handle:
+        json.dump(registry_records, handle)
+    from_csv = load_locations(csv_path)
+    assert len(from_csv) == LOCATION_NO
+    assert from_csv[7] == main.Location("Site 7", -60 + 7 / 50, -180 + 7 / 15)
+    assert load_locations(json_path) == from_csv
+
+
+def test_shards_cover_every_location_once(registry_records):
+    locations = tuple(main.Location(**record) for record in registry_records)
+    shards = [
+        shard_locations(locations, shard, SHARD_COUNT) for shard in range(SHARD_COUNT)
+    ]
+    assert sum(shards, ()) == locations
+    with pytest.raises(ValueError):
+        shard_locations(locations, SHARD_COUNT, SHARD_COUNT)
+
+
+def test_current_shard_spans_the_hour():
+    slots = {
+        current_shard(SHARD_COUNT, now=datetime(2023, 4, 10, 12, minute))
+        for minute in range(0, 60, 60 // SHARD_COUNT)
+    }
+    assert slots == set(range(SHARD_COUNT))
+
+
+def test_rate_limiter_spreads_requests():
+    rate_limiter = RateLimiter(rate=100, burst=5)
+    start = time.perf_counter()
+    for _ in range(30):
+        rate_limiter.acquire()
+    assert time.perf_counter() - start >= (30 - 5) / 100
+
+
+def test_sharded_fetch_of_whole_registry(registry_records):
+    locations = tuple(main.Location(**record) for record in registry_records)
+    rate_limiter = RateLimiter(rate=5000, burst=50)
+    fetched = []
+    with FakeApiServer() as server:
+        for shard in range(SHARD_COUNT):
+            shard_slice = shard_locations(locations, shard, SHARD_COUNT)
+            progress = ProgressReporter(total=len(shard_slice), label=f"shard {shard}")
+            df = main.get_data(
+                shard_slice,
+                max_workers=32,
+                api_url=server.url,
+                rate_limiter=rate_limiter,
+                progress=progress,
+                hedge=False,
+            )
+            assert progress.done == len(shard_slice)
+            fetched.extend(df.index.unique())
+        assert server.requests_count == LOCATION_NO
+    assert fetched == [location.name for location in locations]
@@ -0,0 +1,129 @@
+"""Tests for deadline-aware fetching with retries and hedged requests"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+import main
+from cache import FetchStats
+from fetcher import (
+    Deadline,
+    DeadlineExceeded,
+    FetchFailed,
+    LatencyTracker,
+    fetch_resilient,
+    make_session,
+)
+from sinks import CsvSink, write_frames
+from .fake_api import FakeApiServer
+
+LOCATIONS = tuple(
+    main.Location(name=f"Site {n}", latitude=40 + n, longitude=10 + n)
+    for n in range(10)
+)
+
+
+def test_failed_requests_are_retried():
+    stats = FetchStats()
+    with FakeApiServer(error_rate=0.3) as server:
+        df = main.get_data(LOCATIONS, api_url=server.url, stats=stats, hedge=False)
+    assert list(df.index.unique()) == [location.name for location in LOCATIONS]
+    assert stats.failed == 0 and stats.retries > 0
+    assert sum(d["attempts"] for d in stats.report().values()) == server.requests_count
+
+
+def test_fetch_gives_up_after_retries():
+    with FakeApiServer(error_rate=1.0) as server, make_session() as session:
+        with pytest.raises(FetchFailed) as failure:
+            fetch_resilient(session, f"{server.url}?lon=1&lat=1", retries=2, backoff=0)
+    assert failure.value.attempts == 3
+
+
+def test_deadline_stops_fetching():
+    with FakeApiServer(latency=0.2) as server, make_session() as session:
+        deadline = Deadline(seconds=0.1)
+        time.sleep(0.1)
+        with pytest.raises(DeadlineExceeded):
+            fetch_resilient(session, f"{server.url}?lon=1&lat=1", deadline=deadline)
+
+        stats = FetchStats()
+        start = time.perf_counter()
+        main.get_data(
+            LOCATIONS,
+            api_url=server.url,
+            max_workers=1,
+            deadline=Deadline(seconds=0.5),
+            stats=stats,
+        )
+    assert time.perf_counter() - start < 1.5
+    assert 0 < stats.failed < len(LOCATIONS)
+
+
+class CountingLimiter:
+    """
+    Rate limiter counting acquired requests, without limiting them
+    """
+
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self) -> None:
+        self.acquired += 1
+
+
+def test_slow_request_is_hedged():
+    latencies = LatencyTracker(min_samples=1)
+    latencies.add(0.01)
+    limiter = CountingLimiter()
+    with FakeApiServer(slow_requests=1, slow_latency=2) as server:
+        with make_session() as session, ThreadPoolExecutor(1) as pool:
+            with ThreadPoolExecutor(1) as hedges:
+                result = fetch_resilient(
+                    session,
+                    f"{server.url}?lon=1&lat=1",
+                    latencies=latencies,
+                    request_executor=pool,
+                    hedge_executor=hedges,
+                    rate_limiter=limiter,
+                )
+    assert result.hedged and result.latency < 1
+    assert server.requests_count == 2
+    # duplicate is rate limited too
+    assert limiter.acquired == 2
+
+
+def test_hedge_is_sent_when_request_executor_is_busy():
+    latencies = LatencyTracker(min_samples=1)
+    latencies.add(0.01)
+    with FakeApiServer() as server:
+        with make_session() as session, ThreadPoolExecutor(1) as pool:
+            with ThreadPoolExecutor(1) as hedges:
+                pool.submit(time.sleep, 1)
+                start = time.perf_counter()
+                result = fetch_resilient(
+                    session,
+                    f"{server.url}?lon=1&lat=1",
+                    latencies=latencies,
+                    request_executor=pool,
+                    hedge_executor=hedges,
+                )
+                elapsed = time.perf_counter() - start
+    assert result.hedged and elapsed < 0.5
+    # queued request was cancelled once duplicate responded
+    assert server.requests_count == 1
+
+
+def test_failed_locations_are_filled_from_previous_snapshot(tmp_path):
+    path = str(tmp_path / "data.csv")
+    broken = LOCATIONS[3]
+    with FakeApiServer() as server:
+        write_frames(main.iter_data(LOCATIONS, api_url=server.url), CsvSink(path))
+    with FakeApiServer(init="2023041018", broken_latitudes=[broken.latitude]) as server:
+        stats = FetchStats()
+        frames = main.iter_data(LOCATIONS, api_url=server.url, stats=stats)
+        write_frames(frames, CsvSink(path), carry_over=lambda: stats.failed)
+    assert stats.failed == 1
+    assert stats.report()[broken.name] == {"status": "failed", "attempts": 3}
+    saved = pd.read_csv(path, index_col="location")
+    assert sorted(saved.index.unique()) == sorted(l.name for l in LOCATIONS)
+    assert set(saved.loc[broken.name, "init"]) == {"2023-04-10 12:00:00"}
+    assert set(saved.loc[LOCATIONS[0].name, "init"]) == {"2023-04-10 18:00:00"}
@@ -0,0 +1,86 @@
+"""Tests for streaming output sinks"""
+import tracemalloc
+import pandas as pd
+import main
+from sinks import CsvSink, write_frames
+from .fake_api import FakeApiServer
+
+TIMEPOINT_NO = 1000
+
+
+def _locations(location_no: int):
+    return tuple(
+        main.Location(name=f"Site {n}", latitude=n / 100, longitude=n / 100)
+        for n in range(location_no)
+    )
+
+
+def test_csv_sink_streams_whole_output(tmp_path):
+    path = str(tmp_path / "data.csv")
+    locations = _locations(5)
+    with FakeApiServer() as server:
+        expected = main.get_data(locations, api_url=server.url)
+        written = write_frames(
+            main.iter_data(locations, api_url=server.url, max_workers=2),
+            sink=CsvSink(path),
+        )
+    assert written == len(locations)
+    saved = pd.read_csv(path, index_col="location", parse_dates=["timepoint", "init"])
+    pd.testing.assert_frame_equal(saved, expected, check_dtype=False)
+
+
+def test_csv_sink_carries_over_skipped_locations(tmp_path):
+    path = str(tmp_path / "data.csv")
+    locations = _locations(4)
+    with FakeApiServer() as server:
+        write_frames(main.iter_data(locations, api_url=server.url), sink=CsvSink(path))
+        server.init = "2023041018"
+        write_frames(
+            main.iter_data(locations[:1], api_url=server.url),
+            sink=CsvSink(path),
+            carry_over=lambda: True,
+        )
+    saved = pd.read_csv(path, index_col="location")
+    assert sorted(saved.index.unique()) == sorted(l.name for l in locations)
+    assert set(saved.loc["Site 0", "init"]) == {"2023-04-10 18:00:00"}
+    assert set(saved.loc["Site 1", "init"]) == {"2023-04-10 12:00:00"}
+
+
+def _peak_memory(location_no: int, tmp_path) -> int:
+    with FakeApiServer(timepoint_no=TIMEPOINT_NO) as server:
+        frames = main.iter_data(
+            _locations(location_no), api_url=server.url, max_workers=2
+        )
+        tracemalloc.start()
+        write_frames(frames, sink=CsvSink(str(tmp_path / f"{location_no}.csv")))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak
+
+
+def test_streaming_peak_memory_does_not_grow_with_locations(tmp_path):
+    small = _peak_memory(4, tmp_path)
+    large = _peak_memory(32, tmp_path)
+    assert large < 1.5 * small
+
+
+def test_overlapping_csv_sinks_do_not_share_temporary_file(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with FakeApiServer() as server:
+        first, second = (
+            main.get_data(locations, api_url=server.url)
+            for locations in (_locations(2), _locations(3))
+        )
+    sinks = [CsvSink(path), CsvSink(path)]
+    # interleaved runs, as when scheduled runs overlap
+    for location in first.index.unique():
+        sinks[0].write(first.loc[[location]])
+        sinks[1].write(second.loc[[location]])
+    sinks[1].write(second.loc[["Site 2"]])
+    sinks[0].close()
+    saved = pd.read_csv(path, index_col="location", parse_dates=["timepoint", "init"])
+    pd.testing.assert_frame_equal(saved, first, check_dtype=False)
+    sinks[1].close()
+    saved = pd.read_csv(path, index_col="location", parse_dates=["timepoint", "init"])
+    pd.testing.assert_frame_equal(saved, second, check_dtype=False)
+    assert [p.name for p in tmp_path.iterdir()] == ["data.csv"]
@@ -0,0 +1,30 @@
+"""Tests for partitioned parquet output"""
+import pyarrow.dataset as ds
+import main
+from storage import to_partitioned_parquet
+from .fake_api import FakeApiServer
+
+LOCATIONS = (main.warsaw, main.krakow, main.ustrzyki_gorne)
+
+
+def test_partitioned_parquet_layout_and_types(tmp_path):
+    with FakeApiServer() as server:
+        df = main.get_data(LOCATIONS, api_url=server.url)
+    path = str(tmp_path / "dataset")
+    to_partitioned_parquet(df, path)
+    to_partitioned_parquet(df, path)  # same init is replaced, not duplicated
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    assert len(dataset.files) == len(LOCATIONS)
+    schema = dataset.schema
+    assert str(schema.field("timepoint").type) == "timestamp[ms]"
+    assert str(schema.field("seeing").type) == "int8"
+    assert str(schema.field("prec_type").type).startswith("dictionary")
+
+    stored = dataset.to_table().to_pandas()
+    assert stored.shape[0] == df.shape[0]
+    assert sorted(stored["location"].unique()) == sorted(df.index.unique())
+    assert (stored["init"].astype(str) == "2023041012").all()
+    stored = stored.astype({"location": str}).sort_values(["location", "timepoint"])
+    expected = df.reset_index().sort_values(["location", "timepoint"])
+    assert (stored["seeing"].values == expected["seeing"].values).all()